@@ -1,15 +1,32 @@
 import requests
-from collections import defaultdict
+from requests.adapters import HTTPAdapter
+from collections import defaultdict, deque
 import base64
+import codecs
 from urllib.parse import quote
 import sys
 import argparse
+import csv
+import functools
+import importlib.util
 import configparser
 import os
-from pathlib import Path
-
-import configparser
-import os
+import re
+import json
+import math
+import time
+import hashlib
+import heapq
+import random
+import sqlite3
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 # ANSI Color codes for terminal output
@@ -24,17 +41,19 @@ class Colors:
     BOLD = '\033[1m'
     RESET = '\033[0m'  # Reset to default color
 
+class ConfigError(Exception):
+    """Konfigürasyon eksik ya da hatalı (mesaj kullanıcıya olduğu gibi gösterilir)"""
+
 def load_config():
     """Konfigürasyon dosyasından ve ortam değişkenlerinden ayarları yükle"""
     config = configparser.ConfigParser()
     
-    # Konfigürasyon dosyasının yolunu bul
-    config_path = Path(__file__).parent / 'config.ini'
+    # Konfigürasyon dosyasının yolunu bul (AZURE_CONFIG ile değiştirilebilir)
+    config_path = Path(os.environ.get('AZURE_CONFIG', Path(__file__).parent / 'config.ini'))
     
     if not config_path.exists():
-        print(f"❌ Konfigürasyon dosyası bulunamadı: {config_path}")
-        print("Lütfen config.ini dosyasını oluşturun veya örnekten kopyalayın.")
-        exit(1)
+        raise ConfigError(f"❌ Konfigürasyon dosyası bulunamadı: {config_path}\n"
+                          "Lütfen config.ini dosyasını oluşturun veya örnekten kopyalayın.")
     
     config.read(config_path)
     
@@ -63,59 +82,637 @@ def get_setting(config, section, key, default=None, env_var=None):
         return default
 
 # Ayarlar - Global değişkenler yerine fonksiyon içinde tanımlanacak
-def load_azure_settings():
-    """Azure ayarlarını yükle"""
+def load_azure_settings(require_pat=True):
+    """Azure ayarlarını yükle (require_pat=False: --replay gibi ağsız çalıştırmalar için)"""
     config = load_config()
     
     settings = {
         'organization': get_setting(config, 'Azure', 'organization', 'KocDigitalOrganization', 'AZURE_ORGANIZATION'),
+        'server_url': get_setting(config, 'Azure', 'server_url', 'https://dev.azure.com', 'AZURE_SERVER_URL').rstrip('/'),
+        'analytics_url': get_setting(config, 'Azure', 'analytics_url', '', 'AZURE_ANALYTICS_URL').rstrip('/'),
         'project': get_setting(config, 'Azure', 'project', 'KocDigital - Agile Teams', 'AZURE_PROJECT'), 
         'team': get_setting(config, 'Azure', 'team', 'Atmaca', 'AZURE_TEAM'),
         'pat': get_setting(config, 'Azure', 'pat', None, 'AZURE_PAT'),
         'default_sprint': get_setting(config, 'Analysis', 'default_sprint', '51'),
         'working_days': int(get_setting(config, 'Analysis', 'working_days', '9')),
+        'capacity_calendar': get_setting(config, 'Analysis', 'capacity_calendar', 'true').lower() == 'true',
         'debug': get_setting(config, 'Analysis', 'debug', 'false').lower() == 'true',
+        'jobs': int(get_setting(config, 'Analysis', 'jobs', '1')),
+        'trend_window': int(get_setting(config, 'Analysis', 'trend_window', '3')),
+        'engine': get_setting(config, 'Analysis', 'engine', 'rest').lower(),
+        'work_item_types': [name.strip() for name in get_setting(config, 'Analysis', 'work_item_types', '').split(',') if name.strip()],
+        'cache_dir': get_setting(config, 'Cache', 'directory', str(Path(__file__).parent / '.cache')),
+        'iteration_ttl': int(get_setting(config, 'Cache', 'iteration_ttl', '3600')),
+        'work_item_store': get_setting(config, 'Cache', 'work_item_store', 'true').lower() == 'true',
         'max_projects_display': int(get_setting(config, 'Output', 'max_projects_display', '10')),
         'sprint_column_width': int(get_setting(config, 'Output', 'sprint_column_width', '15')),
         'activity_column_width': int(get_setting(config, 'Output', 'activity_column_width', '20')),
         'numeric_column_width': int(get_setting(config, 'Output', 'numeric_column_width', '20')),
-        'resource_need_column_width': int(get_setting(config, 'Output', 'resource_need_column_width', '20'))
+        'resource_need_column_width': int(get_setting(config, 'Output', 'resource_need_column_width', '20')),
+        'pool_size': int(get_setting(config, 'Network', 'pool_size', '10')),
+        'connect_timeout': float(get_setting(config, 'Network', 'connect_timeout', '5')),
+        'read_timeout': float(get_setting(config, 'Network', 'read_timeout', '30')),
+        'gzip': get_setting(config, 'Network', 'gzip', 'true').lower() == 'true',
+        'fetch_concurrency': int(get_setting(config, 'Network', 'fetch_concurrency', '4')),
+        'max_retries': int(get_setting(config, 'Network', 'max_retries', '5')),
+        'requests_per_second': float(get_setting(config, 'Network', 'requests_per_second', '20')),
+        'max_in_flight': int(get_setting(config, 'Network', 'max_in_flight', '16')),
+        'teams': [name.strip() for name in get_setting(config, 'Analysis', 'teams', '').split(',') if name.strip()],
+        'team_jobs': int(get_setting(config, 'Analysis', 'team_jobs', '4')),
+        'serve_host': get_setting(config, 'Serve', 'host', '127.0.0.1'),
+        'serve_port': int(get_setting(config, 'Serve', 'port', '9108')),
+        'serve_interval': int(get_setting(config, 'Serve', 'interval', '300'))
     }
     
-    if not settings['pat'] or settings['pat'] == 'YOUR_PAT_HERE':
-        print("❌ Azure DevOps Personal Access Token (PAT) bulunamadı!")
-        print("Lütfen aşağıdakilerden birini yapın:")
-        print("1. config.ini dosyasında 'pat' değerini ayarlayın")
-        print("2. .env dosyasında AZURE_PAT değişkenini ayarlayın")
-        print("3. Ortam değişkeni olarak AZURE_PAT'ı ayarlayın")
-        print("\nPAT oluşturmak için: https://dev.azure.com/[your-org]/_usersSettings/tokens")
-        exit(1)
+    if require_pat and (not settings['pat'] or settings['pat'] == 'YOUR_PAT_HERE'):
+        raise ConfigError("❌ Azure DevOps Personal Access Token (PAT) bulunamadı!\n"
+                          "Lütfen aşağıdakilerden birini yapın:\n"
+                          "1. config.ini dosyasında 'pat' değerini ayarlayın\n"
+                          "2. .env dosyasında AZURE_PAT değişkenini ayarlayın\n"
+                          "3. Ortam değişkeni olarak AZURE_PAT'ı ayarlayın\n"
+                          "\nPAT oluşturmak için: https://dev.azure.com/[your-org]/_usersSettings/tokens")
+    settings['pat'] = settings['pat'] or ''
     
     return settings
 
-# Global değişkenleri kaldırıp settings kullanacağız
-settings = load_azure_settings()
-
-# URL encode the components
-organization_encoded = quote(settings['organization'])
-project_encoded = quote(settings['project'])
-team_encoded = quote(settings['team'])
-
-if settings['debug']:
-    print(f"Debug: Original organization: {settings['organization']}")
-    print(f"Debug: Encoded organization: {organization_encoded}")
-    print(f"Debug: Original project: {settings['project']}")
-    print(f"Debug: Encoded project: {project_encoded}")
-    print(f"Debug: PAT length: {len(settings['pat'])}")
-    print(f"Debug: PAT first 4 chars: {settings['pat'][:4]}...")
-    print(f"Debug: PAT last 4 chars: ...{settings['pat'][-4:]}")
-
-# API URL'leri
-base_url = f"https://dev.azure.com/{organization_encoded}"
-headers = {
-    "Content-Type": "application/json",
-    "Authorization": f"Basic {base64.b64encode((':'+settings['pat']).encode()).decode()}"
-}
+# Çalışma zamanı durumu. Import sırasında dosya okunmaz, ağa çıkılmaz;
+# hepsi configure() çağrıldığında (ilk kullanımdan önce bir kez) doldurulur.
+# Takıma özgü durum (proje/takım, iterasyon indeksi, work item deposu) TeamScope'tadır.
+class Unconfigured:
+    """configure() çağrılmadan kullanılan çalışma zamanı durumu; her erişimde ConfigError fırlatır"""
+
+    def __init__(self, name):
+        self._name = name
+
+    def _fail(self, *args, **kwargs):
+        raise ConfigError(f"configure() çağrılmadı: '{self._name}' kullanılmadan önce azure.configure() çağırın")
+
+    __getitem__ = __getattr__ = __str__ = __format__ = __iter__ = __call__ = _fail
+
+    def __bool__(self):
+        return False
+
+settings = Unconfigured('settings')
+organization_encoded = Unconfigured('organization_encoded')
+base_url = Unconfigured('base_url')
+client = Unconfigured('client')
+
+# Profil: aşama süreleri ve sayaçlar (--profile)
+class Profiler:
+    """Aşama sürelerini ve sayaçları toplar; kapalıyken neredeyse maliyetsizdir.
+
+    Her aşama Chrome trace formatında bir "complete" (ph=X) olayı olarak
+    saklanır; iç içe aşamalar (sprint > wiql > http) aynı iş parçacığında
+    zaman çizelgesinde iç içe görünür. Özet tablo aynı olaylardan üretilir.
+
+    Olaylar hizmet ettikleri sprintlerle etiketlenir (args.sprints): `sprint`
+    ya da `sprints` ayrıntısı verilen bir aşamanın içindeki tüm aşamalar,
+    bind_scope ile iş parçacığı havuzlarına geçenler dahil, aynı etiketi
+    taşır. Aralığın toplu sorguları gibi birden çok sprinte hizmet eden
+    aşamalar sprint dökümünde bu sprintlere eşit bölünür.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self.counters = defaultdict(int)
+        self.thread_names = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._tags = threading.local()
+
+    def enable(self):
+        self.enabled = True
+        self._origin = time.perf_counter()
+
+    def current_sprints(self):
+        """Çalışan iş parçacığındaki aşamaların hizmet ettiği sprintler"""
+        return getattr(self._tags, 'sprints', ())
+
+    @contextmanager
+    def tagged(self, sprints):
+        """Bloktaki aşamaları verilen sprintlerle etiketle (iş parçacığı havuzlarına etiket taşımak için)"""
+        previous = self.current_sprints()
+        self._tags.sprints = tuple(sprints)
+        try:
+            yield
+        finally:
+            self._tags.sprints = previous
+
+    @contextmanager
+    def phase(self, name, **details):
+        """`with profiler.phase('wiql', sprint=...)` bloğunun süresini kaydet"""
+        if not self.enabled:
+            yield details
+            return
+        if 'sprint' in details:
+            sprints = (details['sprint'],)
+        else:
+            sprints = tuple(details.pop('sprints', ())) or self.current_sprints()
+        started = time.perf_counter()
+        try:
+            with self.tagged(sprints):
+                yield details
+        finally:
+            finished = time.perf_counter()
+            thread = threading.current_thread()
+            event = {
+                'name': name, 'cat': name.split(':')[0], 'ph': 'X', 'pid': os.getpid(), 'tid': thread.ident,
+                'ts': round((started - self._origin) * 1e6, 1), 'dur': round((finished - started) * 1e6, 1),
+            }
+            if details or sprints:
+                event['args'] = {key: str(value) for key, value in details.items()}
+            if sprints:
+                event['args']['sprints'] = list(sprints)
+            with self._lock:
+                self.events.append(event)
+                self.thread_names.setdefault(thread.ident, thread.name)
+
+    def timed(self, name):
+        """Fonksiyonun her çağrısını `name` aşaması olarak kaydeden dekoratör"""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.phase(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def count(self, key, amount=1):
+        if self.enabled:
+            with self._lock:
+                self.counters[key] += amount
+
+    def summary(self):
+        """Aşama adı -> [adet, toplam sn, en uzun sn]"""
+        result = {}
+        for event in self.events:
+            totals = result.setdefault(event['name'], [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += event['dur'] / 1e6
+            totals[2] = max(totals[2], event['dur'] / 1e6)
+        return result
+
+    def sprint_summary(self):
+        """Sprint -> aşama adı -> [adet payı, sn payı]; birden çok sprinte hizmet eden aşamalar eşit bölünür"""
+        result = {}
+        for event in self.events:
+            sprints = event.get('args', {}).get('sprints')
+            if not sprints:
+                continue
+            share = 1 / len(sprints)
+            for sprint in sprints:
+                totals = result.setdefault(sprint, {}).setdefault(event['name'], [0.0, 0.0])
+                totals[0] += share
+                totals[1] += event['dur'] / 1e6 * share
+        return result
+
+    def print_sprint_summary(self):
+        """Sprint başına süre dökümü: kendi aşaması, toplu sorgulardaki payı, istekleri ve en pahalı alt aşaması"""
+        by_sprint = self.sprint_summary()
+        if not by_sprint:
+            return
+        print(f"\n⏱️ Sprint bazında (birden çok sprinte hizmet eden toplu aşamalar sprintlere eşit bölünür):")
+        print(f"{'Sprint':<24}{'Sprint (sn)':>12}{'Toplu pay (sn)':>16}{'Toplam (sn)':>13}{'İstek':>9}{'HTTP (sn)':>11}"
+              f"   En pahalı alt aşama")
+        print("-" * 118)
+        order = lambda name: (sprint_number(name) is None, sprint_number(name) or 0, name)
+        for sprint in sorted(by_sprint, key=order):
+            phases = by_sprint[sprint]
+            own = phases.get('sprint', [0, 0.0])[1]
+            batch = phases.get('sprint_range', [0, 0.0])[1]
+            requests, http_seconds = phases.get('http', [0.0, 0.0])
+            others = [(seconds, name) for name, (_, seconds) in phases.items() if name not in ('sprint', 'sprint_range', 'http')]
+            costliest = f"{max(others)[1]} ({max(others)[0]:.3f} sn)" if others else "-"
+            print(f"{sprint[:23]:<24}{own:>12.3f}{batch:>16.3f}{own + batch:>13.3f}{requests:>9.1f}{http_seconds:>11.3f}"
+                  f"   {costliest}")
+
+    def print_summary(self, stats):
+        """Aşama tablosunu, istek/byte sayaçlarını ve önbellek isabet oranlarını yazdır"""
+        wall = time.perf_counter() - self._origin
+        print(f"\n⏱️ Profil (duvar saati {wall:.2f} sn; paralel aşamaların toplamı duvar saatini aşabilir):")
+        print(f"{'Aşama':<24}{'Adet':>8}{'Toplam (sn)':>14}{'Ort. (ms)':>12}{'En uzun (ms)':>14}{'Duvar %':>10}")
+        print("-" * 82)
+        for name, (count, total, longest) in sorted(self.summary().items(), key=lambda x: x[1][1], reverse=True):
+            print(f"{name:<24}{count:>8}{total:>14.3f}{total / count * 1000:>12.1f}{longest * 1000:>14.1f}"
+                  f"{total / wall * 100 if wall > 0 else 0:>10.1f}")
+        self.print_sprint_summary()
+
+        print(f"\n{'İstek':<24}{stats['requests']:>8}   {stats['bytes'] / 1e6:.2f} MB yanıt, "
+              f"{stats['retries']} yeniden deneme, {stats['throttled']} adet 429")
+        endpoints = sorted((key.split('.', 1)[1], value) for key, value in self.counters.items() if key.startswith('requests.'))
+        if endpoints:
+            print(f"{'':<24}" + ", ".join(f"{name}={value}" for name, value in endpoints))
+        for cache in sorted({key.split('.')[1] for key in self.counters if key.startswith('cache.')}):
+            hits = self.counters[f"cache.{cache}.hit"]
+            misses = self.counters[f"cache.{cache}.miss"]
+            print(f"{'Önbellek: ' + cache:<24}{hits:>8} isabet / {hits + misses} ({hits / (hits + misses) * 100 if hits + misses else 0:.0f}%)")
+
+    def write_trace(self, path, stats):
+        """Chrome trace (chrome://tracing, Perfetto) JSON dosyası yaz"""
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+                  for tid, name in self.thread_names.items()]
+        document = {
+            'traceEvents': events + self.events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'phases': {name: {'count': count, 'total_seconds': round(total, 6), 'max_seconds': round(longest, 6)}
+                           for name, (count, total, longest) in self.summary().items()},
+                'sprints': {sprint: {name: round(seconds, 6) for name, (_, seconds) in phases.items()}
+                            for sprint, phases in self.sprint_summary().items()},
+                'counters': dict(self.counters),
+                'requests': dict(stats),
+            },
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+        print(f"💾 Profil izi yazıldı: {path} (chrome://tracing ya da https://ui.perfetto.dev ile açılabilir)")
+
+profiler = Profiler()
+
+def finish_profile(trace_path=None):
+    """--profile açıksa özeti yazdır, istenirse Chrome trace dosyasını kaydet"""
+    if not profiler.enabled:
+        return
+    profiler.print_summary(client.stats)
+    if trace_path:
+        profiler.write_trace(trace_path, client.stats)
+
+class RequestScheduler:
+    """İstek hızını sınırlayan ve sunucu throttling sinyallerine uyan zamanlayıcı.
+
+    Token bucket saniyede `rate` isteğe (en fazla `rate` kadar ani artışla)
+    izin verir; `rate` <= 0 ise sınır uygulanmaz. Sunucu Retry-After ile
+    beklenmesini istediğinde tüm iş parçacıkları birlikte duraklatılır.
+    """
+
+    def __init__(self, rate=0):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+        self.throttled_seconds = 0.0
+        self.limited_seconds = 0.0
+
+    def acquire(self):
+        """Bir istek için izin al; gerekiyorsa bekle"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    delay = self.paused_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+                    self.limited_seconds += delay
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        """Tüm istekleri en az `seconds` saniye beklet"""
+        with self.lock:
+            now = time.monotonic()
+            until = now + seconds
+            if until > self.paused_until:
+                # Sadece duraklamanın uzayan kısmı sayılır; paralel bekleyenler tekrar sayılmaz
+                self.throttled_seconds += until - max(now, self.paused_until)
+                self.paused_until = until
+
+class AzureClient:
+    """Azure DevOps REST çağrıları için bağlantı havuzlu (keep-alive) HTTP istemcisi.
+
+    Tüm istekler tek bir requests.Session üzerinden gider; böylece TCP/TLS
+    bağlantıları sprintler arasında yeniden kullanılır. Kimlik doğrulama,
+    sıkıştırma, zaman aşımı ve throttling/yeniden deneme politikası tek
+    noktada tanımlanır.
+    """
+
+    # Yeniden denenebilir durum kodları (throttling ve geçici sunucu hataları)
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 60.0
+
+    def __init__(self, pat, pool_size=10, connect_timeout=5, read_timeout=30, gzip=True,
+                 max_retries=5, requests_per_second=0, max_in_flight=0):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self.scheduler = RequestScheduler(requests_per_second)
+        # Süreç genelinde aynı anda uçuşta olabilecek istek sayısı (takımlar x sprintler x parçalar)
+        self.in_flight = threading.BoundedSemaphore(max_in_flight) if max_in_flight > 0 else None
+        # --record / --replay için dizinler
+        self.record_dir = None
+        self.replay_dir = None
+        self.stats = defaultdict(int)
+        self._stats_lock = threading.Lock()
+        self.session = requests.Session()
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.session.headers.update({
+            "Content-Type": "application/json",
+            "Authorization": f"Basic {base64.b64encode((':' + pat).encode()).decode()}",
+            # requests yanıtı otomatik açar; burada sadece ne istediğimizi belirtiyoruz
+            "Accept-Encoding": "gzip, deflate" if gzip else "identity",
+        })
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    @staticmethod
+    def _retry_after(res):
+        """Retry-After başlığını saniye olarak döndür (saniye ya da HTTP tarihi olabilir)"""
+        value = res.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                return None
+
+    def _backoff(self, attempt):
+        """Jitter'lı üstel geri çekilme süresi"""
+        return min(self.BACKOFF_MAX, self.BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+    def _observe_rate_limit(self, res):
+        """Başarılı yanıtlardaki rate limit başlıklarına göre hızı ayarla"""
+        retry_after = self._retry_after(res)
+        if retry_after:
+            # Azure DevOps limite yaklaşıldığında 200 yanıtlarında da Retry-After gönderir
+            self.scheduler.pause(retry_after)
+            return
+        remaining = res.headers.get("X-RateLimit-Remaining")
+        reset = res.headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                if float(remaining) <= 0:
+                    self.scheduler.pause(min(self.BACKOFF_MAX, max(0.0, float(reset) - time.time())))
+            except ValueError:
+                pass
+
+    def request(self, method, url, idempotent=None, **kwargs):
+        """İsteği gönder (ya da kayıttan oku); gerekiyorsa yanıtı kaydet"""
+        if self.replay_dir:
+            return self._replay(method, url, kwargs.get('json'))
+        res = self._send(method, url, idempotent, **kwargs)
+        if self.record_dir:
+            self._record(method, url, kwargs.get('json'), res)
+        return res
+
+    def _send(self, method, url, idempotent=None, **kwargs):
+        """İsteği gönder; throttling ve geçici hatalarda idempotent istekleri yeniden dene"""
+        if idempotent is None:
+            idempotent = method in ('GET', 'HEAD')
+        kwargs.setdefault('timeout', self.timeout)
+
+        attempt = 0
+        while True:
+            self.scheduler.acquire()
+            self._count('requests')
+            endpoint = self.endpoint_name(url)
+            profiler.count(f"requests.{endpoint}")
+            try:
+                with profiler.phase('http', endpoint=endpoint, method=method) as details:
+                    res = self._request_in_flight(method, url, **kwargs)
+                    details['status'] = res.status_code
+                if not kwargs.get('stream'):
+                    # Akışlı yanıtların byte'ları iter_json_array okurken sayılır
+                    self._count('bytes', len(res.content))
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                reason = type(e).__name__
+            else:
+                self._observe_rate_limit(res)
+                if res.status_code not in self.RETRY_STATUSES or not idempotent or attempt >= self.max_retries:
+                    return res
+                delay = max(self._retry_after(res) or 0.0, self._backoff(attempt))
+                reason = f"HTTP {res.status_code}"
+                res.close()
+                if res.status_code == 429:
+                    self._count('throttled')
+
+            attempt += 1
+            self._count('retries')
+            if settings['debug']:
+                print(f"Debug: {reason} for {url}, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            # Bekleme tüm iş parçacıklarına uygulanır; bir sonraki acquire() bekler
+            self.scheduler.pause(delay)
+
+    def _request_in_flight(self, method, url, **kwargs):
+        """İsteği `max_in_flight` sınırı içinde gönder.
+
+        Akışlı (stream=True) başarılı yanıtlarda gövde istek döndükten sonra
+        indirildiği için yer, yanıt kapatılana kadar (iter_json_array gövdeyi
+        bitirip kapatır) tutulur; böylece sınır eşzamanlı aktarımları da kapsar.
+        Hata yanıtlarının (küçük) gövdesi hemen okunur ve yer bırakılır.
+        """
+        if not self.in_flight:
+            return self.session.request(method, url, **kwargs)
+        self.in_flight.acquire()
+        try:
+            res = self.session.request(method, url, **kwargs)
+            if kwargs.get('stream') and res.ok:
+                self._release_on_close(res)
+                return res
+            if kwargs.get('stream'):
+                res.content
+        except BaseException:
+            self.in_flight.release()
+            raise
+        self.in_flight.release()
+        return res
+
+    def _release_on_close(self, res):
+        """Yanıt (bir kez) kapatıldığında in_flight yerini bırak"""
+        close = res.close
+        released = []
+
+        def close_and_release():
+            try:
+                close()
+            finally:
+                if not released:
+                    released.append(True)
+                    self.in_flight.release()
+
+        res.close = close_and_release
+
+    # Akışlı JSON çözümü
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def iter_json_array(self, res, key, rest=None):
+        """Yanıttaki üst düzey `key` dizisinin elemanlarını gövde geldikçe tek tek çöz.
+
+        İstek stream=True ile gönderilmelidir. Gövde belleğe bütün olarak
+        alınmaz: arabellekte en fazla bir parça ile çözülmekte olan eleman
+        bulunur. `rest` sözlüğü verilirse dizi dışındaki üst düzey alanlar
+        (ör. @odata.nextLink) akış bitince ona eklenir.
+        """
+        decoder = json.JSONDecoder()
+        text = codecs.getincrementaldecoder('utf-8')()
+        chunks = res.iter_content(self.STREAM_CHUNK_SIZE)
+        buffer = ''
+        exhausted = False
+
+        def more():
+            nonlocal buffer, exhausted
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                buffer += text.decode(b'', final=True)
+                return False
+            self._count('bytes', len(chunk))
+            buffer += text.decode(chunk)
+            return True
+
+        try:
+            # Dizinin başını bul; öncesindeki (küçük) alanlar `rest` için saklanır
+            pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+            match = pattern.search(buffer)
+            while match is None:
+                if not more():
+                    raise ValueError(f"Yanıtta '{key}' dizisi bulunamadı")
+                match = pattern.search(buffer)
+            head = buffer[:match.start()]
+            pos = match.end()
+
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos >= len(buffer):
+                    if not more():
+                        raise ValueError(f"Yanıt '{key}' dizisi bitmeden kesildi")
+                    continue
+                if buffer[pos] == ']':
+                    pos += 1
+                    break
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # Sayılar parça sınırında bölünebilir ("2" + ".5"); değerin bittiği ardından gelen ayırıcıyla anlaşılır
+                    complete = exhausted or (end < len(buffer) and buffer[end] in ' \t\r\n,]')
+                except json.JSONDecodeError:
+                    if exhausted:
+                        raise
+                    complete = False
+                if not complete:
+                    more()
+                    continue
+                yield value
+                pos = end
+                if pos > self.STREAM_CHUNK_SIZE:
+                    buffer = buffer[pos:]
+                    pos = 0
+
+            # Bağlantı havuza dönsün diye gövdenin kalanı da okunur
+            while more():
+                pass
+            if rest is not None:
+                rest.update(json.loads(head + json.dumps(key) + ':[]' + buffer[pos:]))
+        finally:
+            res.close()
+
+    @staticmethod
+    def endpoint_name(url):
+        """URL'nin son yol parçasından kısa uç nokta adı (ör. 'wiql', 'capacities')"""
+        return re.sub(r'[^A-Za-z0-9]+', '-', url.split('?')[0].rstrip('/').rsplit('/', 1)[-1]) or 'root'
+
+    # Kayıt / tekrar oynatma
+    @classmethod
+    def _recording_path(cls, directory, method, url, body):
+        """İsteğin kayıt dosyası: uç nokta adı + method/url/gövde özeti"""
+        payload = json.dumps(body, sort_keys=True) if body is not None else ""
+        digest = hashlib.sha1(f"{method} {url}\n{payload}".encode()).hexdigest()[:16]
+        return Path(directory) / f"{cls.endpoint_name(url)}-{digest}.json"
+
+    def _record(self, method, url, body, res):
+        path = self._recording_path(self.record_dir, method, url, body)
+        record = {
+            'method': method,
+            'url': url,
+            'body': body,
+            'status': res.status_code,
+            'headers': {key: value for key, value in res.headers.items() if key.lower() in ('content-type', 'retry-after')},
+            'content': res.content.decode('utf-8', errors='replace'),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(record, f, ensure_ascii=False)
+
+    def _replay(self, method, url, body):
+        path = self._recording_path(self.replay_dir, method, url, body)
+        if not path.exists():
+            raise Exception(f"Kayıtlı yanıt bulunamadı ({path.name}): {method} {url}")
+        with open(path, encoding='utf-8') as f:
+            record = json.load(f)
+        self._count('requests')
+        profiler.count(f"requests.{self.endpoint_name(url)}")
+        res = requests.Response()
+        res.status_code = record['status']
+        res.headers.update(record.get('headers', {}))
+        res._content = record['content'].encode('utf-8')
+        res._content_consumed = True
+        self._count('bytes', len(res._content))
+        res.encoding = 'utf-8'
+        res.url = url
+        return res
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def ensure_pool_size(self, size):
+        """Havuzu en az `size` eşzamanlı bağlantı taşıyacak şekilde büyüt"""
+        if size <= self.pool_size:
+            return
+        self.pool_size = size
+        adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def print_throttle_summary(self):
+        """Throttling, istemci tarafı hız sınırı ve yeniden deneme istatistiklerini yazdır"""
+        lines = []
+        if self.stats['retries'] or self.scheduler.throttled_seconds >= 0.5:
+            lines.append(f"⏳ Throttling: {self.scheduler.throttled_seconds:.1f} sn bekleme, "
+                         f"{self.stats['throttled']} adet 429 yanıtı, {self.stats['retries']} yeniden deneme "
+                         f"({self.stats['requests']} istek)")
+        if self.scheduler.limited_seconds >= 0.5:
+            # İş parçacıklarının beklemeleri toplanır; duvar saati süresinden uzun olabilir
+            lines.append(f"⏳ İstemci hız sınırı ({self.scheduler.rate:g} istek/sn): "
+                         f"iş parçacıkları toplam {self.scheduler.limited_seconds:.1f} sn bekledi")
+        if lines:
+            print(f"\n{Colors.YELLOW}" + "\n".join(lines) + Colors.RESET)
+
+    def close(self):
+        self.session.close()
+
+def cache_file(kind, extension='json', per_team=True, project=None, team=None):
+    """Organizasyon/proje(/takım) kombinasyonuna özel önbellek dosyası yolu"""
+    scope = f"{settings['server_url']}|{settings['organization']}|{project or settings['project']}"
+    if per_team:
+        scope += f"|{team or settings['team']}"
+    key = hashlib.sha1(scope.encode()).hexdigest()[:12]
+    return Path(settings['cache_dir']) / f"{kind}-{key}.{extension}"
 
 # Test different possible organization names and basic connectivity
 def test_organization_variations():
@@ -131,10 +728,10 @@ def test_organization_variations():
     for org_name in variations:
         print(f"\n🔍 Testing organization: '{org_name}'")
         encoded_org = quote(org_name)
-        test_url = f"https://dev.azure.com/{encoded_org}/_apis/projects?api-version=7.0"
+        test_url = f"{settings['server_url']}/{encoded_org}/_apis/projects?api-version=7.0"
         
         try:
-            res = requests.get(test_url, headers=headers, timeout=10)
+            res = client.get(test_url, timeout=10)
             print(f"   Status: {res.status_code}")
             
             if res.status_code == 200:
@@ -165,7 +762,7 @@ def test_connectivity():
     if settings['debug']:
         print(f"Debug: Testing basic connectivity with URL: {url}")
     try:
-        res = requests.get(url, headers=headers, timeout=10)
+        res = client.get(url, timeout=10)
         if settings['debug']:
             print(f"Debug: Response status: {res.status_code}")
         if res.status_code == 200:
@@ -184,39 +781,149 @@ def test_connectivity():
             print(f"Debug: Error during connectivity test: {e}")
         return False
 
-def get_iteration_id(iteration_name):
-    url = f"{base_url}/{project_encoded}/{team_encoded}/_apis/work/teamsettings/iterations?api-version=7.0"
-    if settings['debug']:
-        print(f"Debug: Requesting URL: {url}")
-    res = requests.get(url, headers=headers)
-    if settings['debug']:
-        print(f"Debug: Response status: {res.status_code}")
-    if res.status_code != 200:
+def sprint_number(iteration_name):
+    """İterasyon adının sonundaki sprint numarasını döndür. Örnek: 'Sprint 51' -> 51"""
+    match = re.search(r'(\d+)\s*$', iteration_name)
+    return int(match.group(1)) if match else None
+
+class IterationIndex:
+    """Takımın iterasyon listesini bir kez çekip isim ve sprint numarasına göre indeksler.
+
+    Liste çalıştırma başına tek sefer indirilir. `ttl` > 0 ise liste diskte de
+    saklanır ve süre dolana kadar sonraki çalıştırmalar hiç istek atmadan başlar.
+    """
+
+    def __init__(self, url, cache_path=None, ttl=0):
+        self.url = url
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._by_name = None
+        self._by_number = None
+        self._from_disk = False
+
+    def _fetch(self):
         if settings['debug']:
-            print(f"Debug: Response text: {res.text}")
-    res.raise_for_status()
-    
-    iterations = res.json()["value"]
-    if settings['debug']:
-        print(f"Debug: Found {len(iterations)} iterations:")
+            print(f"Debug: Requesting URL: {self.url}")
+        res = client.get(self.url)
+        if settings['debug']:
+            print(f"Debug: Response status: {res.status_code}")
+        if res.status_code != 200:
+            if settings['debug']:
+                print(f"Debug: Response text: {res.text}")
+        res.raise_for_status()
+        return res.json()["value"]
+
+    def _load_cache(self):
+        if not self.cache_path or self.ttl <= 0 or not self.cache_path.exists():
+            return None
+        if time.time() - self.cache_path.stat().st_mtime > self.ttl:
+            return None
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache(self, iterations):
+        if not self.cache_path or self.ttl <= 0:
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(iterations, f)
+        except OSError as e:
+            if settings['debug']:
+                print(f"Debug: Iteration cache could not be written: {e}")
+
+    def _build(self, iterations):
+        by_name = {}
+        by_number = {}
         for it in iterations:
-            print(f"  - Name: {it['name']}, Path: {it.get('path', 'No path')}")
-    for it in iterations:
-        if it["name"] == iteration_name:
-            return it["id"], it.get("path", "")
-    raise Exception(f"Sprint '{iteration_name}' bulunamadı.")
-
-# 2. Capacity'yi aktiviteye göre grupla
-def get_capacity_by_activity(iteration_id):
-    url = f"{base_url}/{project_encoded}/{team_encoded}/_apis/work/teamsettings/iterations/{iteration_id}/capacities?api-version=7.0"
+            attributes = it.get("attributes") or {}
+            entry = {
+                'id': it["id"],
+                'name': it["name"],
+                'path': it.get("path", ""),
+                'startDate': attributes.get("startDate"),
+                'finishDate': attributes.get("finishDate"),
+            }
+            by_name[entry['name']] = entry
+            number = sprint_number(entry['name'])
+            if number is not None:
+                by_number.setdefault(number, entry)
+        self._by_name = by_name
+        self._by_number = by_number
+
+        if settings['debug']:
+            print(f"Debug: Found {len(iterations)} iterations:")
+            for it in iterations:
+                print(f"  - Name: {it['name']}, Path: {it.get('path', 'No path')}")
+
+    @profiler.timed('iteration_index')
+    def _load(self, use_cache=True):
+        iterations = self._load_cache() if use_cache else None
+        self._from_disk = iterations is not None
+        profiler.count('cache.iterations.hit' if self._from_disk else 'cache.iterations.miss')
+        if iterations is None:
+            iterations = self._fetch()
+            self._save_cache(iterations)
+        self._build(iterations)
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._by_name is None:
+                self._load()
+
+    def get(self, iteration_name):
+        """İterasyon bilgisini (id, path, startDate, finishDate) döndür"""
+        self._ensure_loaded()
+        entry = self._by_name.get(iteration_name)
+        if entry is None:
+            with self._lock:
+                # Diskteki liste eskimiş olabilir (yeni sprint açılmış); bir kez tazele
+                if self._from_disk:
+                    self._load(use_cache=False)
+                entry = self._by_name.get(iteration_name)
+        if entry is None:
+            raise Exception(f"Sprint '{iteration_name}' bulunamadı.")
+        return entry
+
+    def get_by_number(self, number):
+        """Sprint numarasına göre iterasyon bilgisini döndür"""
+        self._ensure_loaded()
+        entry = self._by_number.get(number)
+        if entry is None:
+            return self.get(f"Sprint {number}")
+        return entry
+
+    def expire(self):
+        """Bellekteki listeyi bırak: sonraki erişim diskteki listeyi (ttl dolmadıysa) ya da sunucuyu okur"""
+        with self._lock:
+            self._by_name = None
+            self._by_number = None
+
+    def invalidate(self):
+        """Bellekteki ve diskteki listeyi geçersiz kıl"""
+        with self._lock:
+            self._by_name = None
+            self._by_number = None
+            if self.cache_path and self.cache_path.exists():
+                self.cache_path.unlink()
+
+# 2. Capacity verisini al
+@profiler.timed('capacity')
+def get_team_capacities(iteration_id):
+    """Sprintin kapasite kayıtlarını (takım üyesi listesi) ham haliyle döndür"""
+    team_scope = scope()
+    url = f"{base_url}/{team_scope.project_encoded}/{team_scope.team_encoded}/_apis/work/teamsettings/iterations/{iteration_id}/capacities?api-version=7.0"
     if settings['debug']:
         print(f"Debug: Getting capacity from URL: {url}")
-    res = requests.get(url, headers=headers)
+    res = client.get(url)
     if settings['debug']:
         print(f"Debug: Capacity response status: {res.status_code}")
     res.raise_for_status()
 
-    capacity_by_activity = defaultdict(float)
     response_data = res.json()
     if settings['debug']:
         print(f"Debug: Capacity response data: {response_data}")
@@ -228,387 +935,3085 @@ def get_capacity_by_activity(iteration_id):
     if "teamMembers" in response_data:
         members = response_data["teamMembers"]
     
+    return [member for member in members if isinstance(member, dict)]
+
+# Takım ayarları: çalışma günleri ve sprint bazında takım izinleri
+WEEKDAY_NAMES = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+def get_team_working_weekdays():
+    """Takımın çalışma günleri (0=Pazartesi); ayarlarda yoksa Pazartesi-Cuma"""
+    team_scope = scope()
+    url = f"{base_url}/{team_scope.project_encoded}/{team_scope.team_encoded}/_apis/work/teamsettings?api-version=7.0"
+    res = client.get(url)
+    res.raise_for_status()
+    names = [name.lower() for name in res.json().get("workingDays") or []]
+    if settings['debug']:
+        print(f"Debug: Team working days: {names}")
+    return [WEEKDAY_NAMES.index(name) for name in names if name in WEEKDAY_NAMES] or range(5)
+
+@profiler.timed('days_off')
+def get_team_days_off(iteration_id):
+    """Sprintin takım izin aralıkları ([{'start': ..., 'end': ...}])"""
+    team_scope = scope()
+    url = f"{base_url}/{team_scope.project_encoded}/{team_scope.team_encoded}/_apis/work/teamsettings/iterations/{iteration_id}/teamdaysoff?api-version=7.0"
+    res = client.get(url)
+    res.raise_for_status()
+    return res.json().get("daysOff") or []
+
+def parse_day(value):
+    """Azure tarihini ('2024-01-08T00:00:00Z') date nesnesine çevir"""
+    return date.fromisoformat(value[:10]) if value else None
+
+def day_ranges(days_off, first, last):
+    """İzin kayıtlarını first..last aralığına kırpılmış, sıralı ve birleştirilmiş (başlangıç, bitiş) çiftlerine çevir"""
+    ranges = []
+    for entry in days_off:
+        start, end = parse_day(entry.get("start")), parse_day(entry.get("end"))
+        if start is None or end is None:
+            continue
+        start, end = max(start, first), min(end, last)
+        if start <= end:
+            ranges.append((start, end))
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+class WorkCalendar:
+    """Takımın çalışma günlerine göre iş günü indeksi.
+
+    Her gün için o güne kadarki iş günü sayısı kümülatif bir dizide tutulur;
+    iki tarih arasındaki iş günü sayısı iki dizi okumasıyla bulunur, yüzlerce
+    üye ve çok sayıda sprint için gün gün döngü kurulmaz. Dizi, istenen
+    tarihler kapsam dışına çıktıkça bir yıllık paylarla genişletilir.
+    """
+
+    def __init__(self, working_weekdays=range(5)):
+        self.working_weekdays = frozenset(working_weekdays)
+        self._lock = threading.Lock()
+        self._first = None
+        self._prefix = array('l')
+
+    def _cover(self, first, last):
+        """first..last ordinal aralığını kapsayan (başlangıç ordinali, kümülatif dizi) çifti"""
+        with self._lock:
+            if self._first is not None:
+                covered_last = self._first + len(self._prefix) - 2
+                if self._first <= first and last <= covered_last:
+                    return self._first, self._prefix
+                first, last = min(first, self._first), max(last, covered_last)
+            first, last = first - 366, last + 366
+            # prefix[i]: first .. first+i-1 arasındaki iş günü sayısı (ordinal 1 bir Pazartesi)
+            prefix = array('l', [0])
+            count = 0
+            for ordinal in range(first, last + 1):
+                if (ordinal + 6) % 7 in self.working_weekdays:
+                    count += 1
+                prefix.append(count)
+            self._first, self._prefix = first, prefix
+            return first, prefix
+
+    def business_days(self, start, end):
+        """start..end (ikisi de dahil) arasındaki iş günü sayısı"""
+        if end < start:
+            return 0
+        first_ordinal, last_ordinal = start.toordinal(), end.toordinal()
+        first, prefix = self._cover(first_ordinal, last_ordinal)
+        return prefix[last_ordinal - first + 1] - prefix[first_ordinal - first]
+
+    def is_business_day(self, day):
+        return day.weekday() in self.working_weekdays
+
+    def sprint(self, start, finish, team_days_off=()):
+        return SprintCalendar(self, start, finish, team_days_off)
+
+class SprintCalendar:
+    """Bir sprintin iş günleri: takım izinleri düşülmüş, üye izinleri sorgulanabilir"""
+
+    def __init__(self, calendar, start, finish, team_days_off=()):
+        self.calendar = calendar
+        self.start = start
+        self.finish = finish
+        # Takım izinlerine denk gelen iş günleri (sıralı ordinaller); üye izinleriyle çakışma bunlarla düşülür
+        self._team_off = []
+        for first, last in day_ranges(team_days_off, start, finish):
+            for ordinal in range(first.toordinal(), last.toordinal() + 1):
+                if calendar.is_business_day(date.fromordinal(ordinal)):
+                    self._team_off.append(ordinal)
+        self.working_days = calendar.business_days(start, finish) - len(self._team_off)
+
+    def member_days(self, days_off=()):
+        """Üyenin sprintteki çalışma günü sayısı (takım ve kişisel izinler düşülmüş)"""
+        off = 0
+        for first, last in day_ranges(days_off, self.start, self.finish):
+            team_off = bisect_right(self._team_off, last.toordinal()) - bisect_left(self._team_off, first.toordinal())
+            off += self.calendar.business_days(first, last) - team_off
+        return max(0, self.working_days - off)
+
+# Capacity'yi aktiviteye göre grupla (günlük kapasite; working_days(üye) verilirse sprint toplamı)
+def sum_capacity_by_activity(members, working_days=None):
+    capacity_by_activity = defaultdict(float)
     for member in members:
         if settings['debug']:
             print(f"Debug: Processing member: {member}")
-        if isinstance(member, dict):
-            for act in member.get("activities", []):
-                if isinstance(act, dict):
-                    activity_name = act.get("name", "Unknown")
-                    capacity_per_day = act.get("capacityPerDay", 0)
-                    capacity_by_activity[activity_name] += capacity_per_day
-                    if settings['debug']:
-                        print(f"Debug: Added {capacity_per_day} capacity for activity: {activity_name}")
+        days = working_days(member) if working_days else 1
+        for act in member.get("activities", []):
+            if isinstance(act, dict):
+                activity_name = act.get("name", "Unknown")
+                capacity_per_day = act.get("capacityPerDay", 0)
+                capacity_by_activity[activity_name] += capacity_per_day * days
+                if settings['debug']:
+                    print(f"Debug: Added {capacity_per_day} capacity for activity: {activity_name}")
     return capacity_by_activity
 
 # 3. Work item'ları al (WIQL ile)
-def get_work_items_ids(iteration_path):
-    wiql = {
-        "query": f"""
-        SELECT [System.Id]
-        FROM WorkItems
-        WHERE [System.IterationPath] = '{iteration_path}'
-          AND [System.WorkItemType] = 'Task'
-        """
-    }
-    url = f"{base_url}/{project_encoded}/_apis/wit/wiql?api-version=7.0"
-    if settings['debug']:
-        print(f"Debug: WIQL URL: {url}")
-        print(f"Debug: WIQL Query: {wiql['query']}")
-    res = requests.post(url, headers=headers, json=wiql)
-    if settings['debug']:
-        print(f"Debug: WIQL Response status: {res.status_code}")
-    if res.status_code != 200:
-        if settings['debug']:
-            print(f"Debug: WIQL Response text: {res.text}")
-    res.raise_for_status()
-    return [item["id"] for item in res.json()["workItems"]]
+# WIQL tek sorguda en fazla 20.000 sonuç döndürür; sonuçlar id sırasıyla sayfalanır
+WIQL_PAGE_SIZE = 19999
+# WIQL sorgu metni 32K karakterle sınırlı; IN listeleri bu boyutta gruplara bölünür
+WIQL_PATHS_PER_QUERY = 100
 
-# 4. Work item detayları ve aktiviteye göre grup
-def get_work_hours_by_activity(work_item_ids):
-    chunks = [work_item_ids[i:i+200] for i in range(0, len(work_item_ids), 200)]
-    work_by_activity = defaultdict(float)
+def wiql_quote(value):
+    """Değeri WIQL string literal'i olarak tırnakla"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+def iteration_condition(iteration_paths, prefix=''):
+    """Bir veya birden çok iterasyon yolu için WIQL koşulu (bağlantı sorgularında prefix='[Target].')"""
+    if len(iteration_paths) == 1:
+        return f"{prefix}[System.IterationPath] = {wiql_quote(iteration_paths[0])}"
+    return f"{prefix}[System.IterationPath] IN ({', '.join(wiql_quote(path) for path in iteration_paths)})"
+
+def work_item_type_condition(work_item_types, prefix=''):
+    """Work item tipleri için WIQL koşulu; tip verilmezse (tüm tipler) None"""
+    if not work_item_types:
+        return None
+    if len(work_item_types) == 1:
+        return f"{prefix}[System.WorkItemType] = {wiql_quote(work_item_types[0])}"
+    return f"{prefix}[System.WorkItemType] IN ({', '.join(wiql_quote(name) for name in work_item_types)})"
+
+def wiql_and(*conditions):
+    """Boş olmayan WIQL koşullarını AND ile birleştir"""
+    return "\n              AND ".join(condition for condition in conditions if condition)
 
-    for chunk in chunks:
-        ids_str = ",".join(map(str, chunk))
-        url = f"{base_url}/{project_encoded}/_apis/wit/workitems?ids={ids_str}&fields=Microsoft.VSTS.Common.Activity,Microsoft.VSTS.Scheduling.OriginalEstimate&api-version=7.0"
-        res = requests.get(url, headers=headers)
+@profiler.timed('wiql')
+def query_work_item_ids(condition, time_precision=False):
+    """Verilen WHERE koşuluna uyan work item id'lerini WIQL ile döndür (array('q')).
+
+    20.000 sonuç sınırına takılmamak için sorgu id aralıklarına bölünür:
+    her sayfa bir önceki sayfanın son id'sinden devam eder. Yanıt akış
+    halinde çözülür; id'ler sözlük listesi yerine sıkışık bir dizide tutulur.
+    """
+    url = f"{base_url}/{scope().project_encoded}/_apis/wit/wiql?$top={WIQL_PAGE_SIZE}&api-version=7.0"
+    if time_precision:
+        url += "&timePrecision=true"
+    ids = array('q')
+    last_id = 0
+    while True:
+        wiql = {
+            "query": f"""
+            SELECT [System.Id]
+            FROM WorkItems
+            WHERE ({condition})
+              AND [System.Id] > {last_id}
+            ORDER BY [System.Id]
+            """
+        }
+        if settings['debug']:
+            print(f"Debug: WIQL URL: {url}")
+            print(f"Debug: WIQL Query: {wiql['query']}")
+        res = client.post(url, json=wiql, idempotent=True, stream=True)
+        if settings['debug']:
+            print(f"Debug: WIQL Response status: {res.status_code}")
+        if res.status_code != 200:
+            if settings['debug']:
+                print(f"Debug: WIQL Response text: {res.text}")
         res.raise_for_status()
-        for item in res.json()["value"]:
-            fields = item.get("fields", {})
-            activity = fields.get("Microsoft.VSTS.Common.Activity")
-            hours = fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate", 0)
+        page_start = len(ids)
+        for item in client.iter_json_array(res, "workItems"):
+            ids.append(item["id"])
+        if len(ids) - page_start < WIQL_PAGE_SIZE:
+            return ids
+        last_id = ids[-1]
+
+def get_work_items_ids(iteration_path, work_item_types=('Task',)):
+    return query_work_item_ids(wiql_and(iteration_condition([iteration_path]),
+                                        work_item_type_condition(work_item_types)))
+
+# Tüm raporların ihtiyaç duyduğu alanların birleşimi; sprint başına tek seferde çekilir
+WORK_ITEM_FIELDS = [
+    "System.AssignedTo",
+    "System.State",
+    "Microsoft.VSTS.Common.Activity",
+    "Microsoft.VSTS.Scheduling.OriginalEstimate",
+]
+
+# Tamamlanmış sayılan durumlar (Agile: Closed, Scrum: Done)
+COMPLETED_STATES = ('Closed', 'Done', 'Completed')
+
+class WorkItemColumns:
+    """Work item alanlarının (WORK_ITEM_FIELDS) sütunsal, sıkışık kopyası.
+
+    Aktivite, kişi ve durum ortak bir etiket listesindeki indeksleriyle
+    array('I') içinde, saatler array('d') içinde tutulur; work item başına
+    bir sözlük ağacı yerine ~20 byte harcanır. Yineleme, toplama
+    fonksiyonlarının beklediği alan sözlüklerini anlık üretir (yanıtta
+    olmayan alanlar sözlükte de yer almaz). Work item id'leri de tutulur;
+    tek bir work item'a karşılık gelmeyen kayıtlarda (Analytics grupları) 0'dır.
+    """
+
+    def __init__(self, items=()):
+        self.labels = [None]  # 0: alan yok
+        self._codes = {}
+        self.ids = array('q')
+        self.activity = array('I')
+        self.member = array('I')
+        self.state = array('I')
+        self.estimate = array('d')
+        for fields in items:
+            self.append(fields)
+
+    def _code(self, value):
+        if value is None:
+            return 0
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.labels)
+            self.labels.append(value)
+        return code
+
+    @classmethod
+    def from_work_items(cls, items):
+        """workitemsbatch kayıtlarından (id, fields) id'leriyle birlikte kur"""
+        columns = cls()
+        for item in items:
+            columns.append(item.get("fields", {}), item["id"])
+        return columns
+
+    def append(self, fields, work_item_id=0):
+        assigned_to = fields.get("System.AssignedTo")
+        self.ids.append(work_item_id)
+        estimate = fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate")
+        self.activity.append(self._code(fields.get("Microsoft.VSTS.Common.Activity")))
+        self.member.append(self._code(assigned_to.get("displayName") if isinstance(assigned_to, dict) else None))
+        self.state.append(self._code(fields.get("System.State")))
+        self.estimate.append(float('nan') if estimate is None else estimate)
+
+    def __len__(self):
+        return len(self.estimate)
+
+    def __iter__(self):
+        labels = self.labels
+        for activity, member, state, estimate in zip(self.activity, self.member, self.state, self.estimate):
+            fields = {}
             if activity:
-                work_by_activity[activity] += hours
-    return work_by_activity
+                fields["Microsoft.VSTS.Common.Activity"] = labels[activity]
+            if member:
+                fields["System.AssignedTo"] = {"displayName": labels[member]}
+            if state:
+                fields["System.State"] = labels[state]
+            if not math.isnan(estimate):
+                fields["Microsoft.VSTS.Scheduling.OriginalEstimate"] = estimate
+            yield fields
 
-# Tek bir sprint için analiz yapan fonksiyon
-def analyze_sprint(sprint_name):
-    print(f"\n� {sprint_name} analiz ediliyor...")
-    
-    try:
-        iteration_id, iteration_path = get_iteration_id(sprint_name)
-        print(f"✅ {sprint_name} bulundu! Path: {iteration_path}")
-        
-        print(f"🔄 {sprint_name} kapasite verisi alınıyor...")
-        capacity_data = get_capacity_by_activity(iteration_id)
-        
-        print(f"� {sprint_name} work item listesi alınıyor...")
-        work_ids = get_work_items_ids(iteration_path)
-        
-        print(f"📊 {sprint_name} planlanan iş yükü hesaplanıyor...")
-        work_data = get_work_hours_by_activity(work_ids)
-        
-        return sprint_name, capacity_data, work_data
-        
-    except Exception as e:
-        print(f"❌ {sprint_name} analiz edilemedi: {e}")
-        return sprint_name, {}, {}
+    def estimates_by_id(self):
+        """(work item id, planlanan saat) çiftleri; kayıtlar tek tek work item değilse (Analytics grupları) None"""
+        if 0 in self.ids:
+            return None
+        return [(work_item_id, 0.0 if math.isnan(estimate) else estimate)
+                for work_item_id, estimate in zip(self.ids, self.estimate)]
 
-def parse_sprint_range(sprint_range):
-    """Sprint aralığını parse et. Örnek: '50-55' -> [50, 51, 52, 53, 54, 55]"""
-    if '-' in sprint_range:
-        start, end = sprint_range.split('-')
-        return list(range(int(start), int(end) + 1))
-    else:
-        return [int(sprint_range)]
+# 4. Work item detaylarını al
+# workitemsbatch tek istekte en fazla 200 id kabul eder
+WORK_ITEMS_BATCH_SIZE = 200
 
-# Kişi bazında kapasite analizi
-def get_team_members_capacity(iteration_id):
-    """Her takım üyesi için kapasite bilgilerini al"""
-    url = f"{base_url}/{project_encoded}/{team_encoded}/_apis/work/teamsettings/iterations/{iteration_id}/capacities?api-version=7.0"
-    if settings['debug']:
-        print(f"Debug: Getting team members capacity from URL: {url}")
-    res = requests.get(url, headers=headers)
-    if settings['debug']:
-        print(f"Debug: Team capacity response status: {res.status_code}")
+def compact_work_item(item):
+    """Work item'ın yalnızca id, rev ve alanlarını tut; kimlik alanlarından (AssignedTo) sadece displayName kalır"""
+    fields = {}
+    for name, value in (item.get("fields") or {}).items():
+        if isinstance(value, dict) and "displayName" in value:
+            value = {"displayName": value["displayName"]}
+        fields[name] = value
+    return {"id": item["id"], "rev": item.get("rev", 0), "fields": fields}
+
+@profiler.timed('workitems_batch')
+def fetch_work_items_batch(chunk, fields):
+    """Tek bir id parçasını workitemsbatch POST uç noktasından akış halinde çek"""
+    url = f"{base_url}/{scope().project_encoded}/_apis/wit/workitemsbatch?api-version=7.0"
+    body = {
+        "ids": list(chunk),
+        "fields": fields,
+        # Silinmiş/erişilemeyen id'ler tüm isteği düşürmesin
+        "errorPolicy": "omit",
+    }
+    res = client.post(url, json=body, idempotent=True, stream=True)
     res.raise_for_status()
+    return [compact_work_item(item) for item in client.iter_json_array(res, "value") if item]
 
-    response_data = res.json()
-    members_capacity = {}
-    
-    # Handle both direct list and value wrapper
-    members = response_data if isinstance(response_data, list) else response_data.get("value", [])
-    
-    # If there's a teamMembers wrapper, use that
-    if "teamMembers" in response_data:
-        members = response_data["teamMembers"]
-    
-    for member in members:
-        if isinstance(member, dict):
-            display_name = member["teamMember"]["displayName"]
-            activities = member.get("activities", [])
-            
-            if display_name not in members_capacity:
-                members_capacity[display_name] = {}
-            
-            for activity in activities:
-                if isinstance(activity, dict):
-                    activity_name = activity.get("name", "Unknown")
-                    capacity_per_day = activity.get("capacityPerDay", 0)
-                    total_capacity = capacity_per_day * settings['working_days']
-                    members_capacity[display_name][activity_name] = total_capacity
-                    
-                    if settings['debug']:
-                        print(f"Debug: {display_name} - {activity_name}: {capacity_per_day}/day * {settings['working_days']} = {total_capacity}h total")
-    
-    return members_capacity
+def iter_work_item_pages(work_item_ids, fields=WORK_ITEM_FIELDS, concurrency=None):
+    """Work item parçalarını eşzamanlı çek, her parçayı (sayfa) tamamlandığı anda döndür.
 
-def get_work_hours_by_member_and_activity(work_item_ids):
-    """Work item'ları member ve aktiviteye göre grupla"""
-    chunks = [work_item_ids[i:i+200] for i in range(0, len(work_item_ids), 200)]
-    work_by_member_activity = defaultdict(lambda: defaultdict(float))
+    En fazla `concurrency` istek aynı anda uçuştadır; sayfalar tamamlanma
+    sırasıyla gelir, böylece tüketici (toplayıcılar, depo) beklemeden işlemeye başlar.
+    """
+    concurrency = max(1, concurrency or settings['fetch_concurrency'])
+    chunks = [work_item_ids[i:i+WORK_ITEMS_BATCH_SIZE] for i in range(0, len(work_item_ids), WORK_ITEMS_BATCH_SIZE)]
+    if len(chunks) <= 1 or concurrency == 1:
+        for chunk in chunks:
+            yield fetch_work_items_batch(chunk, fields)
+        return
+
+    fetch = bind_scope(fetch_work_items_batch)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = set()
+        remaining = iter(chunks)
+        for chunk in remaining:
+            pending.add(executor.submit(fetch, chunk, fields))
+            if len(pending) >= concurrency:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                next_chunk = next(remaining, None)
+                if next_chunk is not None:
+                    pending.add(executor.submit(fetch, next_chunk, fields))
+                yield future.result()
+
+def iter_work_items(work_item_ids, fields=WORK_ITEM_FIELDS, concurrency=None):
+    """Work item'ları (id, rev, fields) geldikçe tek tek döndür"""
+    for page in iter_work_item_pages(work_item_ids, fields, concurrency):
+        yield from page
+
+def iter_iteration_work_item_pages(iteration_paths, fields=WORK_ITEM_FIELDS, work_item_types=('Task',)):
+    """Birden çok iterasyonun work item'larını tek WIQL sorgusu ile bul, sayfa sayfa çek.
+
+    Sprint başına ayrı sorgu yerine tüm yollar `IN (...)` ile sorgulanır;
+    System.IterationPath alanı da çekilir, böylece sonuçlar yerel olarak bölünebilir.
+    `work_item_types` boşsa tüm tipler alınır.
+    """
+    if "System.IterationPath" not in fields:
+        fields = fields + ["System.IterationPath"]
+    for i in range(0, len(iteration_paths), WIQL_PATHS_PER_QUERY):
+        group = iteration_paths[i:i+WIQL_PATHS_PER_QUERY]
+        ids = query_work_item_ids(wiql_and(iteration_condition(group),
+                                           work_item_type_condition(work_item_types)))
+        yield from iter_work_item_pages(ids, fields)
 
-    for chunk in chunks:
-        ids_str = ",".join(map(str, chunk))
-        url = f"{base_url}/{project_encoded}/_apis/wit/workitems?ids={ids_str}&fields=System.AssignedTo,Microsoft.VSTS.Common.Activity,Microsoft.VSTS.Scheduling.OriginalEstimate&api-version=7.0"
-        res = requests.get(url, headers=headers)
+def get_work_items_by_iteration(iteration_paths, fields=WORK_ITEM_FIELDS):
+    """Birden çok iterasyonun Task'larını tek sorgu ile çekip iterasyona göre sıkışık sütunlara ayır"""
+    items_by_path = {path: WorkItemColumns() for path in iteration_paths}
+    for page in iter_iteration_work_item_pages(iteration_paths, fields):
+        for item in page:
+            path = item.get("fields", {}).get("System.IterationPath")
+            if path in items_by_path:
+                items_by_path[path].append(item["fields"], item["id"])
+    return items_by_path
+
+# Analytics (OData) motoru
+# Sunucu tarafında gruplanan saatler; work item'lar tek tek indirilmez
+ENGINES = ['rest', 'analytics']
+ANALYTICS_PATHS_PER_QUERY = 25
+
+def analytics_url():
+    """Geçerli proje için Analytics OData WorkItems uç noktası"""
+    root = settings['analytics_url']
+    if not root:
+        # Azure DevOps Services'te Analytics ayrı bir alan adındadır; Server'da aynı sunucudadır
+        root = 'https://analytics.dev.azure.com' if settings['server_url'] == 'https://dev.azure.com' else settings['server_url']
+    return f"{root}/{organization_encoded}/{scope().project_encoded}/_odata/v4.0-preview/WorkItems"
+
+def odata_quote(value):
+    """OData string literal'i (tek tırnaklar çiftlenir)"""
+    return "'" + value.replace("'", "''") + "'"
+
+@profiler.timed('analytics')
+def query_analytics(apply):
+    """$apply sorgusunu çalıştır, tüm sayfaların satırlarını döndür (@odata.nextLink izlenir)"""
+    url = f"{analytics_url()}?$apply={quote(apply)}"
+    rows = []
+    while url:
+        if settings['debug']:
+            print(f"Debug: Analytics URL: {url}")
+        res = client.get(url, stream=True)
+        if res.status_code != 200:
+            if settings['debug']:
+                print(f"Debug: Analytics response text: {res.text}")
         res.raise_for_status()
-        
-        for item in res.json()["value"]:
-            fields = item.get("fields", {})
-            
-            # Assigned To field'ından kişi adını al
-            assigned_to = fields.get("System.AssignedTo")
-            if assigned_to and isinstance(assigned_to, dict):
-                member_name = assigned_to.get("displayName", "Unassigned")
-            else:
-                member_name = "Unassigned"
-            
-            activity = fields.get("Microsoft.VSTS.Common.Activity", "Unknown")
-            hours = fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate", 0)
-            
-            if hours and hours > 0:
-                work_by_member_activity[member_name][activity] += hours
-                
-                if settings['debug']:
-                    print(f"Debug: {member_name} - {activity}: +{hours}h")
-    
-    return work_by_member_activity
+        payload = {}
+        rows.extend(client.iter_json_array(res, "value", payload))
+        url = payload.get("@odata.nextLink")
+    return rows
 
-def generate_capacity_report(sprint_numbers, all_results):
-    """Kişi bazında kapasite raporu oluştur"""
-    print(f"\n👥 Kişi Bazında Kapasite Analizi:")
-    print("=" * 90)
-    
-    for sprint_num in sprint_numbers:
-        sprint_name = f"Sprint {sprint_num}"
-        print(f"\n📋 {sprint_name}:")
-        print("-" * 90)
-        
-        try:
-            # Sprint bilgilerini al
-            iteration_id, iteration_path = get_iteration_id(sprint_name)
-            
-            # Kişi bazında kapasiteleri al
-            members_capacity = get_team_members_capacity(iteration_id)
-            
-            # Work item'ları al
-            work_ids = get_work_items_ids(iteration_path)
-            
-            # Kişi ve aktivite bazında planlanan işleri al
-            work_by_member = get_work_hours_by_member_and_activity(work_ids)
-            
-            # Tüm kişileri topla (hem kapasite hem work'te olanları)
-            all_members = set(members_capacity.keys()) | set(work_by_member.keys())
-            
-            print(f"{'Kişi':<25}{'Aktivite':<20}{'Kapasite (h)':>15}{'Planlanan (h)':>15}{'Yüklenme (%)':>15}")
-            print("-" * 90)
-            
-            for member in sorted(all_members):
-                member_total_capacity = 0
-                member_total_planned = 0
-                
-                # Bu kişinin tüm aktivitelerini topla
-                activities = set()
-                if member in members_capacity:
-                    activities.update(members_capacity[member].keys())
-                if member in work_by_member:
-                    activities.update(work_by_member[member].keys())
-                
-                # Aktivite bazında göster
-                for activity in sorted(activities):
-                    capacity = members_capacity.get(member, {}).get(activity, 0)
-                    planned = work_by_member.get(member, {}).get(activity, 0)
-                    
-                    if capacity > 0 or planned > 0:
-                        utilization = (planned / capacity * 100) if capacity > 0 else 0
-                        
-                        # Renk kodu
-                        if utilization > 100:
-                            utilization_str = f"{Colors.RED}{utilization:.1f}%{Colors.RESET}"
-                        elif utilization > 90:
-                            utilization_str = f"{Colors.YELLOW}{utilization:.1f}%{Colors.RESET}"
-                        else:
-                            utilization_str = f"{utilization:.1f}%"
-                        
-                        print(f"{member:<25}{activity:<20}{capacity:>15.1f}{planned:>15.1f}{utilization_str:>25}")
-                        
-                        member_total_capacity += capacity
-                        member_total_planned += planned
-                
-                # Kişi toplamı
-                if member_total_capacity > 0 or member_total_planned > 0:
-                    total_utilization = (member_total_planned / member_total_capacity * 100) if member_total_capacity > 0 else 0
-                    
-                    if total_utilization > 100:
-                        total_util_str = f"{Colors.RED}{Colors.BOLD}{total_utilization:.1f}%{Colors.RESET}"
-                    elif total_utilization > 90:
-                        total_util_str = f"{Colors.YELLOW}{Colors.BOLD}{total_utilization:.1f}%{Colors.RESET}"
-                    else:
-                        total_util_str = f"{Colors.BOLD}{total_utilization:.1f}%{Colors.RESET}"
-                    
-                    print(f"{'':<25}{Colors.BOLD}{'TOPLAM':<20}{member_total_capacity:>15.1f}{member_total_planned:>15.1f}{total_util_str:>25}")
-                    print("-" * 90)
-        
-        except Exception as e:
-            print(f"❌ {sprint_name} kişi bazında analiz edilemedi: {e}")
+def analytics_filters(iteration_paths, work_item_types=('Task',)):
+    """İterasyon yollarını sorgu başına ANALYTICS_PATHS_PER_QUERY'lik gruplara bölüp filter() ifadeleri üret"""
+    type_filter = " or ".join(f"WorkItemType eq {odata_quote(name)}" for name in work_item_types or ())
+    for i in range(0, len(iteration_paths), ANALYTICS_PATHS_PER_QUERY):
+        group = iteration_paths[i:i+ANALYTICS_PATHS_PER_QUERY]
+        path_filter = " or ".join(f"Iteration/IterationPath eq {odata_quote(path)}" for path in group)
+        yield f"filter(({type_filter}) and ({path_filter}))" if type_filter else f"filter({path_filter})"
 
-# Ana akış
-if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description='Azure DevOps Sprint Analysis')
-    parser.add_argument('sprints', nargs='?', default='51', 
-                       help='Sprint number or range (e.g., "51" or "50-55")')
-    parser.add_argument('--report', choices=['default', 'capacity', 'trend', 'workitem-types', 'all'], 
-                       default='default',
-                       help='Report type to generate')
+def get_aggregated_work_by_iteration(iteration_paths, work_item_types=('Task',)):
+    """Task saatlerini Analytics'te (iterasyon, aktivite, kişi, durum) bazında gruplanmış olarak al.
+
+    Her grup, REST yolundaki work item alanlarıyla aynı biçimde tek bir kayıt
+    olarak döndürülür (OriginalEstimate = grubun toplamı); böylece mevcut
+    toplama fonksiyonları ve raporlar değişmeden çalışır.
+    """
+    items_by_path = {path: WorkItemColumns() for path in iteration_paths}
+    for row_filter in analytics_filters(iteration_paths, work_item_types):
+        apply = (f"{row_filter}/groupby((Iteration/IterationPath, Activity, AssignedTo/UserName, State), "
+                 "aggregate(OriginalEstimate with sum as OriginalEstimate, $count as Count))")
+        for row in query_analytics(apply):
+            path = (row.get("Iteration") or {}).get("IterationPath")
+            if path not in items_by_path:
+                continue
+            # REST'te boş alanlar yanıtta hiç yer almaz; aynı şekilde atlanır
+            fields = {"System.State": row.get("State")}
+            if row.get("Activity"):
+                fields["Microsoft.VSTS.Common.Activity"] = row["Activity"]
+            assigned_to = (row.get("AssignedTo") or {}).get("UserName")
+            if assigned_to:
+                fields["System.AssignedTo"] = {"displayName": assigned_to}
+            if row.get("OriginalEstimate") is not None:
+                fields["Microsoft.VSTS.Scheduling.OriginalEstimate"] = row["OriginalEstimate"]
+            items_by_path[path].append(fields)
+    return items_by_path
+
+# Yerel work item deposu
+STORE_FIELDS = WORK_ITEM_FIELDS + [
+    "System.IterationPath",
+    "System.WorkItemType",
+    "System.ChangedDate",
+]
+
+def iteration_is_open(iteration):
+    """İterasyon bitmemiş mi (bitiş tarihi bugün ya da sonrası, ya da tarihsiz)"""
+    finish = parse_day(iteration.get('finishDate'))
+    return finish is None or finish >= datetime.now(timezone.utc).date()
+
+def utc_timestamp(seconds_ago=0):
+    """WIQL tarih karşılaştırmaları için UTC zaman damgası"""
+    moment = datetime.now(timezone.utc) - timedelta(seconds=seconds_ago)
+    return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+class WorkItemStore:
+    """Work item alanlarının yerel SQLite kopyası (id ve System.Rev ile anahtarlı).
+
+    Bir iterasyon ilk istendiğinde tüm Task'ları çekilir ve iterasyon
+    senkronize olarak işaretlenir. Sonraki çalıştırmalarda, çalıştırma başına
+    bir kez, yalnızca son senkronizasyondan beri değişen
+    ([System.ChangedDate] > watermark) Task'lar yeniden çekilir. Silinen
+    Task'lar değişiklik sorgusunda görünmediğinden açık (güncel / gelecek)
+    iterasyonların id listesi yeniden sorgulanır ve dönmeyenler depodan
+    çıkarılır. Kapanmış sprintler hiç istek maliyeti getirmez.
+    """
+
+    # İstemci/sunucu saat farkına karşı watermark bu kadar saniye geriden tutulur
+    CLOCK_SKEW = 600
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS work_items (
+        id INTEGER PRIMARY KEY,
+        rev INTEGER NOT NULL,
+        iteration_path TEXT,
+        work_item_type TEXT,
+        fields TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_work_items_iteration ON work_items(iteration_path);
+    CREATE TABLE IF NOT EXISTS synced_iterations (
+        path TEXT PRIMARY KEY,
+        synced_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path, fields=STORE_FIELDS):
+        self.path = Path(path)
+        self.fields = list(fields)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._changes_synced = False
+        self._pruned = set()  # Bu senkronizasyon turunda id listesi doğrulanmış açık iterasyonlar
+
+    def _connect(self):
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.executescript(self.SCHEMA)
+            # Alan listesi değiştiyse eski kayıtlar eksik alan taşır; depoyu sıfırla
+            signature = ",".join(sorted(self.fields))
+            row = conn.execute("SELECT value FROM sync_state WHERE key = 'fields'").fetchone()
+            if row is None or row[0] != signature:
+                conn.execute("DELETE FROM work_items")
+                conn.execute("DELETE FROM synced_iterations")
+                conn.execute("DELETE FROM sync_state")
+                conn.execute("INSERT INTO sync_state(key, value) VALUES ('fields', ?)", (signature,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _get_state(self, key):
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, key, value):
+        self._conn.execute("INSERT OR REPLACE INTO sync_state(key, value) VALUES (?, ?)", (key, value))
+
+    def _known_ids(self, ids):
+        """Verilen id'lerden depoda bulunanlar"""
+        ids = list(ids)
+        known = set()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i+500]
+            known.update(row[0] for row in self._conn.execute(
+                f"SELECT id FROM work_items WHERE id IN ({', '.join('?' * len(chunk))})", chunk))
+        return known
+
+    def _upsert(self, items):
+        rows = []
+        for item in items:
+            fields = item.get("fields", {})
+            rows.append((
+                item["id"],
+                item.get("rev", 0),
+                fields.get("System.IterationPath"),
+                fields.get("System.WorkItemType"),
+                json.dumps(fields),
+            ))
+        # Daha eski bir revizyon, yenisinin üzerine yazılmaz
+        self._conn.executemany("""
+            INSERT INTO work_items(id, rev, iteration_path, work_item_type, fields)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                rev = excluded.rev,
+                iteration_path = excluded.iteration_path,
+                work_item_type = excluded.work_item_type,
+                fields = excluded.fields
+            WHERE excluded.rev >= work_items.rev
+        """, rows)
+
+    @profiler.timed('store_delta')
+    def _sync_changes(self, log):
+        """Son watermark'tan beri değişen Task'ları proje genelinde tazele.
+
+        Yalnızca Task'ların alanları çekilir. Tipi Task'tan başka bir tipe
+        değişen kayıtlar için ikinci sorgu yalnızca id döndürür; bunlardan
+        depoda olanlar silinir (tekrar Task olurlarsa ilk sorguda dönerler).
+        """
+        watermark = self._get_state('watermark')
+        if watermark is None:
+            return
+        started = utc_timestamp(self.CLOCK_SKEW)
+        changed = wiql_and("[System.TeamProject] = @project", f"[System.ChangedDate] > '{watermark}'")
+        changed_ids = query_work_item_ids(wiql_and(changed, work_item_type_condition(['Task'])), time_precision=True)
+        if changed_ids:
+            log(f"🔄 {len(changed_ids)} değişmiş Task yerel depoda güncelleniyor...")
+            for page in iter_work_item_pages(changed_ids, self.fields):
+                self._upsert(page)
+        retyped_ids = self._known_ids(query_work_item_ids(
+            wiql_and(changed, "[System.WorkItemType] <> 'Task'"), time_precision=True))
+        if retyped_ids:
+            self._conn.executemany("DELETE FROM work_items WHERE id = ?", [(work_item_id,) for work_item_id in retyped_ids])
+        self._set_state('watermark', started)
+        self._conn.commit()
+
+    @profiler.timed('store_prune')
+    def _prune_deleted(self, iteration_paths):
+        """Açık iterasyonların Task id'lerini yeniden sorgula; artık dönmeyenleri (silinmiş) depodan çıkar"""
+        # Çağıran self._lock'u tutar
+        for i in range(0, len(iteration_paths), WIQL_PATHS_PER_QUERY):
+            group = iteration_paths[i:i+WIQL_PATHS_PER_QUERY]
+            current = set(query_work_item_ids(wiql_and(iteration_condition(group), work_item_type_condition(['Task']))))
+            rows = self._conn.execute(
+                f"SELECT id FROM work_items WHERE work_item_type = 'Task' "
+                f"AND iteration_path IN ({', '.join('?' * len(group))})", group).fetchall()
+            deleted = [(work_item_id,) for work_item_id, in rows if work_item_id not in current]
+            if deleted:
+                self._conn.executemany("DELETE FROM work_items WHERE id = ?", deleted)
+        self._conn.commit()
+        self._pruned.update(iteration_paths)
+
+    def _ensure_changes_synced(self, log):
+        # Çağıran self._lock'u tutar
+        self._connect()
+        if not self._changes_synced:
+            self._sync_changes(log)
+            self._changes_synced = True
+
+    @profiler.timed('store_sync')
+    def sync_iterations(self, iterations, log=print):
+        """Henüz depoda olmayan iterasyonları tek toplu sorgu ile yükle, açık olanlardan silinenleri çıkar.
+
+        `iterations` IterationIndex kayıtlarıdır (path, finishDate).
+        """
+        iteration_paths = [iteration['path'] for iteration in iterations]
+        with self._lock:
+            self._ensure_changes_synced(log)
+            synced = {row[0] for row in self._conn.execute("SELECT path FROM synced_iterations")}
+            stale = [iteration['path'] for iteration in iterations
+                     if iteration['path'] in synced and iteration['path'] not in self._pruned and iteration_is_open(iteration)]
+            if stale:
+                self._prune_deleted(stale)
+        missing = [path for path in iteration_paths if path not in synced]
+        profiler.count('cache.store.hit', len(iteration_paths) - len(missing))
+        profiler.count('cache.store.miss', len(missing))
+        if not missing:
+            return
+
+        started = utc_timestamp(self.CLOCK_SKEW)
+        # Sayfalar geldikçe depoya yazılır; tüm aralık bellekte tutulmaz
+        for page in iter_iteration_work_item_pages(missing, self.fields):
+            with self._lock:
+                self._upsert(page)
+        with self._lock:
+            synced_at = utc_timestamp()
+            self._conn.executemany("INSERT OR REPLACE INTO synced_iterations(path, synced_at) VALUES (?, ?)",
+                                   [(path, synced_at) for path in missing])
+            self._pruned.update(missing)
+            if self._get_state('watermark') is None:
+                self._set_state('watermark', started)
+            self._conn.commit()
+
+    @profiler.timed('store_read')
+    def get_iteration_items(self, iteration, log=print):
+        """İterasyondaki Task'ların alanlarını depodan (WorkItemColumns olarak) döndür, gerekirse önce senkronize et"""
+        self.sync_iterations([iteration], log)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, fields FROM work_items WHERE iteration_path = ? AND work_item_type = 'Task'",
+                (iteration['path'],)).fetchall()
+        work_items = WorkItemColumns()
+        for work_item_id, fields in rows:
+            work_items.append(json.loads(fields), work_item_id)
+        return work_items
+
+    def iter_items(self, iteration_paths):
+        """İterasyonlardaki Task'ları (id, alanlar) olarak depodan döndür (önceden sync_iterations çağrılmalı)"""
+        for i in range(0, len(iteration_paths), WIQL_PATHS_PER_QUERY):
+            group = iteration_paths[i:i+WIQL_PATHS_PER_QUERY]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, fields FROM work_items WHERE work_item_type = 'Task' "
+                    f"AND iteration_path IN ({', '.join('?' * len(group))})", group).fetchall()
+            for work_item_id, fields in rows:
+                yield work_item_id, json.loads(fields)
+
+    def expire_changes(self):
+        """Bir sonraki okumada değişen ve silinen Task'ları yeniden senkronize et (uzun çalışan süreçler için)"""
+        with self._lock:
+            self._changes_synced = False
+            self._pruned.clear()
+
+    def reset(self):
+        """Depoyu tamamen sil (silinmiş work item'ları temizlemek için)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self.path.exists():
+                self.path.unlink()
+            self._changes_synced = False
+            self._pruned.clear()
+
+# Burndown: reporting/workitemrevisions akışından günlük kalan / tamamlanan iş serileri
+REVISION_FIELDS = [
+    "System.IterationPath",
+    "System.WorkItemType",
+    "System.State",
+    "System.AssignedTo",
+    "System.ChangedDate",
+    "Microsoft.VSTS.Common.Activity",
+    "Microsoft.VSTS.Scheduling.RemainingWork",
+    "Microsoft.VSTS.Scheduling.CompletedWork",
+]
+REVISIONS_PAGE_SIZE = 1000
+
+def revision_record(revision):
+    """Revizyonu (id, rev, gün, iterasyon, aktivite, kişi, kalan, tamamlanan) kaydına indir"""
+    fields = revision.get("fields") or {}
+    assigned_to = fields.get("System.AssignedTo")
+    if isinstance(assigned_to, dict):
+        member = assigned_to.get("displayName") or "Unassigned"
+    else:
+        # Eski sürümler kimliği "Ad <e-posta>" metni olarak döndürür
+        member = str(assigned_to).split(" <")[0] if assigned_to else "Unassigned"
+    removed = fields.get("System.State") == "Removed"
+    return (
+        revision["id"],
+        revision.get("rev", 0),
+        (fields.get("System.ChangedDate") or "")[:10],
+        fields.get("System.IterationPath"),
+        fields.get("Microsoft.VSTS.Common.Activity") or "Unknown",
+        member,
+        0.0 if removed else float(fields.get("Microsoft.VSTS.Scheduling.RemainingWork") or 0),
+        0.0 if removed else float(fields.get("Microsoft.VSTS.Scheduling.CompletedWork") or 0),
+    )
+
+class BurndownStore:
+    """Reporting revisions akışının yerel, artımlı özeti (proje başına SQLite).
+
+    Revizyonların kendisi saklanmaz: her Task'ın son bilinen durumu
+    (item_state) ile yeni revizyonu arasındaki fark, (iterasyon, gün,
+    aktivite, kişi) anahtarlı günlük değişim tablosuna (deltas) eklenir.
+    Devam jetonu (continuation token) kalıcıdır; sonraki çalıştırmalar yalnızca
+    yeni revizyonları çeker. Bir günün değeri, o güne kadarki değişimlerin gün
+    sırasıyla yürüyen toplamıdır; revizyonlar her seferinde yeniden oynatılmaz.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS item_state (
+        id INTEGER PRIMARY KEY,
+        rev INTEGER NOT NULL,
+        iteration_path TEXT,
+        activity TEXT NOT NULL,
+        member TEXT NOT NULL,
+        remaining REAL NOT NULL,
+        completed REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS deltas (
+        iteration_path TEXT NOT NULL,
+        day TEXT NOT NULL,
+        activity TEXT NOT NULL,
+        member TEXT NOT NULL,
+        remaining REAL NOT NULL,
+        completed REAL NOT NULL,
+        PRIMARY KEY (iteration_path, day, activity, member)
+    );
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path=None):
+        # path None ise (depo kapalı) her çalıştırma akışı baştan okur
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path) if self.path else ':memory:', check_same_thread=False)
+            conn.executescript(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get_state(self, key):
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _apply(self, records):
+        """(id, rev) sırasına dizilmiş revizyonları son durumlarla birleştirip günlük değişimlere yaz"""
+        ids = sorted({record[0] for record in records})
+        state = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i+500]
+            for row in self._conn.execute(
+                    f"SELECT id, rev, iteration_path, activity, member, remaining, completed FROM item_state "
+                    f"WHERE id IN ({', '.join('?' * len(chunk))})", chunk):
+                state[row[0]] = row[1:]
+
+        deltas = defaultdict(lambda: [0.0, 0.0])
+        for work_item_id, rev, day, path, activity, member, remaining, completed in records:
+            previous = state.get(work_item_id)
+            if previous is not None:
+                if rev <= previous[0]:
+                    continue  # Jeton sınırında tekrar gelen revizyon
+                totals = deltas[(previous[1], day, previous[2], previous[3])]
+                totals[0] -= previous[4]
+                totals[1] -= previous[5]
+            totals = deltas[(path, day, activity, member)]
+            totals[0] += remaining
+            totals[1] += completed
+            state[work_item_id] = (rev, path, activity, member, remaining, completed)
+
+        self._conn.executemany("""
+            INSERT INTO deltas(iteration_path, day, activity, member, remaining, completed)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(iteration_path, day, activity, member) DO UPDATE SET
+                remaining = remaining + excluded.remaining,
+                completed = completed + excluded.completed
+        """, [key + tuple(values) for key, values in deltas.items() if key[0] is not None])
+        self._conn.executemany("INSERT OR REPLACE INTO item_state VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               [(work_item_id,) + values for work_item_id, values in state.items()])
+
+    @profiler.timed('revisions')
+    def sync(self, log=print):
+        """Son devam jetonundan bu yana gelen Task revizyonlarını çek ve özete ekle; yeni revizyon sayısını döndür"""
+        with self._lock:
+            self._connect()
+            token = self._get_state('continuation_token')
+            url = (f"{base_url}/{scope().project_encoded}/_apis/wit/reporting/workitemrevisions"
+                   f"?fields={','.join(REVISION_FIELDS)}&types=Task&includeIdentityRef=true"
+                   f"&$maxPageSize={REVISIONS_PAGE_SIZE}&api-version=7.0")
+            count = 0
+            while True:
+                page_url = url + (f"&continuationToken={quote(token)}" if token else "")
+                if settings['debug']:
+                    print(f"Debug: Revisions URL: {page_url}")
+                res = client.get(page_url, stream=True)
+                res.raise_for_status()
+                meta = {}
+                records = sorted(revision_record(revision) for revision in client.iter_json_array(res, "values", meta))
+                self._apply(records)
+                token = meta.get("continuationToken") or token
+                if token:
+                    self._conn.execute("INSERT OR REPLACE INTO sync_state(key, value) VALUES ('continuation_token', ?)",
+                                       (token,))
+                # Her sayfa ayrı işlenir; yarıda kesilen bir çalıştırma kaldığı yerden devam eder
+                self._conn.commit()
+                count += len(records)
+                if count and count % (REVISIONS_PAGE_SIZE * 20) == 0:
+                    log(f"🔄 {count} revizyon işlendi...")
+                if meta.get("isLastBatch", True) or not records:
+                    return count
+
+    def series(self, iteration_path, days):
+        """İterasyonun verilen (sıralı) günlerdeki değerleri: {(aktivite, kişi): [(kalan, tamamlanan), ...]}.
+
+        Günlük değişimler gün sırasıyla okunur ve istenen günlerle birlikte
+        yürünür (sorted merge); her anahtarın yürüyen toplamı o günün değeridir.
+        """
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT day, activity, member, remaining, completed FROM deltas "
+                "WHERE iteration_path = ? ORDER BY day", (iteration_path,)).fetchall()
+        running = defaultdict(lambda: [0.0, 0.0])
+        result = {}
+        position = 0
+        for index, day in enumerate(days):
+            while position < len(rows) and rows[position][0] <= day:
+                _, activity, member, remaining, completed = rows[position]
+                totals = running[(activity, member)]
+                totals[0] += remaining
+                totals[1] += completed
+                position += 1
+            for key, (remaining, completed) in running.items():
+                values = result.setdefault(key, [(0.0, 0.0)] * len(days))
+                values[index] = (remaining, completed)
+        return result
+
+    def reset(self):
+        """Özeti ve devam jetonunu sil (akış baştan okunur)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            if self.path and self.path.exists():
+                self.path.unlink()
+
+# Yapılandırma
+def configure(require_pat=True):
+    """Ayarları yükle ve paylaşılan HTTP istemcisini kur.
+
+    Kütüphane olarak kullanırken diğer fonksiyonlardan önce bir kez çağrılmalıdır;
+    tekrar çağrıldığında mevcut ayarları döndürür. Hatalı ya da eksik
+    konfigürasyonda ConfigError fırlatır. Takıma özgü nesneler (iterasyon
+    indeksi, work item deposu) ilk kullanıldıklarında TeamScope ile kurulur.
+    """
+    global settings, organization_encoded, base_url, client
+    if not isinstance(settings, Unconfigured):
+        return settings
     
-    args = parser.parse_args()
+    loaded = load_azure_settings(require_pat)
     
-    print("🔄 Testing basic connectivity...")
-    if not test_connectivity():
-        print("❌ Basic connectivity failed. Please check your PAT and organization name.")
-        exit(1)
+    # URL encode the components
+    organization_encoded = quote(loaded['organization'])
+    settings = loaded
     
-    print("✅ Basic connectivity successful!")
+    if settings['debug']:
+        print(f"Debug: Original organization: {settings['organization']}")
+        print(f"Debug: Encoded organization: {organization_encoded}")
+        print(f"Debug: Original project: {settings['project']}")
+        print(f"Debug: Encoded project: {quote(settings['project'])}")
+        print(f"Debug: PAT length: {len(settings['pat'])}")
+        print(f"Debug: PAT first 4 chars: {settings['pat'][:4]}...")
+        print(f"Debug: PAT last 4 chars: ...{settings['pat'][-4:]}")
     
-    # Sprint aralığını parse et
-    sprint_numbers = parse_sprint_range(args.sprints)
-    print(f"📋 Analiz edilecek sprintler: {sprint_numbers}")
-    print(f"📊 Rapor türü: {args.report}")
+    # API URL'leri
+    base_url = f"{settings['server_url']}/{organization_encoded}"
     
-    # Sadece capacity raporu isteniyorsa
-    if args.report == 'capacity':
-        generate_capacity_report(sprint_numbers, [])
-        exit(0)
+    client = AzureClient(
+        settings['pat'],
+        pool_size=settings['pool_size'],
+        connect_timeout=settings['connect_timeout'],
+        read_timeout=settings['read_timeout'],
+        gzip=settings['gzip'],
+        max_retries=settings['max_retries'],
+        requests_per_second=settings['requests_per_second'],
+        max_in_flight=settings['max_in_flight'],
+    )
+    return settings
+
+# Takım kapsamı
+class TeamScope:
+    """Bir proje/takım çiftine ait durum: URL parçaları, iterasyon indeksi ve work item deposu.
+
+    Tek takımlı çalıştırmada config.ini'deki takımın kapsamı kullanılır.
+    Organizasyon genelinde çalıştırmada her takım kendi kapsamında analiz
+    edilir; HTTP istemcisi (bağlantı havuzu) ve proje başına work item deposu
+    takımlar arasında paylaşılır.
+    """
+
+    def __init__(self, project, team):
+        self.project = project
+        self.team = team
+        self.project_encoded = quote(project)
+        self.team_encoded = quote(team)
+        self.iteration_index = IterationIndex(
+            f"{base_url}/{self.project_encoded}/{self.team_encoded}/_apis/work/teamsettings/iterations?api-version=7.0",
+            cache_path=cache_file('iterations', project=project, team=team),
+            ttl=settings['iteration_ttl'],
+        )
+        self.work_item_store = project_work_item_store(project)
+        self._calendar = None
+        self._calendar_lock = threading.Lock()
+
+    @property
+    def calendar(self):
+        """Takımın çalışma günlerine göre iş günü takvimi (ilk kullanımda bir kez çekilir)"""
+        with self._calendar_lock:
+            if self._calendar is None:
+                with use_scope(self):
+                    self._calendar = WorkCalendar(get_team_working_weekdays())
+            return self._calendar
+
+    @property
+    def label(self):
+        return f"{self.project}/{self.team}"
+
+_work_item_stores = {}
+_burndown_stores = {}
+_scope_lock = threading.Lock()
+_scope_state = threading.local()
+_default_scope = None
+
+def project_work_item_store(project):
+    """Projenin (takımlar arasında paylaşılan) yerel work item deposu; kapalıysa None"""
+    if not settings['work_item_store']:
+        return None
+    with _scope_lock:
+        if project not in _work_item_stores:
+            _work_item_stores[project] = WorkItemStore(cache_file('workitems', 'sqlite', per_team=False, project=project))
+        return _work_item_stores[project]
+
+def project_burndown_store(project):
+    """Projenin revizyon özeti; depo kapalıysa yalnızca bu çalıştırma için bellekte tutulur"""
+    with _scope_lock:
+        if project not in _burndown_stores:
+            path = cache_file('revisions', 'sqlite', per_team=False, project=project) if settings['work_item_store'] else None
+            _burndown_stores[project] = BurndownStore(path)
+        return _burndown_stores[project]
+
+def scope():
+    """Çalışan iş parçacığının takım kapsamı; atanmamışsa config.ini'deki takım"""
+    global _default_scope
+    current = getattr(_scope_state, 'current', None)
+    if current is not None:
+        return current
+    if _default_scope is None:
+        if isinstance(settings, Unconfigured):
+            raise ConfigError("configure() çağrılmadı: takım kapsamı için önce azure.configure() çağırın")
+        # TeamScope depoyu _scope_lock ile aldığı için kilit dışında kurulur
+        team_scope = TeamScope(settings['project'], settings['team'])
+        with _scope_lock:
+            if _default_scope is None:
+                _default_scope = team_scope
+    return _default_scope
+
+@contextmanager
+def use_scope(team_scope):
+    """Bu iş parçacığında geçici olarak `team_scope` kapsamında çalış"""
+    previous = getattr(_scope_state, 'current', None)
+    _scope_state.current = team_scope
+    try:
+        yield team_scope
+    finally:
+        _scope_state.current = previous
+
+def bind_scope(func):
+    """func'ı, çağıranın takım kapsamında çalışacak şekilde sar (iş parçacığı havuzları için)"""
+    team_scope = scope()
+    sprints = profiler.current_sprints()
+    def run(*args, **kwargs):
+        with use_scope(team_scope), profiler.tagged(sprints):
+            return func(*args, **kwargs)
+    return run
+
+def check_access():
+    """Erişimi ilk gerçek istekle (iterasyon listesi) doğrula; ayrı bir test isteği atılmaz.
+
+    Liste diskteki önbellekten gelirse hiç istek atılmaz. Hata durumunda
+    hatayı, başarıda None döndürür.
+    """
+    try:
+        scope().iteration_index._ensure_loaded()
+    except Exception as e:
+        return e
+    return None
+
+# Work item'ları aktiviteye göre grupla
+def sum_completed_work_by_activity(items):
+    """Tamamlanmış Task'ların planlanan saatlerini aktiviteye göre topla (velocity)"""
+    completed_by_activity = defaultdict(float)
+    for fields in items:
+        activity = fields.get("Microsoft.VSTS.Common.Activity")
+        if activity and fields.get("System.State") in COMPLETED_STATES:
+            completed_by_activity[activity] += fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate", 0) or 0
+    return completed_by_activity
+
+def sum_work_by_activity(items):
+    work_by_activity = defaultdict(float)
+    for fields in items:
+        activity = fields.get("Microsoft.VSTS.Common.Activity")
+        hours = fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate", 0)
+        if activity:
+            work_by_activity[activity] += hours
+    return work_by_activity
+
+class SprintSnapshot:
+    """Bir sprintin tüm raporlar için gereken verisi.
+
+    İterasyon, kapasite kayıtları ve work item alanları bir kez çekilir;
+    varsayılan rapor ve kişi bazında kapasite raporu aynı snapshot'tan
+    hesaplanır. Work item'lar WorkItemColumns olarak sıkışık tutulur, böylece
+    uzun aralıklarda tüm snapshot'lar birlikte bellekte kalabilir.
+    """
+
+    def __init__(self, name, iteration=None, members=None, work_items=None, error=None, calendar=None):
+        self.name = name
+        self.iteration = iteration
+        self.members = members or []
+        self.work_items = work_items if isinstance(work_items, WorkItemColumns) else WorkItemColumns(work_items or [])
+        self.error = error
+        self.calendar = calendar
+
+    def member_working_days(self, member):
+        """Üyenin sprintteki çalışma günü; takvim yoksa config'deki sabit working_days"""
+        if self.calendar is None:
+            return settings['working_days']
+        return self.calendar.member_days(member.get("daysOff") or [])
+
+    def capacity_by_activity(self):
+        """Aktivite bazında sprint kapasitesi (saat)"""
+        return sum_capacity_by_activity(self.members, self.member_working_days)
+
+    def work_by_activity(self):
+        return sum_work_by_activity(self.work_items)
+
+    def completed_by_activity(self):
+        return sum_completed_work_by_activity(self.work_items)
+
+    def members_capacity(self):
+        return sum_capacity_by_member(self.members, self.member_working_days)
+
+    def work_by_member(self):
+        return sum_work_by_member_and_activity(self.work_items)
+
+# Tek bir sprint için analiz yapan fonksiyon
+def analyze_sprint(sprint_name, log=print, work_items_by_path=None):
+    log(f"\n� {sprint_name} analiz ediliyor...")
     
-    # Varsayılan rapor (mevcut analiz)
-    if args.report in ['default', 'all']:
-        # Tüm sonuçları topla
-        all_results = []
+    try:
+        with profiler.phase('sprint', sprint=sprint_name):
+            team_scope = scope()
+            iteration = team_scope.iteration_index.get(sprint_name)
+            log(f"✅ {sprint_name} bulundu! Path: {iteration['path']}")
         
-        for sprint_num in sprint_numbers:
-            sprint_name = f"Sprint {sprint_num}"
-            sprint_name, capacity_data, work_data = analyze_sprint(sprint_name)
-            
-            # Her aktivite için sonuçları kaydet
-            activities = sorted(set(capacity_data.keys()).union(work_data.keys()))
-            for activity in activities:
-                planned = round(work_data.get(activity, 0), 1)
-                capacity = round(capacity_data.get(activity, 0) * settings['working_days'], 1)
-                resource_need = max(0, planned - capacity)  # Sadece pozitif değerler
-                all_results.append({
-                    'Sprint': sprint_name,
-                    'Activity': activity,
-                    'Planned Work (h)': planned,
-                    'Capacity (h)': capacity,
-                    'Resource Need (h)': resource_need
-                })
+            log(f"🔄 {sprint_name} kapasite verisi alınıyor...")
+            members = get_team_capacities(iteration['id'])
+            calendar = None
+            if settings['capacity_calendar'] and iteration.get('startDate') and iteration.get('finishDate'):
+                calendar = team_scope.calendar.sprint(parse_day(iteration['startDate']), parse_day(iteration['finishDate']),
+                                                      get_team_days_off(iteration['id']))
+        
+            work_item_store = team_scope.work_item_store
+            if work_items_by_path and iteration['path'] in work_items_by_path:
+                work_items = work_items_by_path[iteration['path']]
+            elif work_item_store:
+                log(f"� {sprint_name} work item'ları yerel depodan okunuyor...")
+                work_items = work_item_store.get_iteration_items(iteration, log)
+            else:
+                log(f"� {sprint_name} work item listesi alınıyor...")
+                work_ids = get_work_items_ids(iteration['path'])
+                log(f"📊 {sprint_name} work item detayları alınıyor...")
+                work_items = WorkItemColumns.from_work_items(iter_work_items(work_ids))
+        
+            return SprintSnapshot(sprint_name, iteration, members, work_items, calendar=calendar)
+        
+    except Exception as e:
+        log(f"❌ {sprint_name} analiz edilemedi: {e}")
+        return SprintSnapshot(sprint_name, error=e)
+
+def iter_analyze_sprints(sprint_names, jobs=1, quiet=False):
+    """Sprint aralığını (geçerli takım kapsamında) analiz et; snapshot'ları sprint sırasıyla, hazır oldukça üret.
+
+    Work item listesi tüm aralık için tek WIQL sorgusu ile alınır.
+    """
+    log = SprintLog(buffered=quiet)
+    team_scope = scope()
+    iterations = []
+    for sprint_name in sprint_names:
+        try:
+            iterations.append(team_scope.iteration_index.get(sprint_name))
+        except Exception:
+            pass  # analyze_sprint hatayı sprint bazında raporlar
+    iteration_paths = [iteration['path'] for iteration in iterations]
+
+    work_items_by_path = None
+    # Toplu sorguların süresi profilde aralığın sprintlerine bölünür
+    with profiler.phase('sprint_range', sprints=[iteration['name'] for iteration in iterations]):
+        if settings['engine'] == 'analytics' and iteration_paths:
+            log(f"\n📈 {len(iteration_paths)} sprintin saatleri Analytics'ten gruplanmış olarak alınıyor...")
+            try:
+                work_items_by_path = get_aggregated_work_by_iteration(iteration_paths)
+            except Exception as e:
+                log(f"⚠️ Analytics sorgusu başarısız, REST ile devam ediliyor: {e}")
+        if work_items_by_path is None and len(iteration_paths) > 1:
+            log(f"\n� {len(iteration_paths)} sprintin work item listesi tek sorgu ile alınıyor...")
+            try:
+                if team_scope.work_item_store:
+                    team_scope.work_item_store.sync_iterations(iterations, log)
+                else:
+                    work_items_by_path = get_work_items_by_iteration(iteration_paths)
+            except Exception as e:
+                log(f"⚠️ Toplu sorgu başarısız, sprint bazında devam ediliyor: {e}")
+
+    # Sprint işçileri, çağıranın takım kapsamında çalışır
+    return iter_for_sprints(
+        bind_scope(lambda sprint_name, log: analyze_sprint(sprint_name, log, work_items_by_path)),
+        sprint_names, jobs, quiet)
+
+def analyze_sprints(sprint_names, jobs=1, quiet=False):
+    """Sprint aralığını analiz et, tüm snapshot'ları liste olarak döndür"""
+    return list(iter_analyze_sprints(sprint_names, jobs, quiet))
+
+def parse_sprint_range(sprint_range):
+    """Sprint aralığını parse et. Örnek: '50-55' -> [50, 51, 52, 53, 54, 55]"""
+    if '-' in sprint_range:
+        start, end = sprint_range.split('-')
+        return list(range(int(start), int(end) + 1))
+    else:
+        return [int(sprint_range)]
+
+# Paralel sprint çalıştırma
+_print_lock = threading.Lock()
+
+class SprintLog:
+    """Bir sprintin ilerleme satırlarını yazdırır.
+
+    Paralel çalışmada satırlar biriktirilir ve sprint bittiğinde tek blok
+    halinde basılır; böylece farklı sprintlerin çıktısı birbirine karışmaz.
+    """
+
+    def __init__(self, buffered=False):
+        self.buffered = buffered
+        self.lines = []
+
+    def __call__(self, message):
+        if self.buffered:
+            self.lines.append(message)
+        else:
+            with _print_lock:
+                print(message)
+
+    def flush(self):
+        if self.lines:
+            with _print_lock:
+                print("\n".join(self.lines))
+            self.lines = []
+
+def iter_for_sprints(func, sprint_names, jobs=1, quiet=False):
+    """func(sprint_name, log) çağrısını her sprint için çalıştır, sonuçları sprint sırasıyla üret.
+
+    Paralel çalışmada bir sonuç, kendisinden önceki sprintler bittiği anda üretilir;
+    tüm aralığın bitmesi beklenmez. `quiet` ise ilerleme satırları yazdırılmaz.
+    """
+    if jobs <= 1 or len(sprint_names) <= 1:
+        for name in sprint_names:
+            yield func(name, SprintLog(buffered=quiet))
+        return
+
+    def worker(name):
+        log = SprintLog(buffered=True)
+        try:
+            return func(name, log)
+        finally:
+            if not quiet:
+                log.flush()
+
+    # executor.map sonuçları giriş sırasıyla ve tembel olarak döndürür
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(worker, sprint_names)
+
+# Kişi bazında kapasite analizi
+def sum_capacity_by_member(members, working_days=None):
+    """Her takım üyesi için aktivite bazında toplam kapasiteyi hesapla (working_days(üye) verilmezse config'deki sabit)"""
+    members_capacity = {}
+    
+    for member in members:
+        display_name = member["teamMember"]["displayName"]
+        activities = member.get("activities", [])
+        days = working_days(member) if working_days else settings['working_days']
+        
+        if display_name not in members_capacity:
+            members_capacity[display_name] = {}
         
-        # Sonuçları yazdır
+        for activity in activities:
+            if isinstance(activity, dict):
+                activity_name = activity.get("name", "Unknown")
+                capacity_per_day = activity.get("capacityPerDay", 0)
+                total_capacity = capacity_per_day * days
+                members_capacity[display_name][activity_name] = total_capacity
+                
+                if settings['debug']:
+                    print(f"Debug: {display_name} - {activity_name}: {capacity_per_day}/day * {days} = {total_capacity}h total")
+    
+    return members_capacity
+
+def sum_work_by_member_and_activity(items):
+    """Work item'ları member ve aktiviteye göre grupla"""
+    work_by_member_activity = defaultdict(lambda: defaultdict(float))
+
+    for fields in items:
+        # Assigned To field'ından kişi adını al
+        assigned_to = fields.get("System.AssignedTo")
+        if assigned_to and isinstance(assigned_to, dict):
+            member_name = assigned_to.get("displayName", "Unassigned")
+        else:
+            member_name = "Unassigned"
+        
+        activity = fields.get("Microsoft.VSTS.Common.Activity", "Unknown")
+        hours = fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate", 0)
+        
+        if hours and hours > 0:
+            work_by_member_activity[member_name][activity] += hours
+            
+            if settings['debug']:
+                print(f"Debug: {member_name} - {activity}: +{hours}h")
+    
+    return work_by_member_activity
+
+# Sonuç tablosu ve dışa aktarma
+class ResultTable:
+    """Raporların ortak, sütunsal sonuç tablosu.
+
+    Metin anahtarlar (sprint, aktivite, kişi...) tablo başına tek bir sembol
+    havuzunda tutulur; satırlarda yalnızca tamsayı kodları saklanır. Sayısal
+    değerler array sütunlarındadır. Böylece çok sayıda satır, satır başına
+    sözlük yerine birkaç düz diziyle temsil edilir.
+    """
+
+    def __init__(self, name, key_columns, value_columns, integer_columns=()):
+        self.name = name
+        self.key_columns = list(key_columns)
+        self.value_columns = list(value_columns)
+        self.labels = []
+        self._codes = {}
+        self.keys = [array('I') for _ in self.key_columns]
+        self.values = [array('q' if column in integer_columns else 'd') for column in self.value_columns]
+
+    @property
+    def columns(self):
+        return self.key_columns + self.value_columns
+
+    def intern(self, label):
+        """Metni sembol havuzuna ekle, tamsayı kodunu döndür"""
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._codes[label] = code
+            self.labels.append(label)
+        return code
+
+    def append(self, keys, values):
+        for column, key in zip(self.keys, keys):
+            column.append(self.intern(key))
+        for column, value in zip(self.values, values):
+            column.append(int(value) if column.typecode == 'q' else float(value))
+
+    def __len__(self):
+        return len(self.keys[0]) if self.keys else len(self.values[0])
+
+    def column(self, name):
+        """Sayısal sütunu (array) ya da anahtar sütununu (metin listesi) döndür"""
+        if name in self.value_columns:
+            return self.values[self.value_columns.index(name)]
+        labels = self.labels
+        return [labels[code] for code in self.keys[self.key_columns.index(name)]]
+
+    def rows(self):
+        """Satırları (anahtarlar..., değerler...) demetleri olarak sırayla üret"""
+        labels = self.labels
+        keys = self.keys
+        values = self.values
+        for i in range(len(self)):
+            yield tuple(labels[column[i]] for column in keys) + tuple(column[i] for column in values)
+
+OUTPUT_FORMATS = ['csv', 'json', 'parquet']
+
+def write_csv(table, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(table.columns)
+        writer.writerows(table.rows())
+
+def write_json(table, path):
+    """Satır nesnelerinden oluşan JSON dizisi; satırlar tek tek yazılır"""
+    columns = table.columns
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i, row in enumerate(table.rows()):
+            f.write(',\n' if i else '\n')
+            json.dump(dict(zip(columns, row)), f, ensure_ascii=False)
+        f.write('\n]\n')
+
+def write_parquet(table, path):
+    """Anahtar sütunları dictionary-encoded olarak Parquet'e yaz (pyarrow gerekir)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise Exception("Parquet çıktısı için pyarrow gerekli: pip install pyarrow")
+
+    labels = pa.array(table.labels, type=pa.string())
+    arrays = [pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.uint32()), labels) for codes in table.keys]
+    arrays += [pa.array(values, type=pa.int64() if values.typecode == 'q' else pa.float64()) for values in table.values]
+    pq.write_table(pa.Table.from_arrays(arrays, names=table.columns), str(path))
+
+OUTPUT_WRITERS = {'csv': write_csv, 'json': write_json, 'parquet': write_parquet}
+
+@profiler.timed('write_output')
+def write_tables(tables, output_format, output_dir):
+    """Her tabloyu `output_dir/<tablo adı>.<format>` dosyasına yaz"""
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    writer = OUTPUT_WRITERS[output_format]
+    for table in tables:
+        path = directory / f"{table.name}.{output_format}"
+        writer(table, path)
+        print(f"💾 {path} ({len(table)} satır)")
+
+# Sprint özeti (varsayılan rapor)
+@profiler.timed('aggregate')
+def sprint_activity_rows(snapshot):
+    """Bir sprint için (aktivite, planlanan, kapasite, kaynak ihtiyacı) satırları"""
+    capacity_data = snapshot.capacity_by_activity()
+    work_data = snapshot.work_by_activity()
+    
+    rows = []
+    activities = sorted(set(capacity_data.keys()).union(work_data.keys()))
+    for activity in activities:
+        planned = round(work_data.get(activity, 0), 1)
+        capacity = round(capacity_data.get(activity, 0), 1)
+        resource_need = max(0, planned - capacity)  # Sadece pozitif değerler
+        rows.append((activity, planned, capacity, resource_need))
+    return rows
+
+class SprintReport:
+    """Sprint analiz özeti; satırlar sprint geldikçe basılır, özetler yürüyen toplamlardan üretilir.
+
+    `add()` her snapshot için bir kez çağrılır ve o sprintin satırlarını hemen yazdırır;
+    `finish()` genel özeti ve sprint/aktivite bazında kaynak ihtiyaçlarını, tabloyu
+    yeniden taramadan, biriktirilen toplamlardan yazdırır.
+    """
+
+    def __init__(self):
+        self.table = ResultTable('sprint_activity', ['sprint', 'activity'],
+                                 ['planned_hours', 'capacity_hours', 'resource_need_hours'])
+        self.total_planned = 0
+        self.total_capacity = 0
+        self.total_resource_need = 0
+        self.sprint_needs = defaultdict(list)      # sprint -> [(aktivite, ihtiyaç)]
+        self.activity_needs = defaultdict(list)    # aktivite -> [(sprint, ihtiyaç)]
+        self.activity_totals = defaultdict(float)  # aktivite -> toplam ihtiyaç
+
+    def print_header(self):
         print(f"\n📋 Sprint Analiz Özeti:\n")
         print(f"{'Sprint':<15}{'Activity':<20}{'Planned Work (h)':>20}{'Capacity (h)':>20}{'Resource Need (h)':>20}")
         print("-" * 95)
-        
-        for result in all_results:
-            resource_need = result['Resource Need (h)']
+
+    def add(self, snapshot):
+        """Sprintin satırlarını yazdır ve toplamlara ekle"""
+        for activity, planned, capacity, resource_need in sprint_activity_rows(snapshot):
             if resource_need > 0:
                 # Kırmızı renkte göster eğer kaynak ihtiyacı varsa
                 resource_need_str = f"{Colors.RED}{resource_need:.1f}{Colors.RESET}"
+                self.sprint_needs[snapshot.name].append((activity, resource_need))
+                self.activity_needs[activity].append((snapshot.name, resource_need))
+                self.activity_totals[activity] += resource_need
             else:
                 resource_need_str = f"{resource_need:.1f}"
-                
-            print(f"{result['Sprint']:<15}{result['Activity']:<20}{result['Planned Work (h)']:>20}{result['Capacity (h)']:>20}{resource_need_str:>30}")
             
+            print(f"{snapshot.name:<15}{activity:<20}{planned:>20}{capacity:>20}{resource_need_str:>30}")
+            self.table.append((snapshot.name, activity), (planned, capacity, resource_need))
+            self.total_planned += planned
+            self.total_capacity += capacity
+            self.total_resource_need += resource_need
+
+    def finish(self):
+        """Genel özet ve kaynak ihtiyacı özetlerini yazdır, sonuç tablosunu döndür"""
+        if not len(self.table):
+            return self.table
+        
         # Özet istatistikler
-        if all_results:
-            print(f"\n📊 Genel Özet:")
-            total_planned = sum(r['Planned Work (h)'] for r in all_results)
-            total_capacity = sum(r['Capacity (h)'] for r in all_results)
-            total_resource_need = sum(r['Resource Need (h)'] for r in all_results)
-            print(f"Toplam Planlanan İş: {total_planned:.1f} saat")
-            print(f"Toplam Kapasite: {total_capacity:.1f} saat")
-            print(f"Kapasite Kullanım Oranı: {(total_planned/total_capacity*100) if total_capacity > 0 else 0:.1f}%")
-            if total_resource_need > 0:
-                print(f"{Colors.RED}Toplam Kaynak İhtiyacı: {total_resource_need:.1f} saat{Colors.RESET}")
-            else:
-                print(f"{Colors.GREEN}✅ Kaynak ihtiyacı yok - kapasite yeterli{Colors.RESET}")
-            
-            # Sprint bazında kaynak ihtiyaçları özeti
-            print(f"\n🚨 Sprint Bazında Kaynak İhtiyaçları:")
-            
-            # Sprint bazında grupla
-            sprint_needs = {}
-            for result in all_results:
-                if result['Resource Need (h)'] > 0:  # Sadece ihtiyaç olanları göster
-                    sprint = result['Sprint']
-                    if sprint not in sprint_needs:
-                        sprint_needs[sprint] = []
-                    sprint_needs[sprint].append({
-                        'Activity': result['Activity'],
-                        'Need': result['Resource Need (h)']
-                    })
+        print(f"\n📊 Genel Özet:")
+        print(f"Toplam Planlanan İş: {self.total_planned:.1f} saat")
+        print(f"Toplam Kapasite: {self.total_capacity:.1f} saat")
+        print(f"Kapasite Kullanım Oranı: {(self.total_planned/self.total_capacity*100) if self.total_capacity > 0 else 0:.1f}%")
+        if self.total_resource_need > 0:
+            print(f"{Colors.RED}Toplam Kaynak İhtiyacı: {self.total_resource_need:.1f} saat{Colors.RESET}")
+        else:
+            print(f"{Colors.GREEN}✅ Kaynak ihtiyacı yok - kapasite yeterli{Colors.RESET}")
+        
+        # Sprint bazında kaynak ihtiyaçları özeti
+        print(f"\n🚨 Sprint Bazında Kaynak İhtiyaçları:")
+        
+        if self.sprint_needs:
+            print(f"{'Sprint':<15}{'Activity':<20}{'İhtiyaç (saat)':>15}")
+            print("-" * 50)
             
-            if sprint_needs:
-                print(f"{'Sprint':<15}{'Activity':<20}{'İhtiyaç (saat)':>15}")
-                print("-" * 50)
+            for sprint in sorted(self.sprint_needs.keys()):
+                # Sprint başına toplam ihtiyaç
+                sprint_total = sum(need for _, need in self.sprint_needs[sprint])
+                print(f"\n{Colors.BOLD}{sprint:<15}{'TOPLAM':<20}{Colors.RED}{sprint_total:.1f}{Colors.RESET}")
                 
-                for sprint in sorted(sprint_needs.keys()):
-                    # Sprint başına toplam ihtiyaç
-                    sprint_total = sum(item['Need'] for item in sprint_needs[sprint])
-                    print(f"\n{Colors.BOLD}{sprint:<15}{'TOPLAM':<20}{Colors.RED}{sprint_total:.1f}{Colors.RESET}")
-                    
-                    # Aktivite bazında detaylar
-                    for item in sorted(sprint_needs[sprint], key=lambda x: x['Need'], reverse=True):
-                        print(f"{'':>15}{item['Activity']:<20}{Colors.RED}{item['Need']:.1f}{Colors.RESET}")
-            else:
-                print(f"{Colors.GREEN}✅ Hiçbir sprintte kaynak ihtiyacı yok!{Colors.RESET}")
+                # Aktivite bazında detaylar
+                for activity, need in sorted(self.sprint_needs[sprint], key=lambda x: x[1], reverse=True):
+                    print(f"{'':>15}{activity:<20}{Colors.RED}{need:.1f}{Colors.RESET}")
+        else:
+            print(f"{Colors.GREEN}✅ Hiçbir sprintte kaynak ihtiyacı yok!{Colors.RESET}")
+        
+        # Aktivite bazında kaynak ihtiyaçları özeti
+        print(f"\n📊 Aktivite Bazında Kaynak İhtiyaçları:")
+        
+        if self.activity_needs:
+            print(f"{'Activity':<20}{'Sprint':<15}{'İhtiyaç (saat)':>15}")
+            print("-" * 50)
             
-            # Aktivite bazında kaynak ihtiyaçları özeti
-            print(f"\n📊 Aktivite Bazında Kaynak İhtiyaçları:")
+            # Toplam ihtiyaca göre aktiviteleri sırala
+            for activity in sorted(self.activity_totals.keys(), key=lambda x: self.activity_totals[x], reverse=True):
+                # Aktivite başına toplam ihtiyaç
+                activity_total = self.activity_totals[activity]
+                print(f"\n{Colors.BOLD}{activity:<20}{'TOPLAM':<15}{Colors.RED}{activity_total:.1f}{Colors.RESET}")
+                
+                # Sprint bazında detaylar (ihtiyaca göre sıralı)
+                for sprint, need in sorted(self.activity_needs[activity], key=lambda x: x[1], reverse=True):
+                    print(f"{'':>20}{sprint:<15}{Colors.RED}{need:.1f}{Colors.RESET}")
+        else:
+            print(f"{Colors.GREEN}✅ Hiçbir aktivitede kaynak ihtiyacı yok!{Colors.RESET}")
+        
+        return self.table
+
+@profiler.timed('render:sprint')
+def generate_sprint_report(snapshots):
+    """Sprint analiz özeti, genel özet ve sprint/aktivite bazında kaynak ihtiyaçları"""
+    report = SprintReport()
+    report.print_header()
+    for snapshot in snapshots:
+        report.add(snapshot)
+    return report.finish()
+
+@profiler.timed('aggregate')
+def member_activity_rows(snapshot):
+    """Bir sprint için kişi ve aktivite sırasıyla (kişi, aktivite, kapasite, planlanan, yüklenme %) satırları"""
+    members_capacity = snapshot.members_capacity()
+    work_by_member = snapshot.work_by_member()
+    
+    rows = []
+    # Tüm kişileri topla (hem kapasite hem work'te olanları)
+    all_members = set(members_capacity.keys()) | set(work_by_member.keys())
+    for member in sorted(all_members):
+        # Bu kişinin tüm aktivitelerini topla
+        activities = set(members_capacity.get(member, {}).keys()) | set(work_by_member.get(member, {}).keys())
+        for activity in sorted(activities):
+            capacity = members_capacity.get(member, {}).get(activity, 0)
+            planned = work_by_member.get(member, {}).get(activity, 0)
+            if capacity > 0 or planned > 0:
+                utilization = (planned / capacity * 100) if capacity > 0 else 0
+                rows.append((member, activity, capacity, planned, utilization))
+    return rows
+
+class CapacityReport:
+    """Kişi bazında kapasite raporu; her sprintin kişi bloğu sprint hazır olunca basılır"""
+
+    def __init__(self):
+        self.table = ResultTable('member_capacity', ['sprint', 'member', 'activity'],
+                                 ['capacity_hours', 'planned_hours', 'utilization_pct'])
+
+    def print_header(self):
+        print(f"\n👥 Kişi Bazında Kapasite Analizi:")
+        print("=" * 90)
+
+    def add(self, snapshot):
+        """Bir sprintin kişi bazında kapasite bloğunu yazdır"""
+        sprint_name = snapshot.name
+        if snapshot.calendar:
+            print(f"\n📋 {sprint_name} ({snapshot.calendar.working_days} iş günü):")
+        else:
+            print(f"\n📋 {sprint_name}:")
+        print("-" * 90)
+        
+        try:
+            if snapshot.error:
+                raise snapshot.error
             
-            # Aktivite bazında grupla
-            activity_needs = {}
-            for result in all_results:
-                if result['Resource Need (h)'] > 0:  # Sadece ihtiyaç olanları göster
-                    activity = result['Activity']
-                    if activity not in activity_needs:
-                        activity_needs[activity] = []
-                    activity_needs[activity].append({
-                        'Sprint': result['Sprint'],
-                        'Need': result['Resource Need (h)']
-                    })
+            print(f"{'Kişi':<25}{'Aktivite':<20}{'Kapasite (h)':>15}{'Planlanan (h)':>15}{'Yüklenme (%)':>15}")
+            print("-" * 90)
             
-            if activity_needs:
-                print(f"{'Activity':<20}{'Sprint':<15}{'İhtiyaç (saat)':>15}")
-                print("-" * 50)
+            rows = list(member_activity_rows(snapshot))
+            for index, (member, activity, capacity, planned, utilization) in enumerate(rows):
+                if index == 0 or rows[index - 1][0] != member:
+                    member_total_capacity = 0
+                    member_total_planned = 0
+                
+                # Renk kodu
+                if utilization > 100:
+                    utilization_str = f"{Colors.RED}{utilization:.1f}%{Colors.RESET}"
+                elif utilization > 90:
+                    utilization_str = f"{Colors.YELLOW}{utilization:.1f}%{Colors.RESET}"
+                else:
+                    utilization_str = f"{utilization:.1f}%"
+                
+                print(f"{member:<25}{activity:<20}{capacity:>15.1f}{planned:>15.1f}{utilization_str:>25}")
+                self.table.append((sprint_name, member, activity), (capacity, planned, utilization))
                 
-                # Toplam ihtiyaca göre aktiviteleri sırala
-                activity_totals = {}
-                for activity, items in activity_needs.items():
-                    activity_totals[activity] = sum(item['Need'] for item in items)
+                member_total_capacity += capacity
+                member_total_planned += planned
                 
-                for activity in sorted(activity_totals.keys(), key=lambda x: activity_totals[x], reverse=True):
-                    # Aktivite başına toplam ihtiyaç
-                    activity_total = activity_totals[activity]
-                    print(f"\n{Colors.BOLD}{activity:<20}{'TOPLAM':<15}{Colors.RED}{activity_total:.1f}{Colors.RESET}")
+                # Kişi toplamı (kişinin son satırından sonra)
+                if index == len(rows) - 1 or rows[index + 1][0] != member:
+                    total_utilization = (member_total_planned / member_total_capacity * 100) if member_total_capacity > 0 else 0
                     
-                    # Sprint bazında detaylar (ihtiyaca göre sıralı)
-                    for item in sorted(activity_needs[activity], key=lambda x: x['Need'], reverse=True):
-                        print(f"{'':>20}{item['Sprint']:<15}{Colors.RED}{item['Need']:.1f}{Colors.RESET}")
+                    if total_utilization > 100:
+                        total_util_str = f"{Colors.RED}{Colors.BOLD}{total_utilization:.1f}%{Colors.RESET}"
+                    elif total_utilization > 90:
+                        total_util_str = f"{Colors.YELLOW}{Colors.BOLD}{total_utilization:.1f}%{Colors.RESET}"
+                    else:
+                        total_util_str = f"{Colors.BOLD}{total_utilization:.1f}%{Colors.RESET}"
+                    
+                    print(f"{'':<25}{Colors.BOLD}{'TOPLAM':<20}{member_total_capacity:>15.1f}{member_total_planned:>15.1f}{total_util_str:>25}")
+                    print("-" * 90)
+        
+        except Exception as e:
+            print(f"❌ {sprint_name} kişi bazında analiz edilemedi: {e}")
+
+    def finish(self):
+        return self.table
+
+@profiler.timed('render:capacity')
+def generate_capacity_report(snapshots):
+    """Kişi bazında kapasite raporu oluştur (önceden çekilmiş snapshot'lardan)"""
+    report = CapacityReport()
+    report.print_header()
+    for snapshot in snapshots:
+        report.add(snapshot)
+    return report.finish()
+
+def stream_reports(snapshot_iter, report):
+    """Snapshot'lar geldikçe (sprint sırasıyla) raporun satırlarını hemen yazdır.
+
+    Başlık bir kez basılır; çekilen snapshot'ların listesini döndürür.
+    """
+    report.print_header()
+    snapshots = []
+    for snapshot in snapshot_iter:
+        # Paralel işçilerin ilerleme blokları satırların arasına girmesin
+        with _print_lock:
+            report.add(snapshot)
+        snapshots.append(snapshot)
+    return snapshots
+
+# Yeniden dağıtım (--rebalance): aşırı yüklü kişilerin işini min-cost flow ile dağıt
+REBALANCE_UNITS_PER_HOUR = 10    # Akış tamsayı kapasitelerle çözülür (0.1 saat çözünürlük)
+REBALANCE_REASSIGN_COST = 1      # Saat başına: aynı sprintte başka kişiye aktarma
+REBALANCE_SPRINT_MOVE_COST = 2   # Saat başına ve ertelenen sprint başına: aynı kişinin sonraki sprintine taşıma
+
+class MinCostFlow:
+    """Tamsayı kapasiteli, negatif olmayan maliyetli ağda primal-dual min-cost max-flow.
+
+    Her aşamada Dijkstra indirgenmiş maliyetlerle mesafeleri bulup düğüm
+    potansiyellerini günceller; ardından yalnızca indirgenmiş maliyeti sıfır
+    olan kenarlarda Dinic ile bloklayıcı akış gönderilir. Aşama sayısı yol
+    sayısıyla değil farklı en kısa yol maliyetleriyle sınırlıdır; maliyetleri
+    küçük tamsayılar olan dağıtım ağlarında birkaç düzine aşamada biter.
+    Kenar e'nin ters kenarı e ^ 1'dir.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.adjacency = [[] for _ in range(size)]
+        self.target = array('l')
+        self.capacity = array('q')
+        self.cost = array('q')
+
+    def add_edge(self, source, target, capacity, cost):
+        edge = len(self.target)
+        self.adjacency[source].append(edge)
+        self.adjacency[target].append(edge + 1)
+        self.target.extend((target, source))
+        self.capacity.extend((capacity, 0))
+        self.cost.extend((cost, -cost))
+        return edge
+
+    def flow(self, edge):
+        """İleri kenardan geçen akış (ters kenarın kalan kapasitesi)"""
+        return self.capacity[edge ^ 1]
+
+    def _distances(self, source, potential):
+        target, capacity, cost, adjacency = self.target, self.capacity, self.cost, self.adjacency
+        infinity = math.inf
+        distance = [infinity] * self.size
+        distance[source] = 0
+        heap = [(0, source)]
+        while heap:
+            current, node = heapq.heappop(heap)
+            if current > distance[node]:
+                continue
+            base = current + potential[node]
+            for edge in adjacency[node]:
+                if capacity[edge] > 0:
+                    neighbor = target[edge]
+                    candidate = base + cost[edge] - potential[neighbor]
+                    if candidate < distance[neighbor]:
+                        distance[neighbor] = candidate
+                        heapq.heappush(heap, (candidate, neighbor))
+        return distance
+
+    def _levels(self, source, sink, potential):
+        """Sıfır indirgenmiş maliyetli kenarlarda BFS seviyeleri; sink'e ulaşılamıyorsa None"""
+        target, capacity, cost, adjacency = self.target, self.capacity, self.cost, self.adjacency
+        level = [-1] * self.size
+        level[source] = 0
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            for edge in adjacency[node]:
+                neighbor = target[edge]
+                if capacity[edge] > 0 and level[neighbor] < 0 and cost[edge] + potential[node] == potential[neighbor]:
+                    level[neighbor] = level[node] + 1
+                    queue.append(neighbor)
+        return level if level[sink] >= 0 else None
+
+    def _augment(self, source, sink, level, pointer, potential):
+        """Seviye çizgesinde tek bir artırıcı yol bul ve doyur (özyinelemesiz DFS, kenar işaretçileriyle)"""
+        target, capacity, cost, adjacency = self.target, self.capacity, self.cost, self.adjacency
+        path = []
+        node = source
+        while node != sink:
+            edges = adjacency[node]
+            while pointer[node] < len(edges):
+                edge = edges[pointer[node]]
+                neighbor = target[edge]
+                if (capacity[edge] > 0 and level[neighbor] == level[node] + 1
+                        and cost[edge] + potential[node] == potential[neighbor]):
+                    break
+                pointer[node] += 1
             else:
-                print(f"{Colors.GREEN}✅ Hiçbir aktivitede kaynak ihtiyacı yok!{Colors.RESET}")
+                # Çıkmaz: bir geri çekil, üst düğümün bu kenarını atla
+                if not path:
+                    return 0
+                node = target[path.pop() ^ 1]
+                pointer[node] += 1
+                continue
+            path.append(edge)
+            node = neighbor
+        pushed = min(capacity[edge] for edge in path)
+        for edge in path:
+            capacity[edge] -= pushed
+            capacity[edge ^ 1] += pushed
+        return pushed
+
+    def solve(self, source, sink):
+        """En büyük akışı en düşük maliyetle gönder; (akış, maliyet) döndür"""
+        potential = [0] * self.size
+        total_flow = total_cost = 0
+        while True:
+            distance = self._distances(source, potential)
+            if distance[sink] == math.inf:
+                return total_flow, total_cost
+            limit = distance[sink]
+            for node in range(self.size):
+                potential[node] += min(distance[node], limit)
+            while True:
+                level = self._levels(source, sink, potential)
+                if level is None:
+                    break
+                pointer = [0] * self.size
+                while True:
+                    pushed = self._augment(source, sink, level, pointer, potential)
+                    if not pushed:
+                        break
+                    total_flow += pushed
+                    total_cost += pushed * (potential[sink] - potential[source])
+
+    def paths(self, source, sink):
+        """Çözümdeki akışı kaynak-hedef yollarına ayrıştır: (düğüm listesi, akış) üretir"""
+        remaining = {}
+        outgoing = [[] for _ in range(self.size)]
+        for edge in range(0, len(self.target), 2):
+            flow = self.flow(edge)
+            if flow > 0:
+                remaining[edge] = flow
+                outgoing[self.target[edge + 1]].append(edge)
+        pointer = [0] * self.size
+        while True:
+            nodes, edges = [source], []
+            node = source
+            while node != sink:
+                candidates = outgoing[node]
+                while pointer[node] < len(candidates) and remaining[candidates[pointer[node]]] == 0:
+                    pointer[node] += 1
+                if pointer[node] == len(candidates):
+                    return
+                edge = candidates[pointer[node]]
+                edges.append(edge)
+                node = self.target[edge]
+                nodes.append(node)
+            pushed = min(remaining[edge] for edge in edges)
+            for edge in edges:
+                remaining[edge] -= pushed
+            yield nodes, pushed
+
+class RebalancePlan:
+    """Kişi x aktivite x sprint kapasite / planlanan iş matrislerinden yeniden dağıtım önerisi.
+
+    Her hücrenin fazlası (planlanan - kapasite) kaynaktan, boşluğu
+    (kapasite - planlanan) kişinin sprintteki toplam boşluğuyla sınırlanarak
+    hedefe bağlanır; böylece toplamda aşırı yüklü birine iş aktarılmaz.
+    Fazla iş iki yoldan akabilir:
+    aynı takım, sprint ve aktivitenin ortak düğümü üzerinden başka bir kişiye
+    (REBALANCE_REASSIGN_COST) ya da aynı kişinin aynı aktivitedeki sonraki
+    sprintlerine (sprint başına REBALANCE_SPRINT_MOVE_COST). Kenar sayısı
+    hücre sayısıyla doğrusal kalır; en büyük akış toplam aşırı yüklemeyi en
+    aza indirir, en düşük maliyet de bunu en az taşımayla yapar.
+    """
+
+    def __init__(self):
+        self.sprints = []
+        self.sprint_index = {}
+        self.cells = {}  # (takım, sprint sırası, kişi, aktivite) -> [kapasite, planlanan]
+
+    def add_snapshots(self, snapshots, team=''):
+        """Başarıyla çekilmiş snapshot'ların kişi x aktivite satırlarını ekle"""
+        for snapshot in snapshots:
+            if snapshot.error:
+                continue
+            if snapshot.name not in self.sprint_index:
+                self.sprint_index[snapshot.name] = len(self.sprints)
+                self.sprints.append(snapshot.name)
+            sprint = self.sprint_index[snapshot.name]
+            for member, activity, capacity, planned, _ in member_activity_rows(snapshot):
+                cell = self.cells.setdefault((team, sprint, member, activity), [0.0, 0.0])
+                cell[0] += capacity
+                cell[1] += planned
+
+    @staticmethod
+    def units(hours):
+        return int(round(hours * REBALANCE_UNITS_PER_HOUR))
+
+    def over_allocation(self):
+        """Kişi bazında toplam aşırı yükleme (saat)"""
+        return sum(max(0.0, planned - capacity) for capacity, planned in self.cells.values())
+
+    @profiler.timed('rebalance')
+    def solve(self):
+        """Min-cost flow'u kur ve çöz; {(kaynak hücre, hedef hücre): saat} taşımalarını döndür"""
+        keys = sorted(self.cells)
+        source, sink = 0, 1
+        node_of = {key: index + 2 for index, key in enumerate(keys)}
+        pools, members = {}, {}
+        member_units = defaultdict(int)  # (takım, sprint, kişi) -> kapasite - planlanan (tüm aktiviteler)
+        for key in keys:
+            team, sprint, member, activity = key
+            capacity, planned = self.cells[key]
+            pools.setdefault((team, sprint, activity), len(keys) + 2 + len(pools))
+            member_units[(team, sprint, member)] += self.units(capacity) - self.units(planned)
+        for member_key in member_units:
+            members[member_key] = len(keys) + 2 + len(pools) + len(members)
+        network = MinCostFlow(len(keys) + 2 + len(pools) + len(members))
+        # Zincir kenarlarının kapasitesi: toplam fazla (akış bundan büyük olamaz)
+        total_surplus = sum(max(0, self.units(planned) - self.units(capacity)) for capacity, planned in self.cells.values())
+
+        chain_previous = {}
+        for key in keys:
+            team, sprint, member, activity = key
+            capacity, planned = self.cells[key]
+            node = node_of[key]
+            surplus = self.units(planned) - self.units(capacity)
+            pool = pools[(team, sprint, activity)]
+            if surplus > 0:
+                network.add_edge(source, node, surplus, 0)
+                network.add_edge(node, pool, surplus, 0)
+            elif surplus < 0 and member_units[(team, sprint, member)] > 0:
+                # Alıcı hem aktivitede hem toplamda boş kapasiteli olmalı (kişi düğümü toplamı sınırlar)
+                network.add_edge(node, members[(team, sprint, member)], -surplus, 0)
+                network.add_edge(pool, node, -surplus, REBALANCE_REASSIGN_COST)
+            # Aynı kişi ve aktivitenin sprint zinciri (anahtarlar sprint sırasıyla gelir; yalnızca ileri)
+            previous = chain_previous.get((team, member, activity))
+            if previous is not None:
+                gap = sprint - previous[1]
+                network.add_edge(node_of[previous], node, total_surplus, REBALANCE_SPRINT_MOVE_COST * gap)
+            chain_previous[(team, member, activity)] = key
+        for member_key, node in members.items():
+            if member_units[member_key] > 0:
+                network.add_edge(node, sink, member_units[member_key], 0)
+
+        network.solve(source, sink)
+        moves = defaultdict(float)
+        for nodes, flow in network.paths(source, sink):
+            # Yol: kaynak, fazla hücre, (havuz / zincir), boş hücre, kişi, hedef
+            moves[(keys[nodes[1] - 2], keys[nodes[-3] - 2])] += flow / REBALANCE_UNITS_PER_HOUR
+        return dict(moves)
+
+def member_utilization_cell(planned, capacity, width):
+    """Yüklenme yüzdesi hücresi (kapasite raporundaki renk eşikleri; hizalama renkten önce)"""
+    if capacity <= 0:
+        if planned <= 0:
+            return f"{'-':>{width}}"
+        return f"{Colors.RED}{'∞':>{width}}{Colors.RESET}"
+    utilization = planned / capacity * 100
+    text = f"{utilization:.1f}%"
+    if utilization > 100:
+        return f"{Colors.RED}{text:>{width}}{Colors.RESET}"
+    if utilization > 90:
+        return f"{Colors.YELLOW}{text:>{width}}{Colors.RESET}"
+    return f"{text:>{width}}"
+
+@profiler.timed('render:rebalance')
+def generate_rebalance_report(team_results):
+    """Aşırı yüklü kişilerin işi için aktarma / erteleme önerileri; (taşımalar, yüklenme) tablolarını döndür.
+
+    `team_results` (takım etiketi, snapshot'lar) çiftleridir; tek takımlı
+    çalıştırmada etiket boştur. Aktarmalar takım içinde kalır.
+    """
+    plan = RebalancePlan()
+    for team, snapshots in team_results:
+        plan.add_snapshots(snapshots, team)
+    moves_table = ResultTable('rebalance_moves', ['team', 'activity', 'from_member', 'from_sprint', 'to_member', 'to_sprint'],
+                              ['hours'])
+    utilization_table = ResultTable('rebalance_utilization', ['team', 'sprint', 'member'],
+                                    ['capacity_hours', 'planned_hours', 'utilization_pct',
+                                     'rebalanced_planned_hours', 'rebalanced_utilization_pct'])
+
+    print(f"\n⚖️ Yeniden Dağıtım Önerisi (aşırı yüklü kişilerin işi):")
+    print("=" * 110)
+    before = plan.over_allocation()
+    if before <= 0:
+        print(f"{Colors.GREEN}✅ Aşırı yüklü kişi yok - dağıtılacak iş bulunmuyor{Colors.RESET}")
+        return [moves_table, utilization_table]
+
+    moves = plan.solve()
+    if not moves:
+        print(f"{Colors.YELLOW}ℹ️ Aşırı yükleme {before:.1f}h, ancak aynı aktivitede (ve toplamda) boş kapasitesi olan kişi "
+              f"ya da sonraki sprint yok; öneri üretilemedi.{Colors.RESET}")
+        return [moves_table, utilization_table]
+    planned_after = {key: planned for key, (_, planned) in plan.cells.items()}
+    for (source, target), hours in moves.items():
+        planned_after[source] -= hours
+        planned_after[target] += hours
+    after = sum(max(0.0, planned_after[key] - capacity) for key, (capacity, _) in plan.cells.items())
+
+    # Takım sütunu yalnızca çok takımlı çalıştırmada gösterilir
+    show_team = any(team for team, _ in team_results)
+    team_header = f"{'Takım':<25}" if show_team else ""
+    print(f"{team_header}{'Aktivite':<20}{'Kimden':<25}{'Kime':<25}{'Sprint':<27}{'Saat':>8}")
+    print("-" * 110)
+    for (source, target), hours in sorted(moves.items(), key=lambda move: (move[0][0][:2], move[0][0][3], -move[1])):
+        team, from_sprint, from_member, activity = source
+        from_sprint, to_sprint, to_member = plan.sprints[from_sprint], plan.sprints[target[1]], target[2]
+        sprint_text = from_sprint if to_sprint == from_sprint else f"{from_sprint} → {to_sprint}"
+        team_cell = f"{team[:23]:<25}" if show_team else ""
+        print(f"{team_cell}{activity[:18]:<20}{from_member[:23]:<25}{to_member[:23]:<25}{sprint_text[:25]:<27}{hours:>8.1f}")
+        moves_table.append((team, activity, from_member, from_sprint, to_member, to_sprint), (hours,))
+
+    # Kişi toplamları (tüm aktiviteler): önce / sonra
+    member_totals = defaultdict(lambda: [0.0, 0.0, 0.0])  # (takım, sprint, kişi) -> [kapasite, planlanan, sonra]
+    for key, (capacity, planned) in plan.cells.items():
+        totals = member_totals[key[:3]]
+        totals[0] += capacity
+        totals[1] += planned
+        totals[2] += planned_after[key]
+
+    print(f"\n👥 Yüklenme Değişimi (önerilerden etkilenen kişiler):")
+    print(f"{'Sprint':<15}{'Kişi':<35}{'Kapasite (h)':>14}{'Planlanan (h)':>15}{'Yüklenme':>11}{'Sonra (h)':>12}{'Yüklenme':>11}")
+    print("-" * 113)
+    for (team, sprint, member), (capacity, planned, rebalanced) in sorted(member_totals.items()):
+        utilization = planned / capacity * 100 if capacity > 0 else 0
+        rebalanced_utilization = rebalanced / capacity * 100 if capacity > 0 else 0
+        utilization_table.append((team, plan.sprints[sprint], member),
+                                 (capacity, planned, utilization, rebalanced, rebalanced_utilization))
+        if abs(rebalanced - planned) < 0.05:
+            continue
+        label = f"{team}/{member}" if show_team else member
+        print(f"{plan.sprints[sprint][:13]:<15}{label[:33]:<35}{capacity:>14.1f}{planned:>15.1f}"
+              f"{member_utilization_cell(planned, capacity, 11)}{rebalanced:>12.1f}{member_utilization_cell(rebalanced, capacity, 11)}")
+
+    after_color = Colors.RED if after >= 0.05 else Colors.GREEN
+    print(f"\n📊 Toplam aşırı yükleme: {Colors.RED}{before:.1f}h{Colors.RESET} → {after_color}{after:.1f}h{Colors.RESET} "
+          f"({sum(moves.values()):.1f}h taşındı, {len(moves)} öneri)")
+    if after >= 0.05:
+        print(f"{Colors.YELLOW}ℹ️ Kalan aşırı yükleme için aynı aktivitede (ve toplamda) boş kapasitesi olan kişi ya da sonraki sprint yok.{Colors.RESET}")
+    return [moves_table, utilization_table]
+
+# Trend analizi
+class SprintActivityMatrix:
+    """Sprint x aktivite sayısal matrisleri (satır öncelikli, array('d') ile sütunsal saklanır).
+
+    Her ölçü (planlanan, kapasite, tamamlanan) tek bir düz dizi olarak tutulur;
+    satır ve sütun toplamları, oranlar ve kayan ortalamalar bu diziler
+    üzerinde toplu olarak hesaplanır, satır başına sözlük oluşturulmaz.
+    """
+
+    def __init__(self, sprints, activities):
+        self.sprints = list(sprints)
+        self.activities = list(activities)
+        self.activity_index = {activity: i for i, activity in enumerate(self.activities)}
+        size = len(self.sprints) * len(self.activities)
+        self.planned = array('d', bytes(8 * size))
+        self.capacity = array('d', bytes(8 * size))
+        self.completed = array('d', bytes(8 * size))
+
+    @classmethod
+    @profiler.timed('aggregate')
+    def from_snapshots(cls, snapshots):
+        """Başarıyla çekilmiş snapshot'lardan matrisi oluştur (yeniden istek atmadan)"""
+        rows = []
+        activities = set()
+        for snapshot in snapshots:
+            if snapshot.error:
+                continue
+            capacity = snapshot.capacity_by_activity()
+            planned = snapshot.work_by_activity()
+            completed = snapshot.completed_by_activity()
+            activities.update(capacity.keys())
+            activities.update(planned.keys())
+            rows.append((snapshot.name, capacity, planned, completed))
+
+        matrix = cls([row[0] for row in rows], sorted(activities))
+        width = len(matrix.activities)
+        for row_index, (_, capacity, planned, completed) in enumerate(rows):
+            offset = row_index * width
+            for activity, value in capacity.items():
+                matrix.capacity[offset + matrix.activity_index[activity]] = value
+            for activity, value in planned.items():
+                matrix.planned[offset + matrix.activity_index[activity]] = value
+            for activity, value in completed.items():
+                matrix.completed[offset + matrix.activity_index[activity]] = value
+        return matrix
+
+    def row_totals(self, values):
+        width = len(self.activities)
+        return array('d', (sum(values[i:i + width]) for i in range(0, len(values), width or 1)))
+
+    def column(self, values, activity_index):
+        return values[activity_index::len(self.activities)]
+
+    @staticmethod
+    def need(planned, capacity):
+        return array('d', (max(0.0, p - c) for p, c in zip(planned, capacity)))
+
+    @staticmethod
+    def utilization(planned, capacity):
+        return array('d', ((p / c * 100) if c > 0 else 0.0 for p, c in zip(planned, capacity)))
+
+    @staticmethod
+    def rolling_mean(values, window):
+        """Kümülatif toplam ile O(n) kayan ortalama (ilk satırlarda mevcut kadar eleman)"""
+        result = array('d', bytes(8 * len(values)))
+        running = 0.0
+        for i, value in enumerate(values):
+            running += value
+            if i >= window:
+                running -= values[i - window]
+            result[i] = running / min(i + 1, window)
+        return result
+
+    @staticmethod
+    def slope(values):
+        """En küçük kareler doğrusunun eğimi (sprint başına değişim)"""
+        n = len(values)
+        if n < 2:
+            return 0.0
+        mean_x = (n - 1) / 2
+        mean_y = sum(values) / n
+        numerator = sum((i - mean_x) * (value - mean_y) for i, value in enumerate(values))
+        denominator = sum((i - mean_x) ** 2 for i in range(n))
+        return numerator / denominator
+
+@profiler.timed('render:trend')
+def generate_trend_report(snapshots, window=3):
+    """Sprint aralığı boyunca planlanan iş, kapasite, kullanım ve velocity trendini raporla"""
+    matrix = SprintActivityMatrix.from_snapshots(snapshots)
+    window = max(1, window)
+
+    sprint_table = ResultTable('trend_sprint', ['sprint'], [
+        'planned_hours', 'capacity_hours', 'utilization_pct', 'resource_need_hours', 'velocity_hours',
+        'planned_rolling_avg', 'utilization_rolling_avg', 'velocity_rolling_avg'])
+    activity_table = ResultTable('trend_activity', ['activity'], [
+        'mean_planned_hours', 'mean_capacity_hours', 'utilization_pct', 'resource_need_hours',
+        'planned_slope_per_sprint'])
+
+    print(f"\n📈 Trend Analizi ({len(matrix.sprints)} sprint, {window} sprintlik kayan ortalama):")
+    if not matrix.sprints:
+        print(f"{Colors.YELLOW}Trend için analiz edilebilen sprint yok.{Colors.RESET}")
+        return [sprint_table, activity_table]
+
+    planned = matrix.row_totals(matrix.planned)
+    capacity = matrix.row_totals(matrix.capacity)
+    completed = matrix.row_totals(matrix.completed)
+    need = matrix.row_totals(matrix.need(matrix.planned, matrix.capacity))
+    utilization = matrix.utilization(planned, capacity)
+    planned_avg = matrix.rolling_mean(planned, window)
+    utilization_avg = matrix.rolling_mean(utilization, window)
+    velocity_avg = matrix.rolling_mean(completed, window)
+
+    print("=" * 125)
+    print(f"{'Sprint':<15}{'Planlanan (h)':>14}{'Kapasite (h)':>14}{'Kullanım (%)':>14}{'İhtiyaç (h)':>13}"
+          f"{'Velocity (h)':>14}{'Planlanan Ort.':>15}{'Kullanım Ort.':>15}{'Velocity Ort.':>15}")
+    print("-" * 125)
+    for i, sprint in enumerate(matrix.sprints):
+        need_str = f"{need[i]:>13.1f}"
+        if need[i] > 0:
+            need_str = f"{Colors.RED}{need_str}{Colors.RESET}"
+        print(f"{sprint:<15}{planned[i]:>14.1f}{capacity[i]:>14.1f}{utilization[i]:>14.1f}{need_str}"
+              f"{completed[i]:>14.1f}{planned_avg[i]:>15.1f}{utilization_avg[i]:>15.1f}{velocity_avg[i]:>15.1f}")
+        sprint_table.append((sprint,), (planned[i], capacity[i], utilization[i], need[i], completed[i],
+                                        planned_avg[i], utilization_avg[i], velocity_avg[i]))
+
+    print(f"\n📊 Aktivite Bazında Trend:")
+    print(f"{'Activity':<20}{'Ort. Planlanan':>16}{'Ort. Kapasite':>16}{'Ort. Kullanım (%)':>19}"
+          f"{'Toplam İhtiyaç':>16}{'Eğilim (h/sprint)':>19}")
+    print("-" * 106)
+    sprint_count = len(matrix.sprints)
+    for j, activity in enumerate(matrix.activities):
+        activity_planned = matrix.column(matrix.planned, j)
+        activity_capacity = matrix.column(matrix.capacity, j)
+        total_planned = sum(activity_planned)
+        total_capacity = sum(activity_capacity)
+        total_need = sum(matrix.need(activity_planned, activity_capacity))
+        mean_utilization = (total_planned / total_capacity * 100) if total_capacity > 0 else 0.0
+        slope = matrix.slope(activity_planned)
+
+        need_str = f"{total_need:>16.1f}"
+        if total_need > 0:
+            need_str = f"{Colors.RED}{need_str}{Colors.RESET}"
+        slope_str = f"{slope:>+19.1f}"
+        if slope > 0 and mean_utilization > 100:
+            # Zaten aşırı yüklü ve artmaya devam eden aktiviteler
+            slope_str = f"{Colors.RED}{slope_str}{Colors.RESET}"
+        print(f"{activity:<20}{total_planned / sprint_count:>16.1f}{total_capacity / sprint_count:>16.1f}"
+              f"{mean_utilization:>19.1f}{need_str}{slope_str}")
+        activity_table.append((activity,), (total_planned / sprint_count, total_capacity / sprint_count,
+                                            mean_utilization, total_need, slope))
+
+    return [sprint_table, activity_table]
+
+# Work item tipi bazında analiz
+WORK_ITEM_TYPE_FIELDS = [
+    "System.IterationPath",
+    "System.WorkItemType",
+    "System.State",
+    "Microsoft.VSTS.Common.Activity",
+    "Microsoft.VSTS.Scheduling.OriginalEstimate",
+    "Microsoft.VSTS.Scheduling.RemainingWork",
+]
+
+class WorkItemTypeAggregator:
+    """Sprint / tip / durum / aktivite kırılımında adet, planlanan ve kalan saatleri toplar.
+
+    Sayfalar geldikçe tek geçişte işlenir; work item'lar saklanmaz, bellekte
+    yalnızca kırılım başına üç sayı tutulur.
+    """
+
+    def __init__(self, sprint_by_path):
+        self.sprint_by_path = sprint_by_path
+        # (sprint, tip, durum, aktivite) -> [adet, planlanan, kalan]
+        self.totals = defaultdict(lambda: [0, 0.0, 0.0])
+
+    @profiler.timed('aggregate')
+    def add_page(self, page):
+        for item in page:
+            fields = item.get("fields", {})
+            sprint = self.sprint_by_path.get(fields.get("System.IterationPath"))
+            if sprint is None:
+                continue
+            key = (
+                sprint,
+                fields.get("System.WorkItemType", "Unknown"),
+                fields.get("System.State", "Unknown"),
+                fields.get("Microsoft.VSTS.Common.Activity") or "-",
+            )
+            totals = self.totals[key]
+            totals[0] += 1
+            totals[1] += fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate", 0) or 0
+            totals[2] += fields.get("Microsoft.VSTS.Scheduling.RemainingWork", 0) or 0
+
+    @profiler.timed('aggregate')
+    def add_analytics_rows(self, rows):
+        """Analytics'te (iterasyon, tip, durum, aktivite) bazında gruplanmış satırları ekle"""
+        for row in rows:
+            sprint = self.sprint_by_path.get((row.get("Iteration") or {}).get("IterationPath"))
+            if sprint is None:
+                continue
+            key = (
+                row.get("WorkItemType") or "Unknown",
+                row.get("State") or "Unknown",
+                row.get("Activity") or "-",
+            )
+            totals = self.totals[(sprint,) + key]
+            totals[0] += row.get("Count") or 0
+            totals[1] += row.get("OriginalEstimate") or 0
+            totals[2] += row.get("RemainingWork") or 0
+
+    def by_sprint(self):
+        """Sprint -> sıralı [(tip, durum, aktivite, adet, planlanan, kalan)]"""
+        result = defaultdict(list)
+        for (sprint, work_item_type, state, activity), (count, planned, remaining) in sorted(self.totals.items()):
+            result[sprint].append((work_item_type, state, activity, count, planned, remaining))
+        return result
+
+    def by_type(self):
+        """Tip -> [adet, planlanan, kalan] (tüm aralık)"""
+        result = defaultdict(lambda: [0, 0.0, 0.0])
+        for (_, work_item_type, _, _), (count, planned, remaining) in self.totals.items():
+            totals = result[work_item_type]
+            totals[0] += count
+            totals[1] += planned
+            totals[2] += remaining
+        return result
+
+@profiler.timed('render:workitem-types')
+def generate_workitem_types_report(sprint_names, work_item_types=None):
+    """Sprint bazında work item tipi / durum / aktivite kırılımında planlanan ve kalan saatleri raporla"""
+    sprint_by_path = {}
+    for sprint_name in sprint_names:
+        try:
+            sprint_by_path[scope().iteration_index.get(sprint_name)['path']] = sprint_name
+        except Exception as e:
+            print(f"❌ {sprint_name} tip bazında analiz edilemedi: {e}")
+
+    aggregator = WorkItemTypeAggregator(sprint_by_path)
+    if sprint_by_path and settings['engine'] == 'analytics':
+        print(f"\n📈 {len(sprint_by_path)} sprintin work item tipleri Analytics'ten gruplanmış olarak alınıyor...")
+        for row_filter in analytics_filters(list(sprint_by_path), work_item_types):
+            aggregator.add_analytics_rows(query_analytics(
+                f"{row_filter}/groupby((Iteration/IterationPath, WorkItemType, State, Activity), "
+                "aggregate(OriginalEstimate with sum as OriginalEstimate, "
+                "RemainingWork with sum as RemainingWork, $count as Count))"))
+    elif sprint_by_path:
+        print(f"\n🔄 {len(sprint_by_path)} sprintin tüm work item tipleri alınıyor...")
+        for page in iter_iteration_work_item_pages(list(sprint_by_path), WORK_ITEM_TYPE_FIELDS, work_item_types):
+            aggregator.add_page(page)
+
+    table = ResultTable('workitem_types', ['sprint', 'work_item_type', 'state', 'activity'],
+                        ['count', 'planned_hours', 'remaining_hours'], integer_columns=['count'])
+
+    print(f"\n🧩 Work Item Tipi Bazında Analiz:")
+    print("=" * 100)
+    rows_by_sprint = aggregator.by_sprint()
+    for sprint_name in sprint_names:
+        if sprint_name not in sprint_by_path.values():
+            continue
+        print(f"\n📋 {sprint_name}:")
+        print(f"{'Tip':<25}{'Durum':<15}{'Aktivite':<20}{'Adet':>8}{'Planlanan (h)':>16}{'Kalan (h)':>16}")
+        print("-" * 100)
+        rows = rows_by_sprint.get(sprint_name, [])
+        previous_type = None
+        for work_item_type, state, activity, count, planned, remaining in rows:
+            type_label = work_item_type if work_item_type != previous_type else ""
+            previous_type = work_item_type
+            print(f"{type_label:<25}{state:<15}{activity:<20}{count:>8}{planned:>16.1f}{remaining:>16.1f}")
+            table.append((sprint_name, work_item_type, state, activity), (count, planned, remaining))
+        total_count = sum(row[3] for row in rows)
+        total_planned = sum(row[4] for row in rows)
+        total_remaining = sum(row[5] for row in rows)
+        print(f"{Colors.BOLD}{'TOPLAM':<60}{total_count:>8}{total_planned:>16.1f}{total_remaining:>16.1f}{Colors.RESET}")
+
+    type_totals = aggregator.by_type()
+    if type_totals:
+        print(f"\n📊 Tip Bazında Toplam ({len(sprint_by_path)} sprint):")
+        print(f"{'Tip':<25}{'Adet':>8}{'Planlanan (h)':>16}{'Kalan (h)':>16}")
+        print("-" * 65)
+        for work_item_type, (count, planned, remaining) in sorted(type_totals.items(), key=lambda x: x[1][1], reverse=True):
+            print(f"{work_item_type:<25}{count:>8}{planned:>16.1f}{remaining:>16.1f}")
+
+    return table
+
+# Hiyerarşi raporu: Task saatleri üst öğelere (PBI, Feature, Epic) toplanır
+HIERARCHY_LINK_TYPE = 'System.LinkTypes.Hierarchy-Forward'
+# Backlog hiyerarşisi (Task > PBI > Feature > Epic ...) bundan derin olmaz; döngülere karşı sınır
+HIERARCHY_MAX_DEPTH = 8
+# [Target].[System.Id] IN (...) listeleri 32K karakter sınırına göre bölünür
+WIQL_IDS_PER_QUERY = 2000
+HIERARCHY_FIELDS = ["System.WorkItemType", "System.Title"]
+
+@profiler.timed('links')
+def query_hierarchy_links(target_condition):
+    """Koşula uyan work item'ların (hedef) üst öğe bağlantılarını tek WorkItemLinks sorgusuyla al.
+
+    (üst id, alt id) çiftlerini döndürür; yanıt akış halinde çözülür.
+    """
+    url = f"{base_url}/{scope().project_encoded}/_apis/wit/wiql?api-version=7.0"
+    wiql = {
+        "query": f"""
+            SELECT [System.Id]
+            FROM WorkItemLinks
+            WHERE [System.Links.LinkType] = {wiql_quote(HIERARCHY_LINK_TYPE)}
+              AND ({target_condition})
+            MODE (MustContain)
+            """
+    }
+    if settings['debug']:
+        print(f"Debug: WorkItemLinks Query: {wiql['query']}")
+    res = client.post(url, json=wiql, idempotent=True, stream=True)
+    if res.status_code != 200:
+        if settings['debug']:
+            print(f"Debug: WorkItemLinks Response text: {res.text}")
+    res.raise_for_status()
+    links = []
+    for relation in client.iter_json_array(res, "workItemRelations"):
+        # Kök satırlarında rel ve source boştur; yalnızca bağlantılar alınır
+        if relation.get("rel") == HIERARCHY_LINK_TYPE and relation.get("source") and relation.get("target"):
+            links.append((relation["source"]["id"], relation["target"]["id"]))
+    return links
+
+class HierarchyIndex:
+    """Work item üst/alt ilişkilerinin sıkışık dizi indeksi ve alttan üste toplama.
+
+    Düğümler 0..n-1 indeksleriyle tutulur: id'ler array('q'), üst öğe
+    indeksi array('l') (-1: kök), her düğümün sprint sütunlarındaki
+    saatleri düz bir array('d') (n x sprint) içindedir. Alt öğeler
+    (CSR biçiminde başlangıç/liste dizileri) toplama sonrası bir kez kurulur.
+    Toplama, düğümler derinliğe göre sıralandıktan sonra tek geçiştir;
+    on binlerce düğümde de Python nesne ağacı kurulmaz.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.width = len(self.columns)
+        self.ids = array('q')
+        self.parent = array('l')
+        self.hours = array('d')
+        self.node = {}
+        # Yalnızca üst öğeler için: id -> (tip, başlık)
+        self.details = {}
+        self.child_start = None
+        self.child_list = None
+
+    def add(self, work_item_id):
+        """Düğümün indeksini döndür; yoksa ekle"""
+        index = self.node.get(work_item_id)
+        if index is None:
+            index = self.node[work_item_id] = len(self.ids)
+            self.ids.append(work_item_id)
+            self.parent.append(-1)
+            self.hours.extend(array('d', bytes(8 * self.width)))
+        return index
+
+    def add_hours(self, work_item_id, column, hours):
+        self.hours[self.add(work_item_id) * self.width + column] += hours
+
+    def link(self, parent_id, child_id):
+        self.parent[self.add(child_id)] = self.add(parent_id)
+
+    def depths(self):
+        """Her düğümün kökten uzaklığı; döngü ya da aşırı derinlikte bağlantı koparılır"""
+        depth = array('l', [-1]) * len(self.ids)
+        for start in range(len(self.ids)):
+            chain = []
+            node = start
+            while node >= 0 and depth[node] < 0:
+                if len(chain) > HIERARCHY_MAX_DEPTH or node in chain:
+                    self.parent[chain[-1]] = -1
+                    node = -1
+                    break
+                chain.append(node)
+                node = self.parent[node]
+            base = depth[node] if node >= 0 else -1
+            for offset, member in enumerate(reversed(chain), 1):
+                depth[member] = base + offset
+        return depth
+
+    @profiler.timed('aggregate')
+    def rollup(self):
+        """Saatleri alttan üste tek geçişte topla ve alt öğe indeksini kur"""
+        depth = self.depths()
+        width = self.width
+        hours = self.hours
+        for node in sorted(range(len(self.ids)), key=depth.__getitem__, reverse=True):
+            parent = self.parent[node]
+            if parent >= 0:
+                source, target = node * width, parent * width
+                for column in range(width):
+                    hours[target + column] += hours[source + column]
+
+        # CSR: child_list[child_start[i]:child_start[i+1]] düğüm i'nin alt öğeleri
+        counts = array('l', [0]) * (len(self.ids) + 1)
+        for parent in self.parent:
+            if parent >= 0:
+                counts[parent + 1] += 1
+        for index in range(1, len(counts)):
+            counts[index] += counts[index - 1]
+        self.child_start = counts
+        self.child_list = array('l', [0]) * counts[-1]
+        filled = array('l', counts[:-1])
+        for node, parent in enumerate(self.parent):
+            if parent >= 0:
+                self.child_list[filled[parent]] = node
+                filled[parent] += 1
+
+    def children(self, node):
+        return self.child_list[self.child_start[node]:self.child_start[node + 1]]
+
+    def roots(self):
+        return [node for node, parent in enumerate(self.parent) if parent < 0]
+
+    def value(self, node, column):
+        return self.hours[node * self.width + column]
+
+    def is_task(self, node):
+        return self.ids[node] not in self.details
+
+def build_hierarchy(snapshots, sprint_names):
+    """Aralıktaki Task saatlerini ve üst öğe zincirlerini HierarchyIndex'e yükle.
+
+    Task saatleri sprint snapshot'larından alınır; yalnızca work item'ları
+    Analytics'ten gruplanmış gelen sprintler için Task'lar yeniden okunur.
+    """
+    index = HierarchyIndex(sprint_names)
+
+    # 1) Task saatleri: snapshot'lardan; id'siz (Analytics) sprintler için yerel depodan ya da tek WIQL + toplu çekme ile
+    column_by_path = {}
+    iterations = []
+    for snapshot in snapshots:
+        if snapshot.error or snapshot.name not in sprint_names:
+            continue
+        column = sprint_names.index(snapshot.name)
+        tasks = snapshot.work_items.estimates_by_id()
+        if tasks is None:
+            column_by_path[snapshot.iteration['path']] = column
+            iterations.append(snapshot.iteration)
+            continue
+        for work_item_id, hours in tasks:
+            index.add_hours(work_item_id, column, hours)
+    if iterations:
+        paths = list(column_by_path)
+        store = scope().work_item_store
+        if store:
+            store.sync_iterations(iterations)
+            tasks = store.iter_items(paths)
+        else:
+            tasks = ((item["id"], item["fields"]) for page in iter_iteration_work_item_pages(
+                paths, ["Microsoft.VSTS.Scheduling.OriginalEstimate"]) for item in page)
+        for work_item_id, fields in tasks:
+            column = column_by_path.get(fields.get("System.IterationPath"))
+            if column is not None:
+                index.add_hours(work_item_id, column, fields.get("Microsoft.VSTS.Scheduling.OriginalEstimate") or 0)
+
+    # 2) Task -> üst öğe bağlantıları: id listeleri parçalanarak (WIQL 20.000 sonuç sınırının altında kalır)
+    task_ids = sorted(index.node)
+    for i in range(0, len(task_ids), WIQL_IDS_PER_QUERY):
+        chunk = task_ids[i:i+WIQL_IDS_PER_QUERY]
+        for parent_id, child_id in query_hierarchy_links(
+                f"[Target].[System.Id] IN ({', '.join(str(work_item_id) for work_item_id in chunk)})"):
+            index.link(parent_id, child_id)
+
+    # 3) Üst öğelerin üst öğeleri: hiyerarşi seviyesi başına bir sorgu (id listeleri parçalanarak)
+    level = sorted({index.ids[parent] for parent in index.parent if parent >= 0})
+    seen = set(level)
+    for _ in range(HIERARCHY_MAX_DEPTH):
+        if not level:
+            break
+        next_level = set()
+        for i in range(0, len(level), WIQL_IDS_PER_QUERY):
+            chunk = level[i:i+WIQL_IDS_PER_QUERY]
+            for parent_id, child_id in query_hierarchy_links(
+                    f"[Target].[System.Id] IN ({', '.join(str(work_item_id) for work_item_id in chunk)})"):
+                index.link(parent_id, child_id)
+                if parent_id not in seen:
+                    next_level.add(parent_id)
+        seen.update(next_level)
+        level = sorted(next_level)
+
+    # 4) Üst öğelerin tip ve başlıkları
+    for page in iter_work_item_pages(sorted(seen), HIERARCHY_FIELDS):
+        for item in page:
+            fields = item.get("fields", {})
+            index.details[item["id"]] = (fields.get("System.WorkItemType", "Unknown"), fields.get("System.Title", ""))
+    for work_item_id in seen:
+        index.details.setdefault(work_item_id, ("Unknown", ""))
+
+    index.rollup()
+    return index
+
+@profiler.timed('render:hierarchy')
+def generate_hierarchy_report(snapshots, sprint_names):
+    """Task saatlerini üst öğelere (PBI, Feature, Epic) toplayıp sprint kapasitesine oranla"""
+    capacity_by_sprint = {}
+    for snapshot in snapshots:
+        if not snapshot.error:
+            capacity_by_sprint[snapshot.name] = sum(snapshot.capacity_by_activity().values())
+    sprint_names = [name for name in sprint_names if name in capacity_by_sprint]
+
+    table = ResultTable('hierarchy', ['sprint', 'work_item_type', 'title'],
+                        ['work_item_id', 'parent_id', 'depth', 'planned_hours', 'capacity_share_pct'],
+                        integer_columns=['work_item_id', 'parent_id', 'depth'])
+    if not sprint_names:
+        return table
+
+    print(f"\n🔄 {len(sprint_names)} sprintin Task hiyerarşisi alınıyor...")
+    index = build_hierarchy(snapshots, sprint_names)
+    roots = sorted(index.roots(), key=lambda node: index.ids[node])
+
+    print(f"\n🌳 Hiyerarşi Bazında Planlanan İş (Epic > Feature > PBI):")
+    print("=" * 100)
+    for column, sprint_name in enumerate(sprint_names):
+        capacity = capacity_by_sprint[sprint_name]
+        planned = sum(index.value(node, column) for node in roots)
+        status = f"{Colors.RED}+{planned - capacity:.1f}h aşım{Colors.RESET}" if planned > capacity else f"{capacity - planned:.1f}h boş"
+        print(f"\n📋 {sprint_name}: planlanan {planned:.1f}h / kapasite {capacity:.1f}h ({status})")
+        print(f"{'Öğe':<60}{'Tip':<22}{'Planlanan (h)':>14}{'Kapasite %':>12}")
+        print("-" * 108)
+
+        def show(node, depth, parent_id):
+            hours = index.value(node, column)
+            if hours <= 0 or index.is_task(node):
+                return
+            work_item_type, title = index.details[index.ids[node]]
+            share = hours / capacity * 100 if capacity > 0 else 0
+            share_str = f"{f'{share:.1f}%':>12}"
+            if share > 100:
+                share_str = f"{Colors.RED}{share_str}{Colors.RESET}"
+            label = f"{'  ' * depth}#{index.ids[node]} {title}"
+            print(f"{label[:58]:<60}{work_item_type[:20]:<22}{hours:>14.1f}{share_str}")
+            table.append((sprint_name, work_item_type, title), (index.ids[node], parent_id, depth, hours, share))
+            for child in sorted(index.children(node), key=lambda child: index.value(child, column), reverse=True):
+                show(child, depth + 1, index.ids[node])
+
+        for root in sorted(roots, key=lambda node: index.value(node, column), reverse=True):
+            show(root, 0, 0)
+        orphan_hours = sum(index.value(node, column) for node in roots if index.is_task(node))
+        if orphan_hours > 0:
+            share = orphan_hours / capacity * 100 if capacity > 0 else 0
+            label = "(Üst öğesi olmayan Task'lar)"
+            print(f"{label:<60}{'Task':<22}{orphan_hours:>14.1f}{share:>11.1f}%")
+            table.append((sprint_name, 'Task', '(no parent)'), (0, 0, 0, orphan_hours, share))
+
+    return table
+
+@profiler.timed('render:burndown')
+def generate_burndown_report(sprint_names):
+    """Sprint başına günlük kalan / tamamlanan iş (aktivite ve kişi kırılımlı) ve ideal çizgi"""
+    table = ResultTable('burndown', ['sprint', 'day', 'activity', 'member'],
+                        ['remaining_hours', 'completed_hours'])
+    store = project_burndown_store(scope().project)
+    print(f"\n🔄 Work item revizyonları alınıyor...")
+    count = store.sync()
+    print(f"✅ {count} yeni revizyon işlendi")
+
+    print(f"\n📉 Sprint Burndown (kalan / tamamlanan iş, saat):")
+    print("=" * 80)
+    for sprint_name in sprint_names:
+        iteration = scope().iteration_index.get(sprint_name)
+        if not iteration.get('startDate') or not iteration.get('finishDate'):
+            print(f"\n⚠️ {sprint_name}: iterasyon tarihleri tanımlı değil, atlanıyor")
+            continue
+        start, finish = parse_day(iteration['startDate']), parse_day(iteration['finishDate'])
+        calendar = scope().calendar
+        days = [day for day in (start + timedelta(days=offset) for offset in range((finish - start).days + 1))
+                if calendar.is_business_day(day)]
+        if not days:
+            continue
+        day_keys = [day.isoformat() for day in days]
+        series = store.series(iteration['path'], day_keys)
+        remaining = [sum(values[index][0] for values in series.values()) for index in range(len(days))]
+        completed = [sum(values[index][1] for values in series.values()) for index in range(len(days))]
+
+        print(f"\n📋 {sprint_name} ({start.isoformat()} - {finish.isoformat()}, {len(days)} iş günü):")
+        print(f"{'Gün':<12}{'Kalan (h)':>12}{'Tamamlanan (h)':>16}{'İdeal (h)':>12}")
+        print("-" * 80)
+        scale = max(remaining) if max(remaining) > 0 else 1
+        for index, day_key in enumerate(day_keys):
+            ideal = remaining[0] * (1 - index / (len(days) - 1)) if len(days) > 1 else 0.0
+            bar = "█" * round(remaining[index] / scale * 25)
+            color = Colors.RED if remaining[index] > ideal + 0.05 else ""
+            print(f"{day_key:<12}{color}{remaining[index]:>12.1f}{Colors.RESET if color else ''}"
+                  f"{completed[index]:>16.1f}{ideal:>12.1f}  {bar}")
+        for (activity, member), values in sorted(series.items()):
+            for day_key, (remaining_hours, completed_hours) in zip(day_keys, values):
+                table.append((sprint_name, day_key, activity, member), (remaining_hours, completed_hours))
+
+    return table
+
+# Organizasyon genelinde (çok takımlı) analiz
+TEAMS_PAGE_SIZE = 100
+
+def discover_teams():
+    """Organizasyondaki tüm takımları (proje, takım) çiftleri olarak listele"""
+    teams = []
+    skip = 0
+    while True:
+        url = f"{base_url}/_apis/teams?$top={TEAMS_PAGE_SIZE}&$skip={skip}&api-version=7.0-preview.3"
+        if settings['debug']:
+            print(f"Debug: Listing teams: {url}")
+        res = client.get(url)
+        res.raise_for_status()
+        page = res.json()["value"]
+        teams.extend((team["projectName"], team["name"]) for team in page)
+        if len(page) < TEAMS_PAGE_SIZE:
+            return teams
+        skip += len(page)
+
+def parse_team_list(specs):
+    """'Proje/Takım' ya da yalnızca 'Takım' (config'deki proje) listesini (proje, takım) çiftlerine çevir"""
+    teams = []
+    for spec in specs:
+        spec = spec.strip()
+        if not spec:
+            continue
+        # Azure DevOps proje adlarında '/' kullanılamaz
+        project, _, team = spec.rpartition('/')
+        teams.append((project or settings['project'], team))
+    return teams
+
+def analyze_team(team_scope, sprint_names, jobs=1):
+    """Bir takımın sprint aralığını kendi kapsamında, ilerleme satırı basmadan analiz et"""
+    with use_scope(team_scope):
+        try:
+            return analyze_sprints(sprint_names, jobs, quiet=True)
+        except Exception as e:
+            return [SprintSnapshot(sprint_name, error=e) for sprint_name in sprint_names]
+
+def analyze_teams(team_scopes, sprint_names, jobs=1, team_jobs=1):
+    """Aynı sprint aralığını birden çok takım için analiz et; takım sırasıyla (kapsam, snapshot'lar) üret.
+
+    En fazla `team_jobs` takım aynı anda işlenir; her takım içinde `jobs` sprint
+    paralel çekilir. Toplam eşzamanlı istek sayısını istemcinin `max_in_flight`
+    sınırı belirler.
+    """
+    def worker(team_scope):
+        snapshots = analyze_team(team_scope, sprint_names, jobs)
+        failed = sum(1 for snapshot in snapshots if snapshot.error)
+        status = f"{Colors.RED}{failed} sprint analiz edilemedi{Colors.RESET}" if failed else "tamamlandı"
+        with _print_lock:
+            print(f"✅ {team_scope.label}: {len(snapshots) - failed}/{len(snapshots)} sprint, {status}")
+        return team_scope, snapshots
+
+    with ThreadPoolExecutor(max_workers=max(1, team_jobs)) as executor:
+        yield from executor.map(worker, team_scopes)
+
+@profiler.timed('render:team-matrix')
+def generate_team_matrix_report(team_results):
+    """Takımlar arası kapasite / planlanan iş matrisi (takım x aktivite, tüm sprint aralığı)"""
+    detail = ResultTable('team_sprint_activity', ['project', 'team', 'sprint', 'activity'],
+                         ['planned_hours', 'capacity_hours', 'resource_need_hours'])
+    totals = {}  # (takım etiketi, aktivite) -> [planlanan, kapasite, sprint bazında ihtiyaç toplamı]
+    labels = []
+    for team_scope, snapshots in team_results:
+        labels.append(team_scope.label)
+        for snapshot in snapshots:
+            if snapshot.error:
+                continue
+            for activity, planned, capacity, resource_need in sprint_activity_rows(snapshot):
+                detail.append((team_scope.project, team_scope.team, snapshot.name, activity),
+                              (planned, capacity, resource_need))
+                cell = totals.setdefault((team_scope.label, activity), [0.0, 0.0, 0.0])
+                cell[0] += planned
+                cell[1] += capacity
+                cell[2] += resource_need
+
+    table = ResultTable('team_activity', ['team', 'activity'],
+                        ['planned_hours', 'capacity_hours', 'utilization_pct', 'resource_need_hours'])
+    activities = sorted({activity for _, activity in totals})
+    width = max([25] + [len(label) + 2 for label in labels])
+
+    def utilization_cell(planned, capacity, cell_width):
+        if capacity <= 0:
+            if planned <= 0:
+                return f"{'-':>{cell_width}}"
+            return f"{Colors.RED}{'∞':>{cell_width}}{Colors.RESET}"
+        utilization = planned / capacity * 100
+        text = f"{utilization:.0f}%"
+        if utilization > 100:
+            return f"{Colors.RED}{text:>{cell_width}}{Colors.RESET}"
+        if utilization > 90:
+            return f"{Colors.YELLOW}{text:>{cell_width}}{Colors.RESET}"
+        return f"{text:>{cell_width}}"
+
+    print(f"\n🏢 Takımlar Arası Kapasite / Planlanan İş Matrisi ({len(labels)} takım, yüklenme %):")
+    line_width = width + 14 * len(activities) + 45
+    print("=" * line_width)
+    print(f"{'Takım':<{width}}" + "".join(f"{activity[:13]:>14}" for activity in activities)
+          + f"{'Planlanan (h)':>15}{'Kapasite (h)':>15}{'İhtiyaç (h)':>15}")
+    print("-" * line_width)
+
+    column_totals = defaultdict(lambda: [0.0, 0.0])
+    total_need = 0.0
+    for label in labels:
+        row = ""
+        team_planned = team_capacity = team_need = 0.0
+        for activity in activities:
+            planned, capacity, need = totals.get((label, activity), (0.0, 0.0, 0.0))
+            row += utilization_cell(planned, capacity, 14)
+            if (label, activity) in totals:
+                table.append((label, activity),
+                             (planned, capacity, (planned / capacity * 100) if capacity > 0 else 0, need))
+                team_need += need
+            team_planned += planned
+            team_capacity += capacity
+            column_totals[activity][0] += planned
+            column_totals[activity][1] += capacity
+        total_need += team_need
+        need_str = f"{Colors.RED}{team_need:>15.1f}{Colors.RESET}" if team_need > 0 else f"{team_need:>15.1f}"
+        print(f"{label:<{width}}{row}{team_planned:>15.1f}{team_capacity:>15.1f}{need_str}")
+
+    print("-" * line_width)
+    total_planned = sum(planned for planned, _ in column_totals.values())
+    total_capacity = sum(capacity for _, capacity in column_totals.values())
+    row = "".join(utilization_cell(*column_totals[activity], 14) for activity in activities)
+    need_str = f"{Colors.RED}{total_need:>15.1f}{Colors.RESET}" if total_need > 0 else f"{total_need:>15.1f}"
+    print(f"{Colors.BOLD}{'TOPLAM':<{width}}{Colors.RESET}{row}{total_planned:>15.1f}{total_capacity:>15.1f}{need_str}")
+
+    return [table, detail]
+
+# Sürekli çalışan metrik servisi (--serve)
+def prometheus_labels(**labels):
+    """Prometheus etiket kümesi; ters bölü, tırnak ve satır sonu kaçırılır"""
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+class MetricsService:
+    """Sprint ve kapasite verisini bellekte tutar, aralıklarla artımlı olarak tazeler.
+
+    Her tazelemede snapshot'lar yeniden alınır (yerel work item deposu açıksa
+    yalnızca değişen Task'lar çekilir) ve JSON ile Prometheus çıktıları bir kez
+    üretilip saklanır; HTTP istekleri API'ye hiç dokunmadan bu hazır çıktıyı
+    döndürür. Analiz edilemeyen bir sprintin son başarılı verisi korunur.
+    """
+
+    def __init__(self, team_scopes, sprint_names, jobs=1, team_jobs=1, interval=300):
+        self.team_scopes = team_scopes
+        self.sprint_names = sprint_names
+        self.jobs = jobs
+        self.team_jobs = team_jobs
+        self.interval = interval
+        self.snapshots = {}  # (takım etiketi, sprint) -> son başarılı snapshot
+        self.errors = {}     # (takım etiketi, sprint) -> son hata
+        self.refresh_count = 0
+        self.last_refresh = None
+        self.last_duration = 0.0
+        self.json_body = b"{}"
+        self.metrics_body = b""
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def refresh(self):
+        """Tüm takım ve sprintleri yeniden analiz et, hazır çıktıları güncelle"""
+        started = time.monotonic()
+        for team_scope in self.team_scopes:
+            # Başlangıçtan sonra açılan sprintler ve değişen tarihler görülsün (iteration_ttl'e kadar diskten)
+            team_scope.iteration_index.expire()
+            if team_scope.work_item_store:
+                # Depo yalnızca son senkronizasyondan beri değişenleri çeker
+                team_scope.work_item_store.expire_changes()
+        for team_scope, snapshots in analyze_teams(self.team_scopes, self.sprint_names, self.jobs, self.team_jobs):
+            for snapshot in snapshots:
+                key = (team_scope.label, snapshot.name)
+                if snapshot.error:
+                    self.errors[key] = snapshot.error
+                else:
+                    self.snapshots[key] = snapshot
+                    self.errors.pop(key, None)
+        self.refresh_count += 1
+        self.last_refresh = datetime.now(timezone.utc)
+        self.last_duration = time.monotonic() - started
+        json_body, metrics_body = self.render()
+        with self._lock:
+            self.json_body = json_body
+            self.metrics_body = metrics_body
+
+    def render(self):
+        """JSON ve Prometheus metin çıktılarını üret"""
+        teams = []
+        lines = []
+        gauges = defaultdict(list)
+        for team_scope in self.team_scopes:
+            sprints = []
+            for sprint_name in self.sprint_names:
+                key = (team_scope.label, sprint_name)
+                snapshot = self.snapshots.get(key)
+                error = self.errors.get(key)
+                entry = {'sprint': sprint_name, 'error': str(error) if error else None,
+                         'activities': [], 'members': []}
+                if snapshot:
+                    for activity, planned, capacity, resource_need in sprint_activity_rows(snapshot):
+                        utilization = (planned / capacity * 100) if capacity > 0 else 0
+                        entry['activities'].append({
+                            'activity': activity, 'planned_hours': planned, 'capacity_hours': capacity,
+                            'resource_need_hours': resource_need, 'utilization_pct': round(utilization, 1),
+                        })
+                        labels = prometheus_labels(team=team_scope.label, sprint=sprint_name, activity=activity)
+                        gauges['azure_sprint_planned_hours'].append(f"{labels} {planned}")
+                        gauges['azure_sprint_capacity_hours'].append(f"{labels} {capacity}")
+                        gauges['azure_sprint_resource_need_hours'].append(f"{labels} {resource_need}")
+                        gauges['azure_sprint_utilization_ratio'].append(f"{labels} {utilization / 100:.4f}")
+                    for member, activity, capacity, planned, utilization in member_activity_rows(snapshot):
+                        entry['members'].append({
+                            'member': member, 'activity': activity, 'capacity_hours': capacity,
+                            'planned_hours': planned, 'utilization_pct': round(utilization, 1),
+                        })
+                        labels = prometheus_labels(team=team_scope.label, sprint=sprint_name,
+                                                   member=member, activity=activity)
+                        gauges['azure_member_capacity_hours'].append(f"{labels} {capacity}")
+                        gauges['azure_member_planned_hours'].append(f"{labels} {planned}")
+                        gauges['azure_member_utilization_ratio'].append(f"{labels} {utilization / 100:.4f}")
+                gauges['azure_sprint_up'].append(
+                    f"{prometheus_labels(team=team_scope.label, sprint=sprint_name)} {0 if error else 1}")
+                sprints.append(entry)
+            teams.append({'team': team_scope.label, 'sprints': sprints})
+
+        for name, help_text in METRIC_HELP.items():
+            if name in gauges:
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{sample}" for sample in gauges[name])
+        lines += [
+            "# HELP azure_refresh_timestamp_seconds Unix time of the last completed refresh",
+            "# TYPE azure_refresh_timestamp_seconds gauge",
+            f"azure_refresh_timestamp_seconds {self.last_refresh.timestamp():.0f}",
+            "# HELP azure_refresh_duration_seconds Duration of the last refresh",
+            "# TYPE azure_refresh_duration_seconds gauge",
+            f"azure_refresh_duration_seconds {self.last_duration:.3f}",
+            "# HELP azure_refreshes_total Completed refreshes",
+            "# TYPE azure_refreshes_total counter",
+            f"azure_refreshes_total {self.refresh_count}",
+            "# HELP azure_api_requests_total Azure DevOps API requests sent by this process",
+            "# TYPE azure_api_requests_total counter",
+            f"azure_api_requests_total {client.stats['requests']}",
+            "# HELP azure_api_throttled_total 429 responses received by this process",
+            "# TYPE azure_api_throttled_total counter",
+            f"azure_api_throttled_total {client.stats['throttled']}",
+        ]
+
+        document = {
+            'generated_at': self.last_refresh.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'refresh_seconds': round(self.last_duration, 3),
+            'interval_seconds': self.interval,
+            'teams': teams,
+        }
+        return json.dumps(document, ensure_ascii=False).encode('utf-8'), ("\n".join(lines) + "\n").encode('utf-8')
+
+    def run_refresh_loop(self):
+        """`interval` saniyede bir tazele; hata servisi durdurmaz"""
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+                print(f"🔄 Metrikler tazelendi ({self.last_duration:.1f} sn, {len(self.errors)} hatalı sprint)")
+            except Exception as e:
+                print(f"❌ Metrikler tazelenemedi: {e}")
+
+    def stop(self):
+        self._stop.set()
+
+    def make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                if settings['debug']:
+                    super().log_message(*args)
+
+            def do_GET(self):
+                path = self.path.split('?')[0].rstrip('/') or '/'
+                with service._lock:
+                    if path == '/metrics':
+                        body, content_type = service.metrics_body, 'text/plain; version=0.0.4; charset=utf-8'
+                    elif path in ('/', '/utilization'):
+                        body, content_type = service.json_body, 'application/json; charset=utf-8'
+                    elif path == '/healthz':
+                        body, content_type = b'ok\n', 'text/plain; charset=utf-8'
+                    else:
+                        body, content_type = None, None
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def serve(self, host, port):
+        """İlk tazelemeyi yap, ardından HTTP sunucusunu ve tazeleme döngüsünü başlat (Ctrl+C ile durur)"""
+        self.refresh()
+        server = ThreadingHTTPServer((host, port), self.make_handler())
+        print(f"\n📡 Metrikler yayında: http://{host}:{server.server_address[1]}/metrics "
+              f"(JSON: /utilization, tazeleme: {self.interval} sn)")
+        threading.Thread(target=self.run_refresh_loop, daemon=True).start()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            server.server_close()
+
+METRIC_HELP = {
+    'azure_sprint_planned_hours': 'Planned work (OriginalEstimate sum) per sprint and activity',
+    'azure_sprint_capacity_hours': 'Team capacity per sprint and activity (capacityPerDay x working days)',
+    'azure_sprint_resource_need_hours': 'Planned work exceeding capacity per sprint and activity',
+    'azure_sprint_utilization_ratio': 'Planned work / capacity per sprint and activity',
+    'azure_member_capacity_hours': 'Member capacity per sprint and activity',
+    'azure_member_planned_hours': 'Member planned work per sprint and activity',
+    'azure_member_utilization_ratio': 'Member planned work / capacity per sprint and activity',
+    'azure_sprint_up': '1 if the last refresh of the sprint succeeded, 0 if cached data is served',
+}
+
+# Ana akış
+def main(argv=None):
+    """Komut satırı girişi; çıkış kodunu döndürür (0 başarılı, 1 ayar / erişim hatası, 2 eksik sprint)"""
+    parser = argparse.ArgumentParser(description='Azure DevOps Sprint Analysis')
+    parser.add_argument('sprints', nargs='?', default='51', 
+                       help='Sprint number or range (e.g., "51" or "50-55")')
+    parser.add_argument('--report', choices=['default', 'capacity', 'trend', 'workitem-types', 'hierarchy', 'burndown', 'all'], 
+                       default='default',
+                       help='Report type to generate')
+    parser.add_argument('--rebalance', action='store_true',
+                       help='Propose task hour reassignments / sprint moves that minimize member over-allocation')
+    parser.add_argument('--jobs', type=int,
+                       help='Number of sprints to fetch in parallel (default: [Analysis] jobs, 1)')
+    parser.add_argument('--trend-window', type=int,
+                       help='Rolling average window (sprints) for the trend report (default: [Analysis] trend_window, 3)')
+    parser.add_argument('--refresh', action='store_true',
+                       help='Ignore on-disk caches and fetch fresh data')
+    parser.add_argument('--no-store', action='store_true',
+                       help='Do not use the local work item store')
+    parser.add_argument('--engine', choices=ENGINES,
+                       help='Where planned hours are summed: "rest" downloads every Task, '
+                            '"analytics" groups them server-side via Analytics OData (default: [Analysis] engine, rest)')
+    parser.add_argument('--stream', action='store_true',
+                       help='Print each sprint\'s rows as soon as that sprint is fetched')
+    parser.add_argument('--output', choices=OUTPUT_FORMATS,
+                       help='Also write each report table to a file in this format')
+    parser.add_argument('--output-dir', default='.',
+                       help='Directory for --output files (default: current directory)')
+    recording = parser.add_mutually_exclusive_group()
+    recording.add_argument('--record', metavar='DIR',
+                       help='Save every API response to DIR for later --replay')
+    recording.add_argument('--replay', metavar='DIR',
+                       help='Serve all API calls from responses saved with --record (no network)')
+    parser.add_argument('--check-connectivity', action='store_true',
+                       help='Run the separate connectivity probe before analysis (extra round-trip)')
+    parser.add_argument('--serve', action='store_true',
+                       help='Run as a daemon: keep data in memory, refresh it periodically and serve '
+                            'JSON (/utilization) and Prometheus (/metrics) over HTTP')
+    parser.add_argument('--port', type=int,
+                       help='HTTP port for --serve (default: [Serve] port, 9108)')
+    parser.add_argument('--interval', type=int,
+                       help='Refresh interval in seconds for --serve (default: [Serve] interval, 300)')
+    teams_group = parser.add_mutually_exclusive_group()
+    teams_group.add_argument('--teams',
+                       help='Comma-separated "Project/Team" list to analyze in one run (default: [Analysis] teams)')
+    teams_group.add_argument('--all-teams', action='store_true',
+                       help='Analyze every team in the organization')
+    parser.add_argument('--team-jobs', type=int,
+                       help='Number of teams analyzed in parallel (default: [Analysis] team_jobs, 4)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Print per-phase timings, request/byte counts and cache hit rates at the end')
+    parser.add_argument('--profile-output', metavar='FILE',
+                       help='Also write the profile as a Chrome trace JSON file (implies --profile)')
     
-    # Capacity raporu da isteniyorsa
-    if args.report == 'all':
-        generate_capacity_report(sprint_numbers, all_results)
+    args = parser.parse_args(argv)
+    try:
+        # --replay ağa çıkmadığı için PAT gerektirmez
+        configure(require_pat=not args.replay)
+    except ConfigError as e:
+        print(e)
+        return 1
+    if args.profile or args.profile_output:
+        profiler.enable()
+    if args.jobs is None:
+        args.jobs = settings['jobs']
+    if args.trend_window is None:
+        args.trend_window = settings['trend_window']
+    if args.team_jobs is None:
+        args.team_jobs = settings['team_jobs']
+    if args.engine:
+        settings['engine'] = args.engine
+    args.jobs = max(1, args.jobs)
+    if args.record or args.replay:
+        # Kayıt eksiksiz olsun ve tekrar oynatma yalnızca kayda dayansın diye disk önbellekleri kapatılır
+        client.record_dir = args.record
+        client.replay_dir = args.replay
+        settings['iteration_ttl'] = 0
+        args.no_store = True
+    if args.no_store:
+        settings['work_item_store'] = False
+    team_specs = args.teams.split(',') if args.teams else settings['teams']
+    org_mode = args.all_teams or bool(team_specs)
+    if args.refresh and not org_mode:
+        scope().iteration_index.invalidate()
+        if scope().work_item_store:
+            scope().work_item_store.reset()
+        project_burndown_store(settings['project']).reset()
+    client.ensure_pool_size(max(args.jobs, settings['fetch_concurrency'], settings['max_in_flight']))
+    
+    if args.output == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        print("❌ Parquet çıktısı için pyarrow gerekli: pip install pyarrow")
+        return 1
+    
+    if args.check_connectivity:
+        print("🔄 Testing basic connectivity...")
+        if not test_connectivity():
+            print("❌ Basic connectivity failed. Please check your PAT and organization name.")
+            return 1
+        print("✅ Basic connectivity successful!")
+    elif not org_mode:
+        # Ayrı bir test turu yerine iterasyon listesi isteği (ya da önbelleği) erişimi doğrular
+        access_error = check_access()
+        if access_error:
+            print(f"❌ Azure DevOps'a erişilemedi: {access_error}")
+            print("❌ Basic connectivity failed. Please check your PAT and organization name.")
+            return 1
+    
+    # Sprint aralığını parse et
+    sprint_numbers = parse_sprint_range(args.sprints)
+    print(f"📋 Analiz edilecek sprintler: {sprint_numbers}")
+    sprint_names = [f"Sprint {sprint_num}" for sprint_num in sprint_numbers]
+    
+    if org_mode:
+        # Tüm takımlar tek süreçte: istemci (bağlantı havuzu) ve proje depoları paylaşılır
+        if args.all_teams:
+            try:
+                team_pairs = discover_teams()
+            except Exception as e:
+                print(f"❌ Azure DevOps'a erişilemedi: {e}")
+                print("❌ Basic connectivity failed. Please check your PAT and organization name.")
+                return 1
+        else:
+            team_pairs = parse_team_list(team_specs)
+        team_scopes = [TeamScope(project, team) for project, team in team_pairs]
+        if args.refresh:
+            for team_scope in team_scopes:
+                team_scope.iteration_index.invalidate()
+            for store in _work_item_stores.values():
+                store.reset()
+            for project in {team_scope.project for team_scope in team_scopes}:
+                project_burndown_store(project).reset()
+    
+    if args.serve:
+        # Uzun çalışan servis: veri bellekte tutulur, aralıklarla artımlı tazelenir
+        service = MetricsService(team_scopes if org_mode else [scope()], sprint_names, args.jobs, args.team_jobs,
+                                 args.interval or settings['serve_interval'])
+        service.serve(settings['serve_host'], args.port if args.port is not None else settings['serve_port'])
+        return 0
+    
+    if org_mode:
+        if args.report != 'default':
+            print(f"{Colors.YELLOW}ℹ️ Takımlar arası modda yalnızca takım x aktivite matrisi üretilir (--report yok sayıldı).{Colors.RESET}")
+        print(f"🏢 {len(team_scopes)} takım analiz ediliyor (aynı anda {max(1, args.team_jobs)} takım)...\n")
+        
+        team_results = list(analyze_teams(team_scopes, sprint_names, args.jobs, args.team_jobs))
+        tables = generate_team_matrix_report(team_results)
+        if args.rebalance:
+            tables.extend(generate_rebalance_report([(team_scope.label, snapshots) for team_scope, snapshots in team_results]))
+        if args.output:
+            print()
+            write_tables(tables, args.output, args.output_dir)
+        client.print_throttle_summary()
+        finish_profile(args.profile_output)
+        
+        failed = [(team_scope, snapshot) for team_scope, snapshots in team_results for snapshot in snapshots if snapshot.error]
+        if failed:
+            print(f"\n{Colors.RED}⚠️ {len(failed)} takım/sprint analiz edilemedi ve matrise dahil değil:{Colors.RESET}")
+            for team_scope, snapshot in failed:
+                print(f"{Colors.RED}   - {team_scope.label} {snapshot.name}: {snapshot.error}{Colors.RESET}")
+            return 2
+        return 0
+    
+    print(f"📊 Rapor türü: {args.report}")
+    
+    # Raporların sonuç tabloları (--output ile dosyaya yazılır)
+    tables = []
+    
+    # Her sprint bir kez çekilir; tüm raporlar aynı snapshot'ları kullanır
+    snapshots = []
+    if args.stream and args.report in ['default', 'capacity', 'all']:
+        # Sprint satırları (yalnızca capacity isteniyorsa kişi blokları) sprint hazır oldukça basılır
+        if args.report == 'capacity':
+            capacity_report = CapacityReport()
+            snapshots = stream_reports(iter_analyze_sprints(sprint_names, args.jobs), capacity_report)
+            tables.append(capacity_report.finish())
+        else:
+            sprint_report = SprintReport()
+            snapshots = stream_reports(iter_analyze_sprints(sprint_names, args.jobs), sprint_report)
+            tables.append(sprint_report.finish())
+            # Akıtılmayan raporla aynı düzen: kişi blokları sprint özetlerinden sonra gelir
+            if args.report == 'all':
+                tables.append(generate_capacity_report(snapshots))
+    else:
+        if args.report in ['default', 'capacity', 'trend', 'hierarchy', 'all'] or args.rebalance:
+            snapshots = analyze_sprints(sprint_names, args.jobs)
+        
+        # Sadece capacity raporu isteniyorsa
+        if args.report == 'capacity':
+            tables.append(generate_capacity_report(snapshots))
+        
+        # Varsayılan rapor (mevcut analiz)
+        if args.report in ['default', 'all']:
+            tables.append(generate_sprint_report(snapshots))
+        
+        # Capacity raporu da isteniyorsa
+        if args.report == 'all':
+            tables.append(generate_capacity_report(snapshots))
+    
+    # Trend raporu (aynı snapshot'lardan, yeniden istek atmadan)
+    if args.report in ['trend', 'all']:
+        tables.extend(generate_trend_report(snapshots, args.trend_window))
+    
+    # Work item tipi raporu (Task dışındaki tipler de dahil, akış halinde toplanır)
+    if args.report in ['workitem-types', 'all']:
+        tables.append(generate_workitem_types_report(sprint_names, settings['work_item_types']))
+    
+    # Hiyerarşi raporu (Task saatleri PBI / Feature / Epic'e toplanır)
+    if args.report in ['hierarchy', 'all']:
+        tables.append(generate_hierarchy_report(snapshots, sprint_names))
+    
+    # Burndown raporu (revizyon akışından; ilk eşitleme pahalı olduğundan 'all'a dahil değil)
+    if args.report == 'burndown':
+        tables.append(generate_burndown_report(sprint_names))
+    
+    # Yeniden dağıtım önerisi (kişi x aktivite matrislerinden, yeniden istek atmadan)
+    if args.rebalance:
+        if not snapshots:
+            snapshots = analyze_sprints(sprint_names, args.jobs)
+        tables.extend(generate_rebalance_report([('', snapshots)]))
+    
+    if args.output:
+        print()
+        write_tables(tables, args.output, args.output_dir)
+    
+    client.print_throttle_summary()
+    finish_profile(args.profile_output)
+    
+    # Analiz edilemeyen sprintler rapordan sessizce düşmesin
+    failed_sprints = [snapshot for snapshot in snapshots if snapshot.error]
+    if failed_sprints:
+        print(f"\n{Colors.RED}⚠️ {len(failed_sprints)} sprint analiz edilemedi ve rapora dahil değil:{Colors.RESET}")
+        for snapshot in failed_sprints:
+            print(f"{Colors.RED}   - {snapshot.name}: {snapshot.error}{Colors.RESET}")
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
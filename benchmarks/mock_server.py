@@ -0,0 +1,636 @@
+"""Azure DevOps REST uç noktalarının yerel, sentetik veriyle çalışan taklidi.
+
+azure.py'nin kullandığı uç noktaları (projects, teams, teamsettings, teamsettings/iterations,
+capacities, teamdaysoff, wit/wiql (WorkItemLinks dahil), wit/reporting/workitemrevisions, wit/workitems, wit/workitemsbatch ve Analytics
+_odata/WorkItems) taklit eder.
+Veri bellekte tutulmaz; her work item id'sinden deterministik olarak
+üretilir, böylece 50 takım x 100 sprint x 2.000 task gibi büyük
+senaryolar da az bellekle sunulabilir.
+
+Tek başına çalıştırmak için:
+    python benchmarks/mock_server.py --teams 5 --sprints 20 --tasks 500 --port 8765
+"""
+import argparse
+import calendar
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+ACTIVITIES = ['Development', 'Testing', 'UI Development', 'Requirements', 'Code Review', 'Deployment']
+STATES = ['New', 'Active', 'Closed']
+FIRST_SPRINT = 1
+FIRST_DAY = 1767225600  # 2026-01-01: ilk sprintin başlangıcı
+# Hiyerarşi: her 10 Task bir PBI'a, her 8 PBI bir Feature'a, her 5 Feature bir Epic'e bağlı
+PBI_BASE = 900_000_000
+FEATURE_BASE = 950_000_000
+EPIC_BASE = 990_000_000
+HIERARCHY_LINK = 'System.LinkTypes.Hierarchy-Forward'
+SPRINT_DAYS = 14
+# WIQL tek yanıtta en fazla bu kadar sonuç döndürür; aşılırsa 400 (VS402337)
+WIQL_RESULT_LIMIT = 20000
+WIQL_LIMIT_ERROR = {
+    'message': f"VS402337: The number of work items returned exceeds the size limit of {WIQL_RESULT_LIMIT}. "
+               "Change the query to return fewer items.",
+    'typeKey': 'WorkItemTrackingQueryResultSizeLimitExceededException',
+}
+
+
+class SyntheticData:
+    """Takım/sprint/work item verisini id'lerden deterministik olarak üretir"""
+
+    def __init__(self, teams=1, sprints=20, tasks=500, members=8, non_task_ratio=0.0,
+                 project='Proj', seed=1, first_day=FIRST_DAY):
+        self.teams = teams
+        self.sprints = sprints
+        self.tasks = tasks
+        self.members = members
+        self.non_task_ratio = non_task_ratio
+        self.project = project
+        self.seed = seed
+        self.first_day = first_day
+
+        self.team_names = [f"Team {t + 1}" for t in range(teams)]
+        self._revision_feed = None
+        self._revision_lock = threading.Lock()
+        # Testlerin çalıştırmalar arasında yaptığı değişiklikler: id -> (rev, değişiklik zamanı, alanlar)
+        self.edits = {}
+        self.deleted = set()
+        # Gerçek servis gibi: sonraki sayfa, önceki sayfanın son bu kadar revizyonunu tekrar döndürür
+        self.revision_overlap = 0
+        # Testlerin geçici olarak erişilemez yaptığı sprint indeksleri: kapasite isteği 503 döndürür
+        self.unavailable_sprints = set()
+        # İterasyon yolu -> (takım, sprint) indeksi
+        self.paths = {}
+        for t in range(teams):
+            for n in range(sprints):
+                self.paths[self.iteration_path(t, n)] = (t, n)
+
+    # Yapı
+    def team_index(self, team_name):
+        try:
+            return self.team_names.index(team_name)
+        except ValueError:
+            return None
+
+    def iteration_path(self, team, sprint):
+        return f"{self.project}\\{self.team_names[team]}\\Sprint {FIRST_SPRINT + sprint}"
+
+    def member_names(self, team):
+        return [f"Member {team + 1}.{m + 1}" for m in range(self.members)]
+
+    def iteration_dates(self, sprint):
+        start = self.first_day + sprint * SPRINT_DAYS * 86400
+        finish = start + (SPRINT_DAYS - 3) * 86400
+        fmt = '%Y-%m-%dT00:00:00Z'
+        return time.strftime(fmt, time.gmtime(start)), time.strftime(fmt, time.gmtime(finish))
+
+    def iterations(self, team):
+        result = []
+        for n in range(self.sprints):
+            start, finish = self.iteration_dates(n)
+            result.append({
+                'id': f"it-{team + 1}-{n + FIRST_SPRINT}",
+                'name': f"Sprint {n + FIRST_SPRINT}",
+                'path': self.iteration_path(team, n),
+                'attributes': {'startDate': start, 'finishDate': finish, 'timeFrame': 'past'},
+            })
+        return result
+
+    def sprint_day(self, sprint, offset):
+        start = self.first_day + sprint * SPRINT_DAYS * 86400 + offset * 86400
+        return time.strftime('%Y-%m-%dT00:00:00Z', time.gmtime(start))
+
+    def capacities(self, team, sprint):
+        rng = random.Random(f"{self.seed}-cap-{team}-{sprint}")
+        off_rng = random.Random(f"{self.seed}-off-{team}-{sprint}")
+        members = []
+        for name in self.member_names(team):
+            activity = rng.choice(ACTIVITIES)
+            days_off = []
+            # Her dört üyeden biri sprint içinde 1-3 gün izinli
+            if off_rng.random() < 0.25:
+                first = off_rng.randrange(SPRINT_DAYS - 3)
+                days_off.append({'start': self.sprint_day(sprint, first),
+                                 'end': self.sprint_day(sprint, first + off_rng.randrange(3))})
+            members.append({
+                'teamMember': {'displayName': name, 'uniqueName': f"{name.replace(' ', '.').lower()}@example.com"},
+                'activities': [{'name': activity, 'capacityPerDay': rng.choice([2, 4, 6, 8])}],
+                'daysOff': days_off,
+            })
+        return {'teamMembers': members, 'totalCapacityPerDay': 0, 'totalDaysOff': 0}
+
+    def team_days_off(self, team, sprint):
+        # Her dördüncü sprintte bir günlük takım tatili
+        if sprint % 4 != 3:
+            return []
+        return [{'start': self.sprint_day(sprint, 5), 'end': self.sprint_day(sprint, 5)}]
+
+    # Work item'lar
+    def items_per_sprint(self):
+        return self.tasks + int(self.tasks * self.non_task_ratio)
+
+    def ids_for(self, team, sprint):
+        first = (team * self.sprints + sprint) * self.items_per_sprint() + 1
+        return range(first, first + self.items_per_sprint())
+
+    def locate(self, work_item_id):
+        index = work_item_id - 1
+        per_sprint = self.items_per_sprint()
+        block, offset = divmod(index, per_sprint)
+        team, sprint = divmod(block, self.sprints)
+        if team >= self.teams or index < 0:
+            return None
+        return team, sprint, offset
+
+    def update(self, work_item_id, fields):
+        """Work item alanlarını değiştir: rev artar, System.ChangedDate şu an olur; Task'lar için revizyon akışına eklenir"""
+        rev, _, edited = self.edits.get(work_item_id, (1, None, {}))
+        is_task = self.work_item_type(work_item_id, edited=False) == 'Task'
+        if is_task:
+            rev = max(rev, len(self.task_revisions(work_item_id)))
+        changed, edited = time.time(), dict(edited, **fields)
+        self.edits[work_item_id] = (rev + 1, changed, edited)
+        if is_task:
+            remaining = edited.get('Microsoft.VSTS.Scheduling.RemainingWork', self.task_revisions(work_item_id)[-1][1])
+            feed = self.revision_feed()
+            with self._revision_lock:
+                feed.append((changed, work_item_id, rev + 1, remaining, edited))
+
+    def delete(self, work_item_id):
+        """Work item'ı geri dönüşüm kutusuna taşı: sorgular ve çekme artık döndürmez"""
+        self.deleted.add(work_item_id)
+
+    def iteration_ids(self, path):
+        """İterasyondaki (silinmemiş) work item id'leri; update() ile taşınanlar dahil, sıralı"""
+        location = self.paths.get(path)
+        ids = self.ids_for(*location) if location else range(0)
+        if not self.edits and not self.deleted:
+            return ids
+        ids = set(ids)
+        for work_item_id, (_, _, fields) in self.edits.items():
+            if 'System.IterationPath' not in fields:
+                continue
+            if fields['System.IterationPath'] == path:
+                ids.add(work_item_id)
+            else:
+                ids.discard(work_item_id)
+        return sorted(ids - self.deleted)
+
+    def changed_since(self, timestamp):
+        """update() ile verilen andan sonra değiştirilmiş (silinmemiş) id'ler; sentetik veri kendiliğinden değişmez"""
+        return sorted(work_item_id for work_item_id, (_, changed, _) in self.edits.items()
+                      if changed > timestamp and work_item_id not in self.deleted)
+
+    def work_item_type(self, work_item_id, edited=True):
+        changes = self.edits.get(work_item_id) if edited else None
+        if changes and 'System.WorkItemType' in changes[2]:
+            return changes[2]['System.WorkItemType']
+        location = self.locate(work_item_id)
+        if location is None:
+            return None
+        return 'Task' if location[2] < self.tasks else random.Random(work_item_id).choice(['Bug', 'Product Backlog Item'])
+
+    def parent_of(self, work_item_id):
+        """Hiyerarşideki üst öğe id'si; kök ya da üst öğesi olmayan Task ise None"""
+        if work_item_id >= EPIC_BASE:
+            return None
+        if work_item_id >= FEATURE_BASE:
+            return EPIC_BASE + (work_item_id - FEATURE_BASE) // 5
+        if work_item_id >= PBI_BASE:
+            return FEATURE_BASE + (work_item_id - PBI_BASE) // 8
+        # Bazı Task'ların üst öğesi yok
+        if self.work_item_type(work_item_id) != 'Task' or work_item_id % 17 == 0:
+            return None
+        return PBI_BASE + (work_item_id - 1) // 10
+
+    def backlog_item(self, work_item_id, fields=None):
+        """Hiyerarşideki PBI / Feature / Epic kaydı"""
+        if work_item_id >= EPIC_BASE:
+            work_item_type, number = 'Epic', work_item_id - EPIC_BASE
+        elif work_item_id >= FEATURE_BASE:
+            work_item_type, number = 'Feature', work_item_id - FEATURE_BASE
+        else:
+            work_item_type, number = 'Product Backlog Item', work_item_id - PBI_BASE
+        all_fields = {
+            'System.Id': work_item_id,
+            'System.TeamProject': self.project,
+            'System.WorkItemType': work_item_type,
+            'System.Title': f"{work_item_type} {number + 1}",
+            'System.State': 'Active',
+        }
+        if fields:
+            all_fields = {key: value for key, value in all_fields.items() if key in fields}
+        return {'id': work_item_id, 'rev': 1, 'fields': all_fields}
+
+    def work_item(self, work_item_id, fields=None, edited=True):
+        """Work item kaydı; edited=False ise update() / delete() öncesi (üretilmiş) hali"""
+        if work_item_id >= PBI_BASE:
+            return self.backlog_item(work_item_id, fields)
+        location = self.locate(work_item_id)
+        if location is None or (edited and work_item_id in self.deleted):
+            return None
+        team, sprint, _ = location
+        rng = random.Random(f"{self.seed}-wi-{work_item_id}")
+        estimate = float(rng.randint(1, 16))
+        completed = float(rng.randint(0, int(estimate)))
+        all_fields = {
+            'System.Id': work_item_id,
+            'System.TeamProject': self.project,
+            'System.IterationPath': self.iteration_path(team, sprint),
+            'System.WorkItemType': self.work_item_type(work_item_id, edited=False),
+            'System.State': rng.choice(STATES),
+            'System.ChangedDate': self.iteration_dates(sprint)[0],
+            'System.AssignedTo': {'displayName': rng.choice(self.member_names(team))},
+            'Microsoft.VSTS.Common.Activity': rng.choice(ACTIVITIES),
+            'Microsoft.VSTS.Scheduling.OriginalEstimate': estimate,
+            'Microsoft.VSTS.Scheduling.CompletedWork': completed,
+            'Microsoft.VSTS.Scheduling.RemainingWork': estimate - completed,
+        }
+        rev = 1
+        if edited and work_item_id in self.edits:
+            rev, changed, edited = self.edits[work_item_id]
+            all_fields.update(edited)
+            all_fields['System.ChangedDate'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(changed))
+        if fields:
+            all_fields = {key: value for key, value in all_fields.items() if key in fields}
+        return {'id': work_item_id, 'rev': rev, 'fields': all_fields}
+
+    def task_revisions(self, work_item_id):
+        """Task'ın revizyonları (zaman, kalan iş): sprintten bir gün önce açılır, sprint boyunca kalan iş azalır"""
+        _, sprint, _ = self.locate(work_item_id)
+        estimate = self.work_item(work_item_id, edited=False)['fields']['Microsoft.VSTS.Scheduling.OriginalEstimate']
+        rng = random.Random(f"{self.seed}-rev-{work_item_id}")
+        start = self.first_day + sprint * SPRINT_DAYS * 86400
+        remaining = estimate
+        revisions = [(start - 86400 + 3600 * 9, remaining)]
+        for day in sorted(rng.sample(range(SPRINT_DAYS - 2), rng.randint(1, 3))):
+            remaining = max(0.0, remaining - float(rng.randint(1, int(estimate))))
+            revisions.append((start + day * 86400 + 3600 * rng.randint(8, 17), remaining))
+        return revisions
+
+    def revision_feed(self):
+        """Tüm Task revizyonları değişiklik zamanı sırasıyla: (zaman, id, rev, kalan[, değişen alanlar])"""
+        with self._revision_lock:
+            if self._revision_feed is None:
+                feed = []
+                for team in range(self.teams):
+                    for sprint in range(self.sprints):
+                        for work_item_id in self.ids_for(team, sprint):
+                            if self.work_item_type(work_item_id, edited=False) != 'Task':
+                                continue
+                            for rev, (changed, remaining) in enumerate(self.task_revisions(work_item_id), 1):
+                                feed.append((changed, work_item_id, rev, remaining))
+                feed.sort()
+                self._revision_feed = feed
+            return self._revision_feed
+
+    def revision(self, changed, work_item_id, rev, remaining, edited=None):
+        """reporting/workitemrevisions kaydı; update() ile eklenenler değişen alanları da taşır"""
+        fields = dict(self.work_item(work_item_id, edited=False)['fields'], **(edited or {}))
+        estimate = fields['Microsoft.VSTS.Scheduling.OriginalEstimate']
+        state = 'New' if rev == 1 else ('Closed' if remaining == 0 else 'Active')
+        return {'id': work_item_id, 'rev': rev, 'fields': {
+            'System.Id': work_item_id,
+            'System.WorkItemType': fields['System.WorkItemType'],
+            'System.IterationPath': fields['System.IterationPath'],
+            'System.State': (edited or {}).get('System.State', state),
+            'System.AssignedTo': fields['System.AssignedTo'],
+            'System.ChangedDate': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(changed)),
+            'Microsoft.VSTS.Common.Activity': fields['Microsoft.VSTS.Common.Activity'],
+            'Microsoft.VSTS.Scheduling.RemainingWork': remaining,
+            'Microsoft.VSTS.Scheduling.CompletedWork': estimate - remaining,
+        }}
+
+    def query(self, wiql):
+        """azure.py'nin ürettiği WIQL alt kümesini değerlendir, id listesi döndür"""
+        paths = []
+        match = re.search(r"\[System\.IterationPath\]\s*(?:=\s*('(?:[^']|'')*')|IN\s*\(((?:[^)']|'(?:[^']|'')*')*)\))", wiql)
+        if match:
+            literals = match.group(1) or match.group(2)
+            paths = [value.replace("''", "'") for value in re.findall(r"'((?:[^']|'')*)'", literals)]
+
+        types = excluded = None
+        type_match = re.search(r"\[System\.WorkItemType\]\s*(?:(=|<>)\s*'([^']*)'|IN\s*\(([^)]*)\))", wiql)
+        if type_match and type_match.group(1) == '<>':
+            excluded = type_match.group(2)
+        elif type_match:
+            types = {type_match.group(2)} if type_match.group(1) else set(re.findall(r"'([^']*)'", type_match.group(3)))
+        after_match = re.search(r"\[System\.Id\]\s*>\s*(\d+)", wiql)
+        after = int(after_match.group(1)) if after_match else 0
+
+        # Değişiklik sorgusu yalnızca update() ile değiştirilenleri döndürür
+        changed_match = re.search(r"\[System\.ChangedDate\]\s*>\s*'([^']*)'", wiql)
+        if changed_match:
+            candidates = [self.changed_since(calendar.timegm(time.strptime(changed_match.group(1), '%Y-%m-%dT%H:%M:%SZ')))]
+        else:
+            candidates = [self.iteration_ids(path) for path in paths]
+
+        ids = []
+        for group in candidates:
+            for work_item_id in group:
+                if work_item_id <= after:
+                    continue
+                work_item_type = self.work_item_type(work_item_id)
+                if (types is not None and work_item_type not in types) or work_item_type == excluded:
+                    continue
+                ids.append(work_item_id)
+        ids.sort()
+        return ids
+
+    def link_query(self, wiql):
+        """WorkItemLinks (Hierarchy-Forward, MustContain) sorgusu: hedeflerin üst öğe bağlantıları"""
+        id_match = re.search(r"\[Target\]\.\[System\.Id\]\s*IN\s*\(([^)]*)\)", wiql)
+        if id_match:
+            children = [int(value) for value in re.findall(r"\d+", id_match.group(1))]
+        else:
+            children = self.query(wiql)
+        by_parent = {}
+        for child in children:
+            parent = self.parent_of(child)
+            if parent is not None:
+                by_parent.setdefault(parent, []).append(child)
+        relations = []
+        for parent in sorted(by_parent):
+            relations.append({'rel': None, 'source': None, 'target': {'id': parent}})
+            for child in by_parent[parent]:
+                relations.append({'rel': HIERARCHY_LINK, 'source': {'id': parent}, 'target': {'id': child}})
+        return relations
+
+    # Analytics özellik adı -> work item alanı
+    ANALYTICS_PROPERTIES = {
+        'Iteration/IterationPath': 'System.IterationPath',
+        'WorkItemType': 'System.WorkItemType',
+        'State': 'System.State',
+        'Activity': 'Microsoft.VSTS.Common.Activity',
+        'AssignedTo/UserName': 'System.AssignedTo',
+        'OriginalEstimate': 'Microsoft.VSTS.Scheduling.OriginalEstimate',
+        'RemainingWork': 'Microsoft.VSTS.Scheduling.RemainingWork',
+    }
+
+    def aggregate(self, apply):
+        """Analytics OData $apply=filter(...)/groupby((...), aggregate(...)) alt kümesini değerlendir"""
+        paths = [value.replace("''", "'") for value in re.findall(r"Iteration/IterationPath eq '((?:[^']|'')*)'", apply)]
+        types = set(re.findall(r"WorkItemType eq '([^']*)'", apply)) or None
+        group_match = re.search(r"groupby\(\(([^)]*)\)", apply)
+        group_by = [name.strip() for name in group_match.group(1).split(',')] if group_match else []
+        sums = re.findall(r"(\w+) with sum as (\w+)", apply)
+        count_match = re.search(r"\$count as (\w+)", apply)
+
+        groups = {}
+        for path in paths:
+            for work_item_id in self.iteration_ids(path):
+                if types is not None and self.work_item_type(work_item_id) not in types:
+                    continue
+                fields = self.work_item(work_item_id)['fields']
+                key = []
+                for name in group_by:
+                    value = fields.get(self.ANALYTICS_PROPERTIES[name])
+                    key.append(value['displayName'] if isinstance(value, dict) else value)
+                totals = groups.setdefault(tuple(key), [0.0] * len(sums) + [0])
+                for i, (source, _) in enumerate(sums):
+                    totals[i] += fields.get(self.ANALYTICS_PROPERTIES[source]) or 0.0
+                totals[-1] += 1
+
+        rows = []
+        for key, totals in groups.items():
+            row = {}
+            for name, value in zip(group_by, key):
+                # Navigation özellikleri iç içe nesne olarak döner: {"Iteration": {"IterationPath": ...}}
+                if '/' in name:
+                    parent, child = name.split('/', 1)
+                    row.setdefault(parent, {})[child] = value
+                else:
+                    row[name] = value
+            for i, (_, alias) in enumerate(sums):
+                row[alias] = totals[i]
+            if count_match:
+                row[count_match.group(1)] = totals[-1]
+            rows.append(row)
+        return rows
+
+class MockState:
+    """Sunucu ayarları ve istatistikleri (istek sayısı, gönderilen byte)"""
+
+    def __init__(self, data, latency=0.0, rate_limit=0.0):
+        self.data = data
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.lock = threading.Lock()
+        self.tokens = max(1.0, rate_limit)
+        self.updated = time.monotonic()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.stats = {'requests': 0, 'bytes_sent': 0, 'throttled': 0, 'endpoints': {}}
+
+    def record(self, endpoint, size):
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['bytes_sent'] += size
+            self.stats['endpoints'][endpoint] = self.stats['endpoints'].get(endpoint, 0) + 1
+
+    def should_throttle(self):
+        """Sunucu tarafı token bucket; boşsa 429 için beklenecek süreyi döndür"""
+        if self.rate_limit <= 0:
+            return None
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(max(1.0, self.rate_limit), self.tokens + (now - self.updated) * self.rate_limit)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return None
+            self.stats['throttled'] += 1
+            return (1 - self.tokens) / self.rate_limit
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None  # make_server tarafından atanır
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, endpoint, payload, status=200, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        if endpoint:
+            self.state.record(endpoint, len(body))
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length)) if length else {}
+
+    def parse(self):
+        parsed = urlparse(self.path)
+        return unquote(parsed.path), parse_qs(parsed.query)
+
+    def before_request(self):
+        """Gecikme ve throttling uygula; istek reddedildiyse True döndür"""
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        retry_after = self.state.should_throttle()
+        if retry_after is not None:
+            self.send_json('throttled', {'message': 'Request was blocked due to exceeding usage of resource'},
+                           status=429, headers={'Retry-After': str(max(1, round(retry_after)))})
+            return True
+        return False
+
+    def team_from_path(self, path):
+        parts = path.strip('/').split('/')
+        # /{org}/{project}/{team}/_apis/work/...
+        return self.state.data.team_index(parts[2]) if len(parts) > 2 else None
+
+    def do_GET(self):
+        path, query = self.parse()
+        if path == '/_mock/stats':
+            return self.send_json(None, self.state.stats)
+        if self.before_request():
+            return
+        data = self.state.data
+
+        if path.endswith('/_apis/projects'):
+            return self.send_json('projects', {'count': 1, 'value': [{'name': data.project}]})
+
+        if path.endswith('/_apis/teams'):
+            top = int(query.get('$top', ['100'])[0])
+            skip = int(query.get('$skip', ['0'])[0])
+            teams = [{'name': name, 'projectName': data.project} for name in data.team_names[skip:skip + top]]
+            return self.send_json('teams', {'count': len(teams), 'value': teams})
+
+        match = re.search(r'/teamsettings/iterations/it-(\d+)-(\d+)/capacities$', path)
+        if match:
+            team, sprint = int(match.group(1)) - 1, int(match.group(2)) - FIRST_SPRINT
+            if sprint in data.unavailable_sprints:
+                return self.send_json('capacities', {'message': 'Service Unavailable'}, status=503)
+            return self.send_json('capacities', data.capacities(team, sprint))
+
+        match = re.search(r'/teamsettings/iterations/it-(\d+)-(\d+)/teamdaysoff$', path)
+        if match:
+            team, sprint = int(match.group(1)) - 1, int(match.group(2)) - FIRST_SPRINT
+            return self.send_json('teamdaysoff', {'daysOff': data.team_days_off(team, sprint)})
+
+        if path.endswith('/_apis/work/teamsettings'):
+            return self.send_json('teamsettings', {'workingDays': ['monday', 'tuesday', 'wednesday', 'thursday', 'friday']})
+
+        if path.endswith('/teamsettings/iterations'):
+            team = self.team_from_path(path)
+            if team is None:
+                return self.send_json('not-found', {'message': 'Team not found'}, status=404)
+            return self.send_json('iterations', {'count': data.sprints, 'value': data.iterations(team)})
+
+        if path.endswith('/_odata/v4.0-preview/WorkItems'):
+            rows = data.aggregate(query.get('$apply', [''])[0])
+            return self.send_json('analytics', {'@odata.context': 'mock', 'value': rows})
+
+        if path.endswith('/_apis/wit/reporting/workitemrevisions'):
+            feed = data.revision_feed()
+            token = int(query.get('continuationToken', ['0'])[0] or 0)
+            start = max(0, token - data.revision_overlap)
+            end = min(len(feed), token + int(query.get('$maxPageSize', ['1000'])[0]))
+            return self.send_json('workitemrevisions', {
+                'values': [data.revision(*entry) for entry in feed[start:end]],
+                'continuationToken': str(end),
+                'isLastBatch': end >= len(feed),
+            })
+
+        if path.endswith('/_apis/wit/workitems'):
+            ids = [int(value) for value in query.get('ids', [''])[0].split(',') if value]
+            fields = query.get('fields', [''])[0].split(',') if 'fields' in query else None
+            items = [item for item in (data.work_item(i, fields) for i in ids) if item]
+            return self.send_json('workitems', {'count': len(items), 'value': items})
+
+        self.send_json('not-found', {'message': f"Unknown endpoint: {path}"}, status=404)
+
+    def do_POST(self):
+        path, query = self.parse()
+        body = self.read_body()
+        if path == '/_mock/reset':
+            self.state.reset_stats()
+            return self.send_json(None, {})
+        if self.before_request():
+            return
+        data = self.state.data
+
+        if path.endswith('/_apis/wit/wiql') and 'FROM WorkItemLinks' in body.get('query', ''):
+            relations = data.link_query(body['query'])
+            if len(relations) > WIQL_RESULT_LIMIT:
+                return self.send_json('wiql-links', WIQL_LIMIT_ERROR, status=400)
+            return self.send_json('wiql-links', {'queryType': 'oneHop', 'workItemRelations': relations})
+
+        if path.endswith('/_apis/wit/wiql'):
+            ids = data.query(body.get('query', ''))
+            top = query.get('$top')
+            if top:
+                ids = ids[:int(top[0])]
+            if len(ids) > WIQL_RESULT_LIMIT:
+                return self.send_json('wiql', WIQL_LIMIT_ERROR, status=400)
+            return self.send_json('wiql', {'queryType': 'flat', 'workItems': [{'id': i} for i in ids]})
+
+        if path.endswith('/_apis/wit/workitemsbatch'):
+            fields = body.get('fields')
+            items = [item for item in (data.work_item(i, fields) for i in body.get('ids', [])) if item]
+            return self.send_json('workitemsbatch', {'count': len(items), 'value': items})
+
+        self.send_json('not-found', {'message': f"Unknown endpoint: {path}"}, status=404)
+
+
+def make_server(data, host='127.0.0.1', port=0, latency=0.0, rate_limit=0.0):
+    """Sunucuyu oluştur (henüz başlatmadan); port=0 ise boş bir port seçilir"""
+    handler = type('BoundMockHandler', (MockHandler,), {'state': MockState(data, latency, rate_limit)})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_server(data, **kwargs):
+    """Sunucuyu arka plan iş parçacığında başlat, (server, base_url) döndür"""
+    server = make_server(data, **kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def add_data_arguments(parser):
+    parser.add_argument('--teams', type=int, default=1, help='Number of teams')
+    parser.add_argument('--sprints', type=int, default=20, help='Sprints per team')
+    parser.add_argument('--tasks', type=int, default=500, help='Tasks per sprint')
+    parser.add_argument('--members', type=int, default=8, help='Members per team')
+    parser.add_argument('--non-task-ratio', type=float, default=0.0,
+                        help='Extra Bugs/PBIs per sprint, as a fraction of --tasks')
+    parser.add_argument('--latency', type=float, default=0.0, help='Added latency per request (ms)')
+    parser.add_argument('--rate-limit', type=float, default=0.0,
+                        help='Server-side requests/second before answering 429 (0 = unlimited)')
+
+
+def data_from_args(args):
+    return SyntheticData(teams=args.teams, sprints=args.sprints, tasks=args.tasks,
+                         members=args.members, non_task_ratio=args.non_task_ratio)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Local mock Azure DevOps server')
+    add_data_arguments(parser)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    server = make_server(data_from_args(args), args.host, args.port,
+                         latency=args.latency / 1000.0, rate_limit=args.rate_limit)
+    print(f"🚀 Mock Azure DevOps: http://{args.host}:{args.port}  (organization: any, project: Proj, team: Team 1..{args.teams})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
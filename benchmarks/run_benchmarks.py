@@ -0,0 +1,210 @@
+"""azure.py için performans ölçüm düzeneği.
+
+Yerel mock Azure DevOps sunucusunu (mock_server.py) sentetik veriyle başlatır,
+azure.py'yi her rapor türü için ayrı bir süreçte çalıştırır ve şunları ölçer:
+duvar saati süresi, istek sayısı, aktarılan byte ve en yüksek bellek (RSS).
+
+Örnek:
+    python benchmarks/run_benchmarks.py --sprints 100 --tasks 2000 --range 1-30 --jobs 8
+    python benchmarks/run_benchmarks.py --latency 50 --rate-limit 200 --reports default,all
+    python benchmarks/run_benchmarks.py --json sonuc.json -- --no-store
+    python benchmarks/run_benchmarks.py --compare-engines --sprints 6 --tasks 300 --non-task-ratio 0.2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from mock_server import add_data_arguments, data_from_args, start_server
+
+AZURE_SCRIPT = Path(__file__).resolve().parent.parent / 'azure.py'
+
+
+def write_config(directory, base_url, team, cache_dir):
+    """Mock sunucuya işaret eden geçici config.ini yaz"""
+    config_path = Path(directory) / 'config.ini'
+    config_path.write_text(f"""[Azure]
+organization = benchmark
+project = Proj
+team = {team}
+server_url = {base_url}
+pat = benchmark-pat
+
+[Analysis]
+working_days = 9
+
+[Cache]
+directory = {cache_dir}
+""", encoding='utf-8')
+    return config_path
+
+
+def mock_request(base_url, path, method='GET'):
+    request = urllib.request.Request(f"{base_url}{path}", method=method, data=b'{}' if method == 'POST' else None,
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as res:
+        return json.loads(res.read())
+
+
+def run_once(base_url, config_path, sprint_range, report, jobs, extra_args):
+    """azure.py'yi bir kez çalıştır; süre, bellek ve sunucu istatistiklerini döndür"""
+    mock_request(base_url, '/_mock/reset', 'POST')
+    command = [sys.executable, str(AZURE_SCRIPT), sprint_range, '--report', report, '--jobs', str(jobs)] + extra_args
+    env = dict(os.environ, AZURE_CONFIG=str(config_path))
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    # wait4 sadece bu sürecin kaynak kullanımını verir (ru_maxrss Linux'ta KB)
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - started
+    stderr = process.stderr.read().decode(errors='replace')
+    process.stderr.close()
+
+    stats = mock_request(base_url, '/_mock/stats')
+    peak_kb = usage.ru_maxrss if sys.platform != 'darwin' else usage.ru_maxrss / 1024
+    return {
+        'report': report,
+        'exit_code': os.waitstatus_to_exitcode(status),
+        'wall_seconds': round(wall, 3),
+        'cpu_seconds': round(usage.ru_utime + usage.ru_stime, 3),
+        'requests': stats['requests'],
+        'throttled': stats['throttled'],
+        'bytes': stats['bytes_sent'],
+        'peak_rss_mb': round(peak_kb / 1024, 1),
+        'endpoints': stats['endpoints'],
+        'stderr': stderr.strip().splitlines()[-1] if stderr.strip() else '',
+    }
+
+
+ENGINE_REPORTS = ['default', 'capacity', 'workitem-types']
+
+
+def load_tables(output_dir):
+    """--output json ile yazılmış tabloları {tablo adı: satırlar} olarak oku"""
+    return {path.stem: json.loads(path.read_text(encoding='utf-8')) for path in sorted(Path(output_dir).glob('*.json'))}
+
+
+def run_tables(config_path, sprint_range, args, output_dir):
+    """azure.py'yi çalıştırıp yazdığı sonuç tablolarını döndür"""
+    command = [sys.executable, str(AZURE_SCRIPT), sprint_range, '--output', 'json', '--output-dir', str(output_dir)] + args
+    result = subprocess.run(command, env=dict(os.environ, AZURE_CONFIG=str(config_path)),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"azure.py {' '.join(args)} çıkış kodu {result.returncode}: {result.stderr.strip()[-500:]}")
+    return load_tables(output_dir)
+
+
+def table_differences(name, expected, actual):
+    """İki tablonun (satır sırasından bağımsız, saatler 0.01 hassasiyetle) farklarını listele"""
+    def normalize(rows):
+        return sorted(tuple((key, round(value, 2) if isinstance(value, float) else value) for key, value in row.items())
+                      for row in rows)
+    expected, actual = normalize(expected), normalize(actual)
+    if expected == actual:
+        return []
+    missing = [row for row in expected if row not in actual]
+    extra = [row for row in actual if row not in expected]
+    return [f"{name}: rest'te olup analytics'te olmayan satır: {dict(row)}" for row in missing[:5]] + \
+           [f"{name}: analytics'te olup rest'te olmayan satır: {dict(row)}" for row in extra[:5]]
+
+
+def compare_engines(base_url, workdir, sprint_range, team='Team 1', reports=ENGINE_REPORTS):
+    """Her rapor için --engine rest ve --engine analytics tablolarını karşılaştır; farkları döndür"""
+    differences = []
+    for report in reports:
+        tables = {}
+        for engine in ('rest', 'analytics'):
+            directory = Path(workdir) / f"{report}-{engine}"
+            directory.mkdir(parents=True, exist_ok=True)
+            config_path = write_config(directory, base_url, team, directory / 'cache')
+            tables[engine] = run_tables(config_path, sprint_range,
+                                        ['--report', report, '--engine', engine, '--no-store'], directory / 'out')
+        if not tables['rest']:
+            differences.append(f"{report}: sonuç tablosu üretilmedi")
+        if sorted(tables['rest']) != sorted(tables['analytics']):
+            differences.append(f"{report}: tablo adları farklı: {sorted(tables['rest'])} / {sorted(tables['analytics'])}")
+        for name in sorted(set(tables['rest']) & set(tables['analytics'])):
+            differences.extend(table_differences(name, tables['rest'][name], tables['analytics'][name]))
+    return differences
+
+
+def print_results(results):
+    print(f"\n{'Rapor':<16}{'Süre (s)':>10}{'CPU (s)':>10}{'İstek':>8}{'429':>6}{'MB':>10}{'Peak RSS (MB)':>15}{'Çıkış':>7}")
+    print("-" * 82)
+    for result in results:
+        print(f"{result['report']:<16}{result['wall_seconds']:>10.2f}{result['cpu_seconds']:>10.2f}"
+              f"{result['requests']:>8}{result['throttled']:>6}{result['bytes'] / 1e6:>10.2f}"
+              f"{result['peak_rss_mb']:>15.1f}{result['exit_code']:>7}")
+        if result['exit_code'] not in (0,) and result['stderr']:
+            print(f"    ⚠️ {result['stderr']}")
+    print()
+    for result in results:
+        endpoints = ', '.join(f"{name}={count}" for name, count in sorted(result['endpoints'].items()))
+        print(f"{result['report']:<16}{endpoints}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark azure.py against a local mock Azure DevOps server',
+        epilog='Arguments after "--" are passed to azure.py unchanged.')
+    add_data_arguments(parser)
+    parser.add_argument('--team', default='Team 1', help='Team analyzed by azure.py')
+    parser.add_argument('--range', default=None, help='Sprint range passed to azure.py (default: all sprints)')
+    parser.add_argument('--reports', default='default,capacity,all',
+                        help='Comma-separated report types to measure')
+    parser.add_argument('--jobs', type=int, default=4, help='--jobs passed to azure.py')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per report; the fastest is reported')
+    parser.add_argument('--warm', action='store_true',
+                        help='Keep caches between runs (measures incremental/cached runs)')
+    parser.add_argument('--json', metavar='FILE', help='Also write results as JSON')
+    parser.add_argument('--compare-engines', action='store_true',
+                        help='Instead of timing, check that --engine rest and --engine analytics produce '
+                             f"identical result tables ({', '.join(ENGINE_REPORTS)}); exits 1 on any difference")
+    argv = sys.argv[1:]
+    extra_args = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, extra_args = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    data = data_from_args(args)
+    sprint_range = args.range or f"1-{args.sprints}"
+    server, base_url = start_server(data, latency=args.latency / 1000.0, rate_limit=args.rate_limit)
+    print(f"🚀 Mock sunucu: {base_url}  ({args.teams} takım x {args.sprints} sprint x {args.tasks} task)")
+    if args.compare_engines:
+        print(f"🔍 --engine rest / analytics karşılaştırılıyor ({', '.join(ENGINE_REPORTS)})...")
+        with tempfile.TemporaryDirectory() as workdir:
+            differences = compare_engines(base_url, workdir, sprint_range, args.team)
+        server.shutdown()
+        for difference in differences:
+            print(f"❌ {difference}")
+        if differences:
+            sys.exit(1)
+        print("✅ Tüm sonuç tabloları aynı")
+        sys.exit(0)
+
+    print(f"📋 azure.py {sprint_range} --jobs {args.jobs} {' '.join(extra_args)}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for report in [name.strip() for name in args.reports.split(',') if name.strip()]:
+            runs = []
+            for _ in range(max(1, args.repeat)):
+                cache_dir = Path(workdir) / ('cache' if args.warm else f"cache-{report}-{len(runs)}")
+                config_path = write_config(workdir, base_url, args.team, cache_dir)
+                runs.append(run_once(base_url, config_path, sprint_range, report, args.jobs, extra_args))
+            results.append(min(runs, key=lambda run: run['wall_seconds']))
+            print(f"✅ {report}: {results[-1]['wall_seconds']:.2f}s")
+
+    server.shutdown()
+    print_results(results)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'scenario': vars(args), 'extra_args': extra_args, 'results': results}, f, indent=2)
+        print(f"\n💾 Sonuçlar yazıldı: {args.json}")
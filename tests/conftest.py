@@ -0,0 +1,82 @@
+"""Testler için ortak düzenek: süreç içi mock Azure DevOps sunucusu ve azure.py çalıştırıcısı."""
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+from mock_server import SyntheticData, start_server  # noqa: E402
+from run_benchmarks import AZURE_SCRIPT, write_config  # noqa: E402
+
+
+@pytest.fixture
+def mock_server():
+    """Verilen (ya da seçeneklerle üretilen) sentetik veriyle mock sunucuyu başlat; base_url döndüren fabrika"""
+    servers = []
+
+    def start(data=None, **data_options):
+        server, base_url = start_server(data or SyntheticData(**data_options))
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+@pytest.fixture
+def configured(tmp_path, monkeypatch):
+    """azure modülünü süreç içinde mock sunucuya karşı yapılandıran fabrika.
+
+    Modül düzeyindeki ayarlar, istemci ve takım kapsamı test sonunda eski
+    (yapılandırılmamış) haline döner.
+    """
+    import azure
+
+    def configure(base_url, cache='cache', **config_args):
+        config_path = write_config(tmp_path, base_url, 'Team 1', tmp_path / cache)
+        monkeypatch.setenv('AZURE_CONFIG', str(config_path))
+        for name in ['settings', 'organization_encoded', 'base_url', 'client']:
+            monkeypatch.setattr(azure, name, azure.Unconfigured(name))
+        monkeypatch.setattr(azure, '_work_item_stores', {})
+        monkeypatch.setattr(azure, '_burndown_stores', {})
+        monkeypatch.setattr(azure, '_default_scope', None)
+        azure.configure(**config_args)
+        return azure
+
+    return configure
+
+
+@pytest.fixture
+def run_azure(tmp_path):
+    """azure.py'yi mock sunucuya karşı ayrı bir süreçte çalıştır.
+
+    `tables` verilirse tablolar JSON olarak yazılır ve {tablo adı: satırlar}
+    döndürülür; aksi halde tamamlanmış süreç (stdout/stderr ile) döndürülür.
+    `pat=False` ise ne config'de ne ortamda PAT bulunur.
+    """
+    def run(base_url, *args, cache='cache', tables=False, pat=True):
+        config_path = write_config(tmp_path, base_url, 'Team 1', tmp_path / cache)
+        env = dict(os.environ, AZURE_CONFIG=str(config_path))
+        if not pat:
+            config_path.write_text(re.sub(r'^pat = .*\n', '', config_path.read_text(encoding='utf-8'), flags=re.M),
+                                   encoding='utf-8')
+            env.pop('AZURE_PAT', None)
+        command = [sys.executable, str(AZURE_SCRIPT), *args]
+        output_dir = tmp_path / f"out-{len(list(tmp_path.glob('out-*')))}"
+        if tables:
+            command += ['--output', 'json', '--output-dir', str(output_dir)]
+        result = subprocess.run(command, env=env, capture_output=True, text=True, timeout=300)
+        assert result.returncode == 0, result.stdout[-2000:] + result.stderr[-2000:]
+        if not tables:
+            return result
+        return {path.stem: json.loads(path.read_text(encoding='utf-8')) for path in output_dir.glob('*.json')}
+
+    return run
@@ -0,0 +1,56 @@
+"""Burndown özeti: devam jetonundan artımlı eşitleme, sayfa sınırında tekrar gelen revizyonlar ve --refresh."""
+import time
+
+from mock_server import SPRINT_DAYS, SyntheticData
+from run_benchmarks import mock_request
+
+DAY = 86400
+REMAINING = 'Microsoft.VSTS.Scheduling.RemainingWork'
+
+
+def current_sprint_data():
+    """Sprint 2 bugünü kapsayacak şekilde tarihlenmiş veri; revizyon akışı birden çok sayfa tutar"""
+    today = int(time.time() // DAY) * DAY
+    data = SyntheticData(sprints=3, tasks=200, first_day=today - (SPRINT_DAYS + 3) * DAY)
+    # Her sayfa önceki sayfanın son revizyonlarını tekrar döndürür
+    data.revision_overlap = 200
+    return data
+
+
+def burndown(run_azure, base_url, *args, cache='cache'):
+    tables = run_azure(base_url, '1-3', '--report', 'burndown', *args, cache=cache, tables=True)
+    return sorted(map(str, tables['burndown']))
+
+
+def revision_pages(base_url, run):
+    mock_request(base_url, '/_mock/reset', 'POST')
+    result = run()
+    return result, mock_request(base_url, '/_mock/stats')['endpoints']['workitemrevisions']
+
+
+def test_incremental_burndown_matches_full_replay(mock_server, run_azure):
+    data = current_sprint_data()
+    base_url = mock_server(data)
+    before, pages = revision_pages(base_url, lambda: burndown(run_azure, base_url))
+    assert pages > 1
+    # Tekrar gelen revizyonlar iki kez sayılmaz: tekrarsız akışın tam okunmasıyla aynı
+    data.revision_overlap = 0
+    assert before == burndown(run_azure, base_url, '--no-store')
+    data.revision_overlap = 200
+
+    # Çalıştırmalar arasında akışa yeni revizyonlar eklenir
+    tasks = [work_item_id for work_item_id in data.ids_for(0, 1) if data.work_item_type(work_item_id) == 'Task']
+    data.update(tasks[0], {REMAINING: 0.0, 'System.State': 'Closed'})
+    data.update(tasks[1], {REMAINING: 30.0, 'Microsoft.VSTS.Common.Activity': 'Testing'})
+    data.update(tasks[2], {'System.IterationPath': data.iteration_path(0, 2)})
+    data.update(tasks[0], {REMAINING: 5.0, 'System.State': 'Active'})
+
+    incremental, pages = revision_pages(base_url, lambda: burndown(run_azure, base_url))
+    # Devam jetonundan yalnızca yeni revizyonlar okunur
+    assert pages == 1
+    assert incremental != before
+
+    replay, pages = revision_pages(base_url, lambda: burndown(run_azure, base_url, '--refresh'))
+    assert pages > 1
+    assert incremental == replay
+    assert incremental == burndown(run_azure, base_url, '--no-store', cache='fresh')
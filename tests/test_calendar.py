@@ -0,0 +1,77 @@
+"""İş günü takvimi: kümülatif indeks, takım / üye izinleri ve working_days'e geri dönüş (gün gün döngüyle karşılaştırma)."""
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import azure
+
+
+def naive_days(start, finish, working_weekdays, *days_off_lists):
+    """start..finish arasındaki, hiçbir izin kaydına düşmeyen iş günleri (gün gün)"""
+    off = set()
+    for days_off in days_off_lists:
+        for entry in days_off:
+            first, last = azure.parse_day(entry.get("start")), azure.parse_day(entry.get("end"))
+            if first is None or last is None:
+                continue
+            off.update(first + timedelta(days=n) for n in range((last - first).days + 1))
+    days = [start + timedelta(days=n) for n in range((finish - start).days + 1)]
+    return sum(1 for day in days if day.weekday() in working_weekdays and day not in off)
+
+
+def random_days_off(rng, around, count):
+    """Sprintle çakışan, taşan, iç içe geçen ve bozuk (tarihsiz / ters) izin kayıtları"""
+    entries = []
+    for _ in range(count):
+        first = around + timedelta(days=rng.randint(-10, 30))
+        last = first + timedelta(days=rng.randint(-2, 9))
+        entries.append({"start": f"{first.isoformat()}T00:00:00Z", "end": f"{last.isoformat()}T00:00:00Z"})
+    if rng.random() < 0.3:
+        entries.append({"start": None, "end": f"{around.isoformat()}T00:00:00Z"})
+    return entries
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_business_days_match_day_loop(seed):
+    rng = random.Random(seed)
+    working_weekdays = set(rng.sample(range(7), rng.randint(1, 7)))
+    calendar = azure.WorkCalendar(working_weekdays)
+    for _ in range(25):
+        # Kapsam dışı tarihler dizinin genişletilmesini de sınar
+        start = date(2020, 1, 1) + timedelta(days=rng.randint(0, 3000))
+        finish = start + timedelta(days=rng.randint(-3, 800))
+        assert calendar.business_days(start, finish) == naive_days(start, finish, working_weekdays)
+
+
+@pytest.mark.parametrize('seed', range(60))
+def test_sprint_member_days_match_day_loop(seed):
+    rng = random.Random(seed)
+    working_weekdays = {0, 1, 2, 3, 4} if seed % 3 else set(rng.sample(range(7), rng.randint(1, 6)))
+    calendar = azure.WorkCalendar(working_weekdays)
+    start = date(2026, 1, 1) + timedelta(days=rng.randint(0, 400))
+    finish = start + timedelta(days=rng.randint(0, 27))
+    team_days_off = random_days_off(rng, start, rng.randint(0, 3))
+    sprint = calendar.sprint(start, finish, team_days_off)
+    assert sprint.working_days == naive_days(start, finish, working_weekdays, team_days_off)
+    for _ in range(10):
+        days_off = random_days_off(rng, start, rng.randint(0, 4))
+        assert sprint.member_days(days_off) == naive_days(start, finish, working_weekdays, team_days_off, days_off)
+
+
+def test_undated_sprint_falls_back_to_working_days(configured):
+    configured('http://127.0.0.1:9')  # ayarlar yüklenir; ağa çıkılmaz
+    members = [{
+        "teamMember": {"displayName": "Ada"},
+        "activities": [{"name": "Development", "capacityPerDay": 6}],
+        "daysOff": [{"start": "2026-01-05T00:00:00Z", "end": "2026-01-07T00:00:00Z"}],
+    }]
+    iteration = {'id': 'it', 'name': 'Sprint 1', 'path': 'Proj\\Sprint 1', 'startDate': None, 'finishDate': None}
+    snapshot = azure.SprintSnapshot('Sprint 1', iteration, members)
+    # Takvim yoksa config'deki sabit working_days (9) kullanılır, izinler düşülmez
+    assert snapshot.members_capacity() == {"Ada": {"Development": 54}}
+    assert snapshot.capacity_by_activity() == {"Development": 54}
+
+    calendar = azure.WorkCalendar().sprint(date(2026, 1, 5), date(2026, 1, 16))
+    dated = azure.SprintSnapshot('Sprint 1', iteration, members, calendar=calendar)
+    assert dated.members_capacity() == {"Ada": {"Development": 6 * (10 - 3)}}
@@ -0,0 +1,14 @@
+"""Analytics motoru, REST yolu ile aynı sonuç tablolarını üretmeli."""
+from run_benchmarks import ENGINE_REPORTS, compare_engines, table_differences
+
+
+def test_analytics_engine_matches_rest(mock_server, tmp_path):
+    base_url = mock_server(sprints=4, tasks=300, non_task_ratio=0.2)
+    assert compare_engines(base_url, tmp_path, '1-4', reports=ENGINE_REPORTS) == []
+
+
+def test_table_differences_reports_changed_rows():
+    rows = [{'sprint': 'Sprint 1', 'activity': 'Testing', 'planned_hours': 12.0}]
+    changed = [{'sprint': 'Sprint 1', 'activity': 'Testing', 'planned_hours': 12.5}]
+    assert table_differences('sprint_activity', rows, list(reversed(rows))) == []
+    assert len(table_differences('sprint_activity', rows, changed)) == 2
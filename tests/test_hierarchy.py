@@ -0,0 +1,30 @@
+"""Hiyerarşi raporu: Task saatleri sprint snapshot'larından alınır."""
+import pytest
+
+from run_benchmarks import mock_request
+
+
+def endpoint_counts(base_url, run):
+    mock_request(base_url, '/_mock/reset', 'POST')
+    run()
+    return mock_request(base_url, '/_mock/stats')['endpoints']
+
+
+@pytest.mark.parametrize('store', [False, True])
+def test_hierarchy_fetches_only_links_and_parents(mock_server, run_azure, store):
+    base_url = mock_server(sprints=3, tasks=300, non_task_ratio=0.2)
+    options = [] if store else ['--no-store']
+    run_azure(base_url, '1-3', *options)  # depo ısınsın: ikinci çalıştırmalar aynı durumdan başlar
+    default = endpoint_counts(base_url, lambda: run_azure(base_url, '1-3', *options))
+    hierarchy = endpoint_counts(base_url, lambda: run_azure(base_url, '1-3', '--report', 'hierarchy', *options))
+    # Task'lar yeniden sorgulanmaz; ek istekler yalnızca bağlantılar ve üst öğelerin başlıkları
+    assert hierarchy.get('wiql') == default.get('wiql')
+    assert hierarchy['workitemsbatch'] - default.get('workitemsbatch', 0) == 1
+    assert hierarchy['wiql-links'] >= 1
+
+
+def test_hierarchy_matches_between_engines(mock_server, run_azure):
+    base_url = mock_server(sprints=3, tasks=120)
+    rest = run_azure(base_url, '1-3', '--report', 'hierarchy', '--no-store', tables=True)
+    analytics = run_azure(base_url, '1-3', '--report', 'hierarchy', '--no-store', '--engine', 'analytics', tables=True)
+    assert rest['hierarchy'] and rest['hierarchy'] == analytics['hierarchy']
@@ -0,0 +1,20 @@
+"""main(): süreç içi komut satırı girişi ve çıkış kodları."""
+
+
+def test_main_returns_zero_and_writes_tables(mock_server, configured, tmp_path):
+    azure = configured(mock_server(sprints=3, tasks=40))
+    assert azure.main(['1-3', '--report', 'all', '--no-store', '--output', 'json',
+                       '--output-dir', str(tmp_path / 'out')]) == 0
+    assert (tmp_path / 'out' / 'sprint_activity.json').exists()
+
+
+def test_main_returns_two_for_missing_sprints(mock_server, configured, capsys):
+    azure = configured(mock_server(sprints=2, tasks=20))
+    assert azure.main(['2-3', '--no-store']) == 2
+    assert 'Sprint 3' in capsys.readouterr().out
+
+
+def test_main_returns_one_when_unreachable(configured):
+    azure = configured('http://127.0.0.1:9')
+    azure.client.max_retries = 0
+    assert azure.main(['1', '--no-store']) == 1
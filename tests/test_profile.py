@@ -0,0 +1,25 @@
+"""--profile: aşama olaylarının sprintlere dağıtılması."""
+import json
+
+import pytest
+
+
+@pytest.mark.parametrize('store', [False, True])
+def test_profile_attributes_batched_work_to_sprints(mock_server, run_azure, tmp_path, store):
+    base_url = mock_server(sprints=4, tasks=450)
+    trace_path = tmp_path / 'trace.json'
+    result = run_azure(base_url, '1-4', '--jobs', '3', '--profile-output', str(trace_path),
+                       *([] if store else ['--no-store']))
+    assert 'Sprint bazında' in result.stdout
+
+    trace = json.loads(trace_path.read_text(encoding='utf-8'))
+    events = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    by_sprint = trace['otherData']['sprints']
+    assert sorted(by_sprint) == [f"Sprint {n}" for n in range(1, 5)]
+    # Aralığın toplu sorgusu ve havuzdaki workitemsbatch parçaları dört sprinte bölünür
+    batch = [event for event in events if event['name'] == 'workitems_batch']
+    assert len(batch) > 1
+    assert all(sorted(event['args']['sprints']) == sorted(by_sprint) for event in batch)
+    for name in ['sprint_range', 'workitems_batch', 'capacity']:
+        total = sum(event['dur'] for event in events if event['name'] == name) / 1e6
+        assert sum(phases.get(name, 0.0) for phases in by_sprint.values()) == pytest.approx(total, abs=1e-5)
@@ -0,0 +1,133 @@
+"""MinCostFlow ve RebalancePlan: referans çözücüyle karşılaştırma ve kapasite değişmezleri."""
+import random
+
+import pytest
+
+import azure
+
+ACTIVITIES = ['Development', 'Testing', 'Design']
+
+
+def reference_min_cost_flow(size, edges, source, sink):
+    """Bellman-Ford ile ardışık en kısa yol: (akış, maliyet)"""
+    graph = [[] for _ in range(size)]
+    residual = []
+    for u, v, capacity, cost in edges:
+        graph[u].append(len(residual))
+        residual.append([v, capacity, cost])
+        graph[v].append(len(residual))
+        residual.append([u, 0, -cost])
+    total_flow = total_cost = 0
+    while True:
+        distance = [float('inf')] * size
+        distance[source] = 0
+        previous = [-1] * size
+        for _ in range(size):
+            changed = False
+            for u in range(size):
+                if distance[u] == float('inf'):
+                    continue
+                for edge in graph[u]:
+                    v, capacity, cost = residual[edge]
+                    if capacity > 0 and distance[u] + cost < distance[v]:
+                        distance[v] = distance[u] + cost
+                        previous[v] = edge
+                        changed = True
+            if not changed:
+                break
+        if distance[sink] == float('inf'):
+            return total_flow, total_cost
+        pushed, node = float('inf'), sink
+        while node != source:
+            edge = previous[node]
+            pushed = min(pushed, residual[edge][1])
+            node = residual[edge ^ 1][0]
+        node = sink
+        while node != source:
+            edge = previous[node]
+            residual[edge][1] -= pushed
+            residual[edge ^ 1][1] += pushed
+            node = residual[edge ^ 1][0]
+        total_flow += pushed
+        total_cost += pushed * distance[sink]
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_min_cost_flow_matches_reference(seed):
+    rng = random.Random(seed)
+    size = rng.randint(2, 9)
+    edges = [(rng.randrange(size), rng.randrange(size), rng.randint(0, 9), rng.randint(0, 6))
+             for _ in range(rng.randint(1, 25))]
+    edges = [edge for edge in edges if edge[0] != edge[1]]
+    network = azure.MinCostFlow(size)
+    for edge in edges:
+        network.add_edge(*edge)
+    result = network.solve(0, size - 1)
+    assert result == reference_min_cost_flow(size, edges, 0, size - 1)
+    # Yol ayrıştırması tüm akışı kapsar
+    assert sum(flow for _, flow in network.paths(0, size - 1)) == result[0]
+
+
+def random_plan(rng, sprints, members):
+    """Tam saatlik kapasite / planlanan değerleriyle rastgele kişi x aktivite x sprint planı"""
+    plan = azure.RebalancePlan()
+    plan.sprints = [f"Sprint {n + 1}" for n in range(sprints)]
+    plan.sprint_index = {name: n for n, name in enumerate(plan.sprints)}
+    for sprint in range(sprints):
+        for member in range(members):
+            for activity in rng.sample(ACTIVITIES, rng.randint(1, len(ACTIVITIES))):
+                plan.cells[('', sprint, f"M{member}", activity)] = [float(rng.choice([0, 8, 16, 24, 40])),
+                                                                    float(rng.randint(0, 40))]
+        plan.cells[('', sprint, 'Unassigned', rng.choice(ACTIVITIES))] = [0.0, float(rng.randint(0, 20))]
+    return plan
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_rebalance_respects_capacities(seed):
+    rng = random.Random(seed)
+    plan = random_plan(rng, sprints=rng.randint(1, 4), members=rng.randint(2, 6))
+    moves = plan.solve()
+
+    planned_after = {key: planned for key, (_, planned) in plan.cells.items()}
+    member_before = {}
+    for (source, target), hours in moves.items():
+        assert hours > 0
+        # Aynı takım ve aktivite; iş yalnızca aynı ya da sonraki sprintlere gider
+        assert source[0] == target[0] and source[3] == target[3]
+        assert target[1] >= source[1]
+        planned_after[source] -= hours
+        planned_after[target] += hours
+    for key, (capacity, planned) in plan.cells.items():
+        member_before.setdefault(key[:3], [0.0, 0.0])
+        member_before[key[:3]][0] += capacity
+        member_before[key[:3]][1] += planned
+        if planned > capacity:
+            # Fazla olan hücre yalnızca iş verir, kapasitesinin altına inmez
+            assert capacity - 1e-9 <= planned_after[key] <= planned + 1e-9
+        else:
+            # Alıcı hücre kapasitesini aşmaz
+            assert planned - 1e-9 <= planned_after[key] <= capacity + 1e-9
+
+    member_after = {}
+    for key, planned in planned_after.items():
+        member_after[key[:3]] = member_after.get(key[:3], 0.0) + planned
+    for member_key, (capacity, planned) in member_before.items():
+        # İş alan kişi sprint toplamında da kapasitesini aşmaz
+        if member_after[member_key] > planned + 1e-9:
+            assert member_after[member_key] <= capacity + 1e-9
+    assert plan.over_allocation() - sum(moves.values()) == pytest.approx(
+        sum(max(0.0, planned_after[key] - capacity) for key, (capacity, _) in plan.cells.items()))
+
+
+def test_rebalance_prefers_reassignment_over_deferral():
+    plan = azure.RebalancePlan()
+    plan.sprints, plan.sprint_index = ['Sprint 1', 'Sprint 2'], {'Sprint 1': 0, 'Sprint 2': 1}
+    plan.cells = {
+        ('', 0, 'A', 'Testing'): [10.0, 20.0],
+        ('', 0, 'B', 'Testing'): [10.0, 4.0],
+        ('', 1, 'A', 'Testing'): [10.0, 0.0],
+    }
+    moves = plan.solve()
+    # 6 saat aynı sprintte B'ye, kalan 4 saat A'nın sonraki sprintine
+    assert moves == {(('', 0, 'A', 'Testing'), ('', 0, 'B', 'Testing')): 6.0,
+                     (('', 0, 'A', 'Testing'), ('', 1, 'A', 'Testing')): 4.0}
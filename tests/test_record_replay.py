@@ -0,0 +1,28 @@
+"""--record / --replay: kaydedilen çalıştırma, sunucu ve PAT olmadan aynı tabloları üretir."""
+import pytest
+
+from mock_server import SyntheticData, start_server
+
+REPORT_TABLES = {
+    'all': {'sprint_activity', 'member_capacity', 'trend_sprint', 'workitem_types', 'hierarchy'},
+    'burndown': {'burndown'},
+}
+
+
+@pytest.mark.parametrize('report', sorted(REPORT_TABLES))
+def test_replay_reproduces_recorded_run(run_azure, tmp_path, report):
+    server, base_url = start_server(SyntheticData(sprints=3, tasks=120, non_task_ratio=0.2))
+    recording = tmp_path / 'recording'
+    try:
+        recorded = run_azure(base_url, '1-3', '--report', report, '--jobs', '3', '--record', str(recording),
+                             cache='record', tables=True)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert any(recording.glob('*.json'))
+
+    # Sunucu kapalı ve PAT yok: her istek kayıttan karşılanmalı
+    replayed = run_azure(base_url, '1-3', '--report', report, '--jobs', '3', '--replay', str(recording),
+                         cache='replay', tables=True, pat=False)
+    assert REPORT_TABLES[report] <= set(recorded)
+    assert replayed == recorded
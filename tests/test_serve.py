@@ -0,0 +1,101 @@
+"""--serve: MetricsService tazelemeleri, /metrics ve /utilization uçları, hata ve yeni sprint durumları."""
+import json
+import threading
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from mock_server import SyntheticData
+
+SPRINTS = ['Sprint 1', 'Sprint 2', 'Sprint 3']
+ESTIMATE = 'Microsoft.VSTS.Scheduling.OriginalEstimate'
+
+
+@pytest.fixture
+def serve():
+    """Servisin HTTP işleyicisini boş bir portta başlat; base_url döndüren fabrika"""
+    servers = []
+
+    def start(service):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), service.make_handler())
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def get(url):
+    with urllib.request.urlopen(url) as res:
+        return res.read().decode('utf-8')
+
+
+def sprint_up(metrics):
+    """azure_sprint_up örnekleri: sprint -> 0/1"""
+    samples = {}
+    for line in metrics.splitlines():
+        if line.startswith('azure_sprint_up{'):
+            labels, value = line.rsplit(' ', 1)
+            samples[labels.split('sprint="')[1].split('"')[0]] = int(value)
+    return samples
+
+
+def planned_by_sprint(document):
+    return {entry['sprint']: sum(row['planned_hours'] for row in entry['activities'])
+            for entry in document['teams'][0]['sprints']}
+
+
+def add_sprint(data):
+    """Tek takımlı veriye yeni bir sprint aç (id blokları takım 0 için değişmez)"""
+    data.paths[data.iteration_path(0, data.sprints)] = (0, data.sprints)
+    data.sprints += 1
+
+
+@pytest.mark.parametrize('store', [True, False])
+def test_refresh_serves_metrics_and_follows_changes(mock_server, configured, run_azure, serve, store):
+    data = SyntheticData(sprints=2, tasks=40)
+    base_url = mock_server(data)
+    azure = configured(base_url)
+    azure.settings['work_item_store'] = store
+    azure.client.max_retries = 0
+    service = azure.MetricsService([azure.scope()], SPRINTS, jobs=2)
+    url = serve(service)
+
+    # İlk tazeleme: Sprint 3 henüz açılmamış
+    service.refresh()
+    metrics, document = get(f"{url}/metrics"), json.loads(get(f"{url}/utilization"))
+    assert sprint_up(metrics) == {'Sprint 1': 1, 'Sprint 2': 1, 'Sprint 3': 0}
+    assert 'azure_refreshes_total 1' in metrics
+    expected = run_azure(base_url, '1-2', '--no-store', cache='expected', tables=True)
+    planned = planned_by_sprint(document)
+    for sprint in ['Sprint 1', 'Sprint 2']:
+        assert planned[sprint] == sum(row['planned_hours'] for row in expected['sprint_activity']
+                                      if row['sprint'] == sprint)
+    assert document['teams'][0]['sprints'][2]['error'] and planned['Sprint 3'] == 0
+
+    # İkinci tazeleme: Sprint 3 açıldı (iterasyon listesi yeniden okunur), Sprint 2'ye erişilemiyor, bir tahmin değişti
+    add_sprint(data)
+    data.unavailable_sprints.add(1)
+    task = data.ids_for(0, 0)[0]
+    data.update(task, {ESTIMATE: data.work_item(task)['fields'][ESTIMATE] + 50})
+    service.refresh()
+    metrics, second = get(f"{url}/metrics"), json.loads(get(f"{url}/utilization"))
+    assert sprint_up(metrics) == {'Sprint 1': 1, 'Sprint 2': 0, 'Sprint 3': 1}
+    assert 'azure_refreshes_total 2' in metrics
+    after = planned_by_sprint(second)
+    assert after['Sprint 1'] == planned['Sprint 1'] + 50
+    # Erişilemeyen sprintin son başarılı verisi sunulmaya devam eder
+    sprint_2 = second['teams'][0]['sprints'][1]
+    assert sprint_2['error'] and sprint_2['activities'] == document['teams'][0]['sprints'][1]['activities']
+    assert 'azure_sprint_planned_hours{team="Proj/Team 1",sprint="Sprint 2"' in metrics
+    assert after['Sprint 3'] > 0
+
+    # Sprint 2 geri geldiğinde hata kaydı temizlenir
+    data.unavailable_sprints.clear()
+    service.refresh()
+    assert sprint_up(get(f"{url}/metrics")) == {sprint: 1 for sprint in SPRINTS}
+    assert get(f"{url}/healthz") == 'ok\n'
@@ -0,0 +1,54 @@
+"""Yerel work item deposu: çalıştırmalar arası değişiklik, tip değişikliği, taşıma ve silme."""
+import time
+
+from mock_server import SPRINT_DAYS, SyntheticData
+from run_benchmarks import mock_request
+
+DAY = 86400
+
+
+def open_sprints_data():
+    """Sprint 1 kapanmış, Sprint 2 güncel, Sprint 3 gelecekte olacak şekilde tarihlenmiş veri"""
+    today = int(time.time() // DAY) * DAY
+    return SyntheticData(sprints=3, tasks=40, first_day=today - (SPRINT_DAYS + 3) * DAY)
+
+
+def planned_by_sprint(tables):
+    totals = {}
+    for row in tables['sprint_activity']:
+        totals[row['sprint']] = totals.get(row['sprint'], 0.0) + row['planned_hours']
+    return totals
+
+
+def test_store_follows_changes_between_runs(mock_server, run_azure):
+    data = open_sprints_data()
+    base_url = mock_server(data)
+    before = run_azure(base_url, '1-3', '--report', 'all', tables=True)
+    sprint_1, sprint_2, sprint_3 = (list(data.ids_for(0, sprint)) for sprint in range(3))
+
+    estimate = 'Microsoft.VSTS.Scheduling.OriginalEstimate'
+    data.update(sprint_1[0], {estimate: 100.0})                                  # kapanmış sprintte değişiklik
+    data.update(sprint_2[1], {'System.WorkItemType': 'Bug'})                     # tipi Task olmaktan çıkar
+    data.update(sprint_2[2], {'System.IterationPath': data.iteration_path(0, 2)})  # sonraki sprinte taşınır
+    data.delete(sprint_3[3])                                                      # açık sprintte silinir
+    data.delete(sprint_1[4])                                                      # kapanmış sprintte silinir
+
+    mock_request(base_url, '/_mock/reset', 'POST')
+    run_azure(base_url, '1-3')
+    endpoints = mock_request(base_url, '/_mock/stats')['endpoints']
+    # Yalnızca değişen Task'ların alanları indirilir; sorgular: değişen Task'lar, tipi değişenler, açık sprintlerin id'leri
+    assert endpoints.get('workitemsbatch') == 1
+    assert endpoints.get('wiql') == 3
+
+    after = run_azure(base_url, '1-3', '--report', 'all', tables=True)
+    expected = run_azure(base_url, '1-3', '--report', 'all', '--no-store', cache='fresh', tables=True)
+    assert planned_by_sprint(before) != planned_by_sprint(expected)
+    closed_deleted = SyntheticData(sprints=3, tasks=40).work_item(sprint_1[4])['fields'][estimate]
+    # Kapanmış sprintteki silme bilinçli olarak sorgulanmaz; onun dışında depo güncel veriyle aynıdır
+    actual, wanted = planned_by_sprint(after), planned_by_sprint(expected)
+    assert actual['Sprint 1'] == wanted['Sprint 1'] + closed_deleted
+    assert actual['Sprint 2'] == wanted['Sprint 2']
+    assert actual['Sprint 3'] == wanted['Sprint 3']
+    for name in ['sprint_activity', 'member_capacity', 'workitem_types']:
+        rows = [row for row in after[name] if row.get('sprint') != 'Sprint 1']
+        assert sorted(map(str, rows)) == sorted(map(str, (row for row in expected[name] if row.get('sprint') != 'Sprint 1')))
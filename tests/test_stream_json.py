@@ -0,0 +1,72 @@
+"""AzureClient.iter_json_array: parça sınırları nereye düşerse düşsün json.loads ile aynı sonuç."""
+import json
+
+import pytest
+
+import azure
+
+PAYLOADS = [
+    {"count": 3, "value": [{"id": 1, "fields": {"Microsoft.VSTS.Scheduling.OriginalEstimate": 2.5}},
+                           {"id": 22, "fields": {"System.Title": "Tırnak \" ve \\ ters bölü çğüşöı"}},
+                           {"id": 333, "fields": {"System.Title": "emoji 😀 🚀", "n": -1.25e-3, "ok": True, "x": None}}]},
+    {"value": [1, -20, 3.125, 4e10, "a,b]c", [], {}, [1, [2, [3]]]], "@odata.nextLink": "https://x/?$skip=8"},
+    {"value": []},
+    {"@odata.context": "ctx", "value": [{"Activity": "UI Development", "OriginalEstimate": 12}], "tail": {"k": [1, 2]}},
+]
+
+
+class FakeResponse:
+    """Gövdeyi verilen byte parçaları halinde döndüren akışlı yanıt"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def client():
+    client = azure.AzureClient('pat')
+    client.STREAM_CHUNK_SIZE = 8  # Arabellek kırpma yolu da çalışsın
+    return client
+
+
+def decode(client, chunks):
+    rest = {}
+    res = FakeResponse(chunks)
+    values = list(client.iter_json_array(res, "value", rest))
+    assert res.closed
+    return values, rest
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+@pytest.mark.parametrize('indent', [None, 2])
+def test_split_at_every_offset(client, payload, indent):
+    body = json.dumps(payload, ensure_ascii=False, indent=indent).encode('utf-8')
+    expected = json.loads(body)
+    # Dizi dışındaki alanlar; dizinin kendisi boş liste olarak yer alır
+    expected_rest = dict(expected, value=[])
+    for offset in range(len(body) + 1):
+        values, rest = decode(client, [body[:offset], body[offset:]])
+        assert values == expected["value"], offset
+        assert rest == expected_rest, offset
+
+
+@pytest.mark.parametrize('payload', PAYLOADS)
+def test_single_byte_chunks(client, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    values, rest = decode(client, [body[i:i + 1] for i in range(len(body))])
+    assert values == payload["value"]
+
+
+def test_truncated_body_raises(client):
+    body = json.dumps(PAYLOADS[0]).encode('utf-8')
+    with pytest.raises(ValueError):
+        decode(client, [body[:len(body) // 2]])
+    with pytest.raises(ValueError):
+        decode(client, [b'{"count": 0}'])
@@ -0,0 +1,46 @@
+"""WIQL 20.000 sonuç sınırı: mock sunucu sınırı uygular, azure.py sayfalayarak altında kalır."""
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from mock_server import WIQL_RESULT_LIMIT, SyntheticData
+
+# Tek sprint aralığında 20.000'den fazla Task (3 x 7.000)
+OVER_LIMIT = dict(sprints=3, tasks=7000, members=8)
+
+
+def post_wiql(base_url, query, top=None):
+    url = f"{base_url}/org/Proj/_apis/wit/wiql?api-version=7.0" + (f"&$top={top}" if top else "")
+    request = urllib.request.Request(url, data=json.dumps({'query': query}).encode(), method='POST',
+                                     headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as res:
+        return json.loads(res.read())
+
+
+def test_mock_rejects_results_over_limit(mock_server):
+    base_url = mock_server(**OVER_LIMIT)
+    paths = ", ".join(f"'Proj\\Team 1\\Sprint {n}'" for n in (1, 2, 3))
+    query = f"SELECT [System.Id] FROM WorkItems WHERE [System.IterationPath] IN ({paths})"
+    with pytest.raises(urllib.error.HTTPError) as error:
+        post_wiql(base_url, query)
+    assert error.value.code == 400
+    assert 'VS402337' in error.value.read().decode()
+    assert len(post_wiql(base_url, query, top=WIQL_RESULT_LIMIT - 1)['workItems']) == WIQL_RESULT_LIMIT - 1
+
+
+def expected_task_hours(data, sprints):
+    return sum(data.work_item(work_item_id)['fields']['Microsoft.VSTS.Scheduling.OriginalEstimate']
+               for sprint in sprints for work_item_id in data.ids_for(0, sprint)
+               if data.work_item_type(work_item_id) == 'Task')
+
+
+@pytest.mark.parametrize('store', [False, True])
+def test_range_over_limit_is_paged(mock_server, run_azure, store):
+    base_url = mock_server(**OVER_LIMIT)
+    args = ['1-3', '--report', 'hierarchy'] + ([] if store else ['--no-store'])
+    tables = run_azure(base_url, *args, tables=True)
+    # Hiyerarşi kökleri (üst öğesiz Task'lar dahil) tüm Task saatlerini bir kez içerir
+    planned = sum(row['planned_hours'] for row in tables['hierarchy'] if row['depth'] == 0)
+    assert planned == pytest.approx(expected_task_hours(SyntheticData(**OVER_LIMIT), range(3)))